@@ -0,0 +1,404 @@
+"""Benchmark and regression suite for the agent pipelines, built on pydantic-evals.
+
+Each dataset holds a few hundred generated prompts per machine (FM Tone, FM Drum, Wavetone,
+Swarmer and the Sub 37), combining a sound with envelope, tone and effect descriptors whose
+expected parameter changes are known: "a dark FM Tone bass with a slow attack and lots of
+reverb on track 3" should lower the filter frequency and raise the amp attack and reverb send.
+
+Every case runs through the streaming workflow of its synth and records, per agent stage
+(`shared.validation`, `digitone.router`, `digitone.fm_tone`, ...), the model latency, input and
+output tokens, tool calls, `ModelRetry`s and cost, next to the end-to-end duration. The
+evaluators score how many expected parameters were set in the right direction and whether
+every change landed on the prompt's track.
+
+Each run is saved as a pydantic-evals report named after the commit and the stage models, and
+`--baseline` compares a run with an earlier one, exiting non-zero when latency, tokens, tool
+calls or cost grew (or correctness dropped) beyond `--tolerance`, so regressions are caught
+before deploy.
+
+By default every stage runs on its offline stand-in model (`AGENT_LOAD_TEST`, with no
+simulated latency): token counts, tool calls and pipeline overhead are exact, correctness is
+not meaningful. Set `AGENT_LOAD_TEST=false` and the stage models to evaluate real models.
+
+Usage:
+    uv run python -m benchmarks.agent_evals [--machines fm_tone sub37] [--limit 50]
+    AGENT_LOAD_TEST=false uv run python -m benchmarks.agent_evals --limit 40 --baseline <report.json>
+"""
+
+import argparse
+import asyncio
+import hashlib
+import itertools
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+os.environ.setdefault('AGENT_LOAD_TEST', 'true')
+for _stage in ('VALIDATION', 'ROUTING', 'TOOL_SELECTION', 'SOUND_DESIGN'):
+    os.environ.setdefault(f'LOAD_TEST_{_stage}_LATENCY_MS', '0')
+
+from pydantic import BaseModel, TypeAdapter  # noqa: E402
+from pydantic_evals import Case, Dataset, increment_eval_metric  # noqa: E402
+from pydantic_evals.evaluators import EvaluationReason, Evaluator, EvaluatorContext  # noqa: E402
+from pydantic_evals.reporting import EvaluationReport  # noqa: E402
+
+from synthgenie.metrics.token_usage import collect_request_usage  # noqa: E402
+from synthgenie.synthesizers.digitone.commands import digitone_parameters  # noqa: E402
+from synthgenie.synthesizers.digitone.services import stream_digitone_agent_workflow  # noqa: E402
+from synthgenie.synthesizers.shared.agents.models import models_fingerprint, stage_models  # noqa: E402
+from synthgenie.synthesizers.shared.budget import AgentResponse  # noqa: E402
+from synthgenie.synthesizers.shared.parameters import ParameterRegistry  # noqa: E402
+from synthgenie.synthesizers.shared.schemas.agent import SynthGenieResponse  # noqa: E402
+from synthgenie.synthesizers.sub37.services import stream_sub37_agent_workflow  # noqa: E402
+from synthgenie.synthesizers.sub37.toolsets import (  # noqa: E402
+    amplifier_toolset,
+    arpeggiator_toolset,
+    effects_toolset,
+    filter_toolset,
+    glide_toolset,
+    modulation_toolset,
+    oscillator_toolset,
+)
+
+RESULTS_DIR = Path(__file__).parent / 'results' / 'agent_evals'
+API_KEY = 'agent-evals'
+
+Machine = Literal['fm_tone', 'fm_drum', 'wavetone', 'swarmer', 'sub37']
+Direction = Literal['low', 'high']
+
+# One report per machine, keyed by machine
+reports_adapter = TypeAdapter(dict[str, EvaluationReport[Any, Any, Any]])
+
+sub37_parameters = ParameterRegistry(
+    tool.function
+    for toolset in (
+        amplifier_toolset,
+        arpeggiator_toolset,
+        effects_toolset,
+        filter_toolset,
+        glide_toolset,
+        modulation_toolset,
+        oscillator_toolset,
+    )
+    for tool in toolset.tools.values()
+)
+
+
+class ExpectedParameter(BaseModel):
+    """A parameter the prompt asks for, by any of the tools setting it, and the half of its range."""
+
+    tools: list[str]
+    direction: Direction
+
+
+class PromptInput(BaseModel):
+    synth: Literal['digitone', 'sub37']
+    prompt: str
+
+
+class PromptMetadata(BaseModel):
+    machine: Machine
+    track: int | None
+    expected: list[ExpectedParameter]
+
+
+@dataclass(frozen=True)
+class Descriptor:
+    phrase: str
+    tools: tuple[str, ...]
+    direction: Direction
+
+
+# Descriptor groups; every prompt combines one descriptor from each group
+DIGITONE_DESCRIPTORS = (
+    (
+        Descriptor('bright', ('set_multi_mode_filter_frequency',), 'high'),
+        Descriptor('dark', ('set_multi_mode_filter_frequency',), 'low'),
+        Descriptor('resonant', ('set_multi_mode_filter_resonance',), 'high'),
+    ),
+    (
+        Descriptor('a slow attack', ('set_amp_attack',), 'high'),
+        Descriptor('a sharp attack', ('set_amp_attack',), 'low'),
+        Descriptor('a long release', ('set_amp_release',), 'high'),
+        Descriptor('a short decay', ('set_amp_decay',), 'low'),
+    ),
+    (
+        Descriptor('lots of reverb', ('set_fx_reverb',), 'high'),
+        Descriptor('a long delay', ('set_fx_delay',), 'high'),
+        Descriptor('some overdrive', ('set_fx_overdrive',), 'high'),
+        Descriptor('a wide chorus', ('set_fx_chorus',), 'high'),
+    ),
+)
+SUB37_DESCRIPTORS = (
+    (
+        Descriptor('bright', ('set_filter_cutoff', 'set_filter_cutoff_nrpn'), 'high'),
+        Descriptor('dark', ('set_filter_cutoff', 'set_filter_cutoff_nrpn'), 'low'),
+        Descriptor('resonant', ('set_filter_resonance', 'set_filter_resonance_nrpn'), 'high'),
+    ),
+    (
+        Descriptor('a slow attack', ('set_amp_eg_attack_time',), 'high'),
+        Descriptor('a sharp attack', ('set_amp_eg_attack_time',), 'low'),
+        Descriptor('a long release', ('set_amp_eg_release_time',), 'high'),
+        Descriptor('a short decay', ('set_amp_eg_decay_time',), 'low'),
+    ),
+    (
+        Descriptor('a long glide', ('set_glide_time',), 'high'),
+        Descriptor('heavy drive', ('set_filter_multidrive', 'set_filter_drive_nrpn'), 'high'),
+        Descriptor('a snappy filter envelope', ('set_filter_eg_decay_time', 'set_filter_eg_decay_nrpn'), 'low'),
+    ),
+)
+
+SOUNDS: dict[Machine, tuple[str, ...]] = {
+    'fm_tone': ('bass', 'electric piano', 'bell', 'pad', 'lead', 'pluck', 'brass'),
+    'fm_drum': ('kick', 'snare', 'tom', 'hi-hat', 'clap', 'percussion hit'),
+    'wavetone': ('pad', 'lead', 'bass', 'texture', 'pluck', 'organ'),
+    'swarmer': ('pad', 'drone', 'supersaw lead', 'bass', 'string ensemble', 'choir'),
+    'sub37': ('bass', 'lead', 'pad', 'pluck', 'brass stab', 'sequence', 'drone'),
+}
+MACHINE_NAMES: dict[Machine, str] = {
+    'fm_tone': 'FM Tone',
+    'fm_drum': 'FM Drum',
+    'wavetone': 'Wavetone',
+    'swarmer': 'Swarmer',
+    'sub37': 'Sub 37',
+}
+DIGITONE_TRACKS = 8
+
+
+def build_cases(machine: Machine) -> list[Case[PromptInput, list[AgentResponse], PromptMetadata]]:
+    """Every combination of a machine's sounds with one descriptor per group."""
+    digitone = machine != 'sub37'
+    groups = DIGITONE_DESCRIPTORS if digitone else SUB37_DESCRIPTORS
+    cases: list[Case[PromptInput, list[AgentResponse], PromptMetadata]] = []
+    for i, (sound, tone, envelope, effect) in enumerate(itertools.product(SOUNDS[machine], *groups)):
+        track = i % DIGITONE_TRACKS + 1 if digitone else None
+        prompt = f'a {tone.phrase} {MACHINE_NAMES[machine]} {sound} with {envelope.phrase} and {effect.phrase}'
+        if track is not None:
+            prompt += f' on track {track}'
+        cases.append(
+            Case(
+                name=f'{machine}-{i:03d}',
+                inputs=PromptInput(synth='digitone' if digitone else 'sub37', prompt=prompt),
+                metadata=PromptMetadata(
+                    machine=machine,
+                    track=track,
+                    expected=[
+                        ExpectedParameter(tools=list(descriptor.tools), direction=descriptor.direction)
+                        for descriptor in (tone, envelope, effect)
+                    ],
+                ),
+            )
+        )
+    return cases
+
+
+def _in_direction(response: SynthGenieResponse, expected: ExpectedParameter, machine: Machine) -> bool:
+    """Whether the value sits in the expected part of its range: the lower or upper 40%."""
+    registry = sub37_parameters if machine == 'sub37' else digitone_parameters
+    spec = registry.get(response.used_tool)
+    low, high = (spec.min_value, spec.max_value) if spec is not None else (0, 127)
+    position = (response.value - low) / (high - low) if high > low else 0.5
+    return position >= 0.6 if expected.direction == 'high' else position <= 0.4
+
+
+@dataclass
+class ExpectedParameters(Evaluator[PromptInput, list[AgentResponse], PromptMetadata]):
+    """Share of the prompt's expected parameters set, and set in the right direction."""
+
+    def evaluate(
+        self, ctx: EvaluatorContext[PromptInput, list[AgentResponse], PromptMetadata]
+    ) -> dict[str, float | bool | EvaluationReason]:
+        assert ctx.metadata is not None
+        changes = [response for response in ctx.output if isinstance(response, SynthGenieResponse)]
+        set_count = directed = 0
+        missing: list[str] = []
+        for expected in ctx.metadata.expected:
+            matching = [change for change in changes if change.used_tool in expected.tools]
+            set_count += bool(matching)
+            if any(_in_direction(change, expected, ctx.metadata.machine) for change in matching):
+                directed += 1
+            else:
+                missing.append(f'{expected.tools[0]} {expected.direction}')
+
+        total = len(ctx.metadata.expected)
+        return {
+            'parameters_set': set_count / total,
+            'parameters_correct': EvaluationReason(
+                value=directed / total, reason=f'missed: {", ".join(missing)}' if missing else None
+            ),
+            'all_parameters_correct': directed == total,
+        }
+
+
+@dataclass
+class TrackRouting(Evaluator[PromptInput, list[AgentResponse], PromptMetadata]):
+    """Every change goes to the track the prompt names."""
+
+    def evaluate(
+        self, ctx: EvaluatorContext[PromptInput, list[AgentResponse], PromptMetadata]
+    ) -> dict[str, bool | EvaluationReason]:
+        assert ctx.metadata is not None
+        if ctx.metadata.track is None:
+            return {}
+        channels = {response.midi_channel for response in ctx.output if isinstance(response, SynthGenieResponse)}
+        return {
+            'on_track': EvaluationReason(
+                value=channels == {ctx.metadata.track}, reason=f'channels {sorted(channels)}' if channels else None
+            )
+        }
+
+
+async def run_prompt(inputs: PromptInput) -> list[AgentResponse]:
+    """Run a prompt through its synth's workflow, recording model usage per agent stage as metrics."""
+    workflow = stream_digitone_agent_workflow if inputs.synth == 'digitone' else stream_sub37_agent_workflow
+    with collect_request_usage() as totals:
+        responses = [response async for response in workflow(inputs.prompt, API_KEY)]
+
+    for stage, stage_totals in totals.stages.items():
+        increment_eval_metric(f'{stage}.latency_ms', stage_totals.latency * 1000)
+        increment_eval_metric(f'{stage}.input_tokens', stage_totals.input_tokens)
+        increment_eval_metric(f'{stage}.output_tokens', stage_totals.output_tokens)
+        increment_eval_metric(f'{stage}.tool_calls', stage_totals.tool_calls)
+        increment_eval_metric(f'{stage}.retries', stage_totals.retries)
+        increment_eval_metric(f'{stage}.cost_usd', stage_totals.cost)
+    increment_eval_metric('model_requests', totals.usage.requests)
+    increment_eval_metric('input_tokens', totals.usage.input_tokens)
+    increment_eval_metric('output_tokens', totals.usage.output_tokens)
+    increment_eval_metric('cost_usd', totals.cost)
+    return responses
+
+
+def build_dataset(machine: Machine, limit: int | None) -> Dataset[PromptInput, list[AgentResponse], PromptMetadata]:
+    cases = build_cases(machine)
+    if limit and limit < len(cases):
+        # Evenly spread over the combinations rather than the first sound only
+        cases = [cases[i * len(cases) // limit] for i in range(limit)]
+    return Dataset(name=machine, cases=cases, evaluators=[ExpectedParameters(), TrackRouting()])
+
+
+def _commit() -> str:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(['git', 'diff', '--quiet', 'HEAD'], check=False).returncode != 0
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f'{commit}-dirty' if dirty else commit
+
+
+def summarize(report: EvaluationReport[Any, Any, Any]) -> dict[str, float]:
+    """Per-run figures compared between runs: mean metrics per case, duration percentiles and scores."""
+    cases = report.cases
+    if not cases:
+        return {}
+    durations = sorted(case.task_duration * 1000 for case in cases)
+    summary: dict[str, float] = {
+        'cases': len(cases),
+        'failures': len(report.failures),
+        'duration_p50_ms': statistics.median(durations),
+        'duration_p95_ms': statistics.quantiles(durations, n=20)[-1] if len(durations) > 1 else durations[0],
+    }
+    for name in sorted({name for case in cases for name in case.metrics}):
+        summary[name] = statistics.mean(case.metrics.get(name, 0) for case in cases)
+    for name in sorted({name for case in cases for name in case.scores}):
+        summary[name] = statistics.mean(case.scores[name].value for case in cases if name in case.scores)
+    for name in sorted({name for case in cases for name in case.assertions}):
+        results = [case.assertions[name].value for case in cases if name in case.assertions]
+        summary[name] = sum(results) / len(results)
+    return summary
+
+
+# Figures where higher is better; every other figure (except the case count) regresses when it grows
+QUALITY_FIGURES = ('parameters_set', 'parameters_correct', 'all_parameters_correct', 'on_track')
+# Latency changes smaller than this are noise, notably with the offline stand-in models
+LATENCY_NOISE_MS = 5.0
+
+
+def regressions(current: dict[str, float], baseline: dict[str, float], tolerance: float) -> list[str]:
+    """The figures that got worse than the baseline by more than the tolerance."""
+    found: list[str] = []
+    for name, value in current.items():
+        before = baseline.get(name)
+        if before is None or name == 'cases':
+            continue
+        if name in QUALITY_FIGURES:
+            if value < before - tolerance:
+                found.append(f'{name} {before:.3f} -> {value:.3f}')
+        elif value > before * (1 + tolerance) and value - before > (LATENCY_NOISE_MS if name.endswith('_ms') else 1e-9):
+            found.append(f'{name} {before:.4g} -> {value:.4g}')
+    return found
+
+
+def print_summary(machine: str, current: dict[str, float], baseline: dict[str, float] | None) -> None:
+    print(f'\n{machine}')
+    for name, value in current.items():
+        line = f'  {name:<40} {value:>12.4g}'
+        if baseline is not None and name in baseline:
+            before = baseline[name]
+            change = f'{(value - before) / before:+.1%}' if before else ('=' if value == before else 'new')
+            line += f'   baseline {before:>12.4g} ({change})'
+        print(line)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--machines', nargs='+', default=list(SOUNDS), choices=list(SOUNDS))
+    parser.add_argument('--limit', type=int, help='Cases per machine, spread over the whole dataset')
+    parser.add_argument('--concurrency', type=int, default=8, help='Cases run at once')
+    parser.add_argument('--output', type=Path, help=f'Report file (default: {RESULTS_DIR}/<commit>-<models>.json)')
+    parser.add_argument('--baseline', type=Path, help='Report of an earlier run to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='Allowed relative growth / score drop')
+    parser.add_argument('--cases', action='store_true', help='Print the per-case table of each report')
+    args = parser.parse_args()
+
+    commit = _commit()
+    models = models_fingerprint()
+    print(f'commit={commit} load_test={os.environ["AGENT_LOAD_TEST"]}')
+    for stage, model in stage_models().items():
+        print(f'  {stage:<15} {model}')
+
+    baselines: dict[str, EvaluationReport[Any, Any, Any]] = {}
+    if args.baseline is not None:
+        for report in reports_adapter.validate_json(args.baseline.read_bytes()).values():
+            baselines[report.name] = report
+
+    reports: dict[str, EvaluationReport[Any, Any, Any]] = {}
+    found: list[str] = []
+    for machine in args.machines:
+        dataset = build_dataset(machine, args.limit)
+        report = await dataset.evaluate(
+            run_prompt,
+            name=machine,
+            max_concurrency=args.concurrency,
+            metadata={'commit': commit, 'models': stage_models()},
+        )
+        reports[machine] = report
+        baseline = baselines.get(machine)
+        if args.cases:
+            report.print(baseline=baseline, include_durations=True)
+
+        current = summarize(report)
+        before = summarize(baseline) if baseline is not None else None
+        print_summary(machine, current, before)
+        if before is not None:
+            found += [f'{machine}: {regression}' for regression in regressions(current, before, args.tolerance)]
+
+    output = args.output or RESULTS_DIR / f'{commit}-{hashlib.sha256(models.encode()).hexdigest()[:8]}.json'
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_bytes(reports_adapter.dump_json(reports, indent=2))
+    print(f'\nReport saved to {output}')
+
+    if found:
+        print(f'\n{len(found)} regressions beyond {args.tolerance:.0%}:')
+        for regression in found:
+            print(f'  {regression}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
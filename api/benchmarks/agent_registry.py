@@ -0,0 +1,81 @@
+"""Benchmark per-request agent construction versus the shared agent registry.
+
+Before the registry every request built its agents from scratch (model client, tool schemas,
+output validators). This compares that cost with a registry lookup.
+
+Usage:
+    uv run python -m benchmarks.agent_registry [--iterations 50]
+
+Every stage's model defaults to pydantic-ai's offline `test` model so no provider keys are needed.
+"""
+
+import argparse
+import os
+import statistics
+import time
+import tracemalloc
+
+for _variable in ('AGENT_MODEL', 'AGENT_VALIDATION_MODEL', 'AGENT_ROUTING_MODEL', 'AGENT_TOOL_SELECTION_MODEL'):
+    os.environ.setdefault(_variable, 'test')
+
+import synthgenie.synthesizers.digitone.services  # noqa: E402, F401 - registers Digitone agents
+import synthgenie.synthesizers.sub37.services  # noqa: E402, F401 - registers Sub 37 agents
+from synthgenie.synthesizers.shared.agents.registry import agent_registry  # noqa: E402
+
+# Agents a single request used to build, per endpoint
+REQUEST_PIPELINES = {
+    '/agent/digitone/prompt': ['shared.validation', 'digitone.router', 'digitone.fm_tone'],
+    '/agent/sub37/prompt': ['shared.validation', 'sub37.tool_selector', 'sub37.sound_design'],
+}
+
+
+def measure_build(name: str, iterations: int) -> tuple[float, int]:
+    """Return median build time in ms and peak bytes allocated by a single build."""
+    timings: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        agent_registry.build(name)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    agent_registry.build(name)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak
+
+
+def measure_lookup(name: str, iterations: int) -> float:
+    """Return median registry lookup time in ms."""
+    agent_registry.get(name)
+    timings: list[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        agent_registry.get(name)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f'model={os.environ["AGENT_MODEL"]} iterations={args.iterations}\n')
+    print(f'{"agent":<22} {"build (ms)":>11} {"peak alloc":>11} {"registry (ms)":>14}')
+
+    build_ms: dict[str, float] = {}
+    lookup_ms: dict[str, float] = {}
+    for name in agent_registry.names:
+        build_ms[name], peak = measure_build(name, args.iterations)
+        lookup_ms[name] = measure_lookup(name, args.iterations * 100)
+        print(f'{name:<22} {build_ms[name]:>11.3f} {peak / 1024:>9.0f}KB {lookup_ms[name]:>14.5f}')
+
+    print('\nPer-request agent overhead')
+    for endpoint, names in REQUEST_PIPELINES.items():
+        before = sum(build_ms[name] for name in names)
+        after = sum(lookup_ms[name] for name in names)
+        print(f'{endpoint:<24} before {before:>8.3f} ms   after {after:>8.5f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark event-loop lag with blocking database calls versus the database executor.
+
+Each simulated request does what a prompt request does around its model calls: check the API
+key, run a query (`--query-ms` of `pg_sleep`, standing in for a slow one), await the "LLM"
+(`--llm-ms`), then record usage. Concurrent clients run these requests for `--duration`
+seconds while a monitor task measures how late the event loop wakes it up.
+
+- `blocking` calls `get_api_key_from_db` and `track_api_key_usage` directly on the event loop,
+  as the routes used to;
+- `executor` awaits them through `run_db`, which runs them on the database executor.
+
+In blocking mode the lag grows with every query in flight, delaying all other requests'
+model awaits; through the executor it stays near zero. A PostgreSQL database is needed
+(`make docker-up-db`, with the usual `DB_*`/`POSTGRES_*` variables).
+
+Usage:
+    uv run python -m benchmarks.event_loop_lag [--clients 50] [--duration 10] [--query-ms 20]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from dataclasses import dataclass, field
+
+import psycopg2.extensions
+
+from synthgenie.auth.models import get_api_key_from_db, track_api_key_usage
+from synthgenie.auth.services import register_api_key
+from synthgenie.db.connection import initialize_db, pooled_connection
+from synthgenie.db.executor import run_db
+
+MODES = ('blocking', 'executor')
+
+
+def slow_query(conn: psycopg2.extensions.connection, seconds: float) -> None:
+    with conn.cursor() as cursor:
+        cursor.execute('SELECT pg_sleep(%s)', (seconds,))
+    conn.rollback()
+
+
+@dataclass
+class Run:
+    lags: list[float] = field(default_factory=list[float])
+    latencies: list[float] = field(default_factory=list[float])
+
+
+async def monitor(interval: float, run: Run, stop: asyncio.Event) -> None:
+    """Sleep for `interval` over and over, recording how much later than asked the loop resumes."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        run.lags.append(time.perf_counter() - start - interval)
+
+
+async def blocking_request(api_key: str, args: argparse.Namespace) -> None:
+    with pooled_connection() as conn:
+        get_api_key_from_db(conn, api_key)
+        slow_query(conn, args.query_ms / 1000)
+    await asyncio.sleep(args.llm_ms / 1000)
+    with pooled_connection() as conn:
+        track_api_key_usage(conn, api_key)
+
+
+async def executor_request(api_key: str, args: argparse.Namespace) -> None:
+    await run_db(get_api_key_from_db, None, api_key)
+    await run_db(slow_query, None, args.query_ms / 1000)
+    await asyncio.sleep(args.llm_ms / 1000)
+    await run_db(track_api_key_usage, None, api_key)
+
+
+async def client(mode: str, api_key: str, args: argparse.Namespace, deadline: float, run: Run) -> None:
+    request = blocking_request if mode == 'blocking' else executor_request
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        await request(api_key, args)
+        run.latencies.append(time.perf_counter() - start)
+
+
+async def measure(mode: str, api_key: str, args: argparse.Namespace) -> Run:
+    run = Run()
+    stop = asyncio.Event()
+    lag_monitor = asyncio.create_task(monitor(args.interval_ms / 1000, run, stop))
+    deadline = time.monotonic() + args.duration
+    await asyncio.gather(*(client(mode, api_key, args, deadline, run) for _ in range(args.clients)))
+    stop.set()
+    await lag_monitor
+    return run
+
+
+def ms(seconds: float) -> str:
+    return f'{seconds * 1000:.1f}'
+
+
+def report(mode: str, run: Run, duration: float) -> None:
+    lags = statistics.quantiles(run.lags, n=100, method='inclusive') if len(run.lags) > 1 else run.lags * 99
+    latencies = (
+        statistics.quantiles(run.latencies, n=100, method='inclusive') if len(run.latencies) > 1 else run.latencies * 99
+    )
+    print(
+        f'{mode:<10} {len(run.latencies) / duration:>8.1f} {ms(latencies[49]):>12} {ms(latencies[94]):>12} '
+        f'{ms(lags[49]):>10} {ms(lags[94]):>10} {ms(lags[98]):>10} {ms(max(run.lags)):>10}'
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=50, help='Concurrent requests')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds per mode')
+    parser.add_argument('--query-ms', type=float, default=20, help='Duration of the slow query per request')
+    parser.add_argument('--llm-ms', type=float, default=500, help='Duration of the awaited model call per request')
+    parser.add_argument('--interval-ms', type=float, default=5, help='Sleep interval of the lag monitor')
+    parser.add_argument('--modes', nargs='+', default=list(MODES), choices=MODES)
+    args = parser.parse_args()
+
+    initialize_db()
+    with pooled_connection() as conn:
+        api_key = register_api_key(conn, 'event-loop-lag')
+
+    print(f'clients={args.clients} query={args.query_ms:g}ms llm={args.llm_ms:g}ms duration={args.duration:g}s\n')
+    print(
+        f'{"mode":<10} {"req/s":>8} {"p50 (ms)":>12} {"p95 (ms)":>12} '
+        f'{"lag p50":>10} {"lag p95":>10} {"lag p99":>10} {"lag max":>10}'
+    )
+    for mode in args.modes:
+        report(mode, await measure(mode, api_key, args), args.duration)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,264 @@
+"""Load-test the prompt endpoints with deterministic stand-in models instead of provider calls.
+
+Every agent stage runs on its local stand-in (`AGENT_LOAD_TEST=true`, see
+`synthgenie/synthesizers/shared/agents/load_test.py`): model requests sleep for a latency
+drawn from the stage's distribution and return scripted tool calls and outputs. Everything
+else (auth, database, caches, budgets, usage tracking) runs for real, so a PostgreSQL
+database is needed (`make docker-up-db`, with the usual `DB_*`/`POSTGRES_*` variables).
+
+Concurrent clients send prompts to `/agent/digitone/prompt` and `/agent/sub37/prompt` and
+the run reports throughput, latency percentiles per endpoint, and database connection usage:
+connections opened by the app and the peak open at once, plus the peak of server-side
+sessions from `pg_stat_activity`.
+
+By default the app runs in-process over an ASGI transport, with a freshly registered API
+key. With `--url` it targets a running server instead (start it with `AGENT_LOAD_TEST=true`);
+only the server-side connection figures are available then.
+
+Usage:
+    uv run python -m benchmarks.load_test [--clients 50] [--requests 1000]
+    LOAD_TEST_SOUND_DESIGN_LATENCY_MS=5000 uv run python -m benchmarks.load_test --clients 200 --duration 60
+    uv run python -m benchmarks.load_test --url http://localhost:8000 --api-key <key>
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import statistics
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+os.environ.setdefault('AGENT_LOAD_TEST', 'true')
+os.environ.setdefault('SKIP_DOMAIN_CHECK', 'true')
+
+import httpx  # noqa: E402
+import psycopg2  # noqa: E402
+import psycopg2.extensions  # noqa: E402
+
+from synthgenie.synthesizers.shared.agents.load_test import (  # noqa: E402
+    DEFAULT_LATENCY_MS,
+    LOAD_TEST_LATENCY_DISTRIBUTION,
+    LOAD_TEST_TOOL_CALLS,
+    latency_ms,
+)
+from synthgenie.synthesizers.shared.cache import CACHE_BYPASS, CACHE_HEADER  # noqa: E402
+
+PROMPTS = {
+    '/agent/digitone/prompt': [
+        'warm evolving pad with slow attack',
+        'punchy fm drum kick on track 1',
+        'glassy wavetone bell on track 3',
+        'dark swarmer drone with lots of movement',
+        'fm tone bass on track 2 and a bright lead on track 4',
+        'short plucky arp sound with some delay',
+    ],
+    '/agent/sub37/prompt': [
+        'fat analog bass with a squelchy filter',
+        'soaring lead with glide and vibrato',
+        'slow sweeping pad with filter modulation',
+        'aggressive arpeggiated sequence',
+        'deep sub bass with a short decay',
+        'bright brass stab',
+    ],
+}
+
+
+@dataclass
+class ConnectionCounter:
+    """Client-side count of the database connections the app opens and closes."""
+
+    opened: int = 0
+    open: int = 0
+    peak: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def on_open(self) -> None:
+        with self.lock:
+            self.opened += 1
+            self.open += 1
+            self.peak = max(self.peak, self.open)
+
+    def on_close(self) -> None:
+        with self.lock:
+            self.open -= 1
+
+
+connection_counter = ConnectionCounter()
+
+
+class CountedConnection(psycopg2.extensions.connection):
+    def close(self) -> None:
+        if not self.closed:
+            connection_counter.on_close()
+        super().close()
+
+
+def count_connections() -> None:
+    """Count every connection opened through `psycopg2.connect`, including those of connection pools."""
+    connect = psycopg2.connect
+
+    def counted_connect(*args: Any, **kwargs: Any) -> psycopg2.extensions.connection:
+        kwargs.setdefault('connection_factory', CountedConnection)
+        conn = connect(*args, **kwargs)
+        connection_counter.on_open()
+        return conn
+
+    psycopg2.connect = counted_connect
+
+
+@dataclass
+class ServerSessions:
+    """Sessions on the database server, sampled from `pg_stat_activity` during the run."""
+
+    samples: list[int] = field(default_factory=list[int])
+
+    async def sample(self, conn: psycopg2.extensions.connection, interval: float) -> None:
+        conn.autocommit = True
+        with conn.cursor() as cursor:
+            while True:
+                cursor.execute('SELECT count(*) FROM pg_stat_activity WHERE datname = current_database()')
+                row = cursor.fetchone()
+                # Not counting the sampling connection itself
+                self.samples.append(row[0] - 1 if row else 0)
+                await asyncio.sleep(interval)
+
+
+@dataclass
+class Results:
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    statuses: Counter[tuple[str, int | str]] = field(default_factory=Counter[tuple[str, int | str]])
+
+
+async def client(
+    http: httpx.AsyncClient,
+    requests: Iterator[int],
+    args: argparse.Namespace,
+    deadline: float | None,
+    results: Results,
+) -> None:
+    """One client sending prompts one after another, alternating endpoints."""
+    headers = {'X-API-Key': args.api_key}
+    if not args.cache:
+        headers[CACHE_HEADER] = CACHE_BYPASS
+    endpoints = args.endpoints
+
+    for i in requests:
+        if (deadline is None and i >= args.requests) or (deadline is not None and time.monotonic() >= deadline):
+            return
+        endpoint = endpoints[i % len(endpoints)]
+        prompts = PROMPTS[endpoint]
+        prompt = prompts[(i // len(endpoints)) % len(prompts)]
+
+        start = time.perf_counter()
+        try:
+            response = await http.post(endpoint, json={'prompt': prompt}, headers=headers)
+            status: int | str = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        results.latencies[endpoint].append(time.perf_counter() - start)
+        results.statuses[(endpoint, status)] += 1
+
+
+def percentile(latencies: list[float], p: int) -> float:
+    return statistics.quantiles(latencies, n=100)[p - 1] * 1000 if len(latencies) > 1 else latencies[0] * 1000
+
+
+def report(results: Results, wall: float, sessions: ServerSessions, in_process: bool) -> None:
+    total = sum(len(latencies) for latencies in results.latencies.values())
+    print(f'\n{total} requests in {wall:.1f}s: {total / wall:.1f} req/s\n')
+    print(f'{"endpoint":<24} {"requests":>9} {"req/s":>7} {"p50 (ms)":>9} {"p95 (ms)":>9} {"p99 (ms)":>9}  statuses')
+    for endpoint, latencies in sorted(results.latencies.items()):
+        statuses = ', '.join(
+            f'{status}: {count}'
+            for (path, status), count in sorted(results.statuses.items(), key=str)
+            if path == endpoint
+        )
+        print(
+            f'{endpoint:<24} {len(latencies):>9} {len(latencies) / wall:>7.1f} {percentile(latencies, 50):>9.0f} '
+            f'{percentile(latencies, 95):>9.0f} {percentile(latencies, 99):>9.0f}  {statuses}'
+        )
+
+    print('\nDatabase connections')
+    if in_process:
+        print(
+            f'  opened by the app   {connection_counter.opened} ({connection_counter.opened / max(total, 1):.2f} per request)'
+        )
+        print(f'  peak open at once   {connection_counter.peak}')
+    if sessions.samples:
+        print(f'  server sessions     peak {max(sessions.samples)}, mean {statistics.mean(sessions.samples):.1f}')
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=50, help='Concurrent clients')
+    parser.add_argument('--requests', type=int, default=1000, help='Total requests (ignored with --duration)')
+    parser.add_argument('--duration', type=float, help='Run for this many seconds instead of a request count')
+    parser.add_argument('--endpoints', nargs='+', default=list(PROMPTS), choices=list(PROMPTS))
+    parser.add_argument('--cache', action='store_true', help='Let the response caches serve repeated prompts')
+    parser.add_argument('--url', help='Target a running server instead of the app in-process')
+    parser.add_argument('--api-key', help='API key to send (default: a key registered for the run)')
+    parser.add_argument('--sample-interval', type=float, default=0.1, help='Seconds between pg_stat_activity samples')
+    args = parser.parse_args()
+
+    from synthgenie.db.connection import get_connection
+
+    in_process = args.url is None
+    if not in_process and args.api_key is None:
+        parser.error('--api-key is required with --url')
+
+    sampler_conn = None
+    try:
+        sampler_conn = get_connection(max_retries=1)
+    except ConnectionError:
+        print('pg_stat_activity unavailable, skipping server-side connection counts')
+
+    if in_process:
+        # Importing the app initializes the database
+        from synthgenie.app import app
+        from synthgenie.auth.services import register_api_key
+        from synthgenie.synthesizers.shared.agents.registry import agent_registry
+
+        agent_registry.warm_up()
+        if args.api_key is None:
+            conn = get_connection()
+            try:
+                args.api_key = register_api_key(conn, 'load-test')
+            finally:
+                conn.close()
+        # Only count the connections opened while serving requests
+        count_connections()
+        transport: httpx.AsyncBaseTransport = httpx.ASGITransport(app=app)
+        base_url = 'http://localhost'
+    else:
+        transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=args.clients))
+        base_url = args.url
+
+    stages = ', '.join(f'{stage}={latency_ms(stage):.0f}ms' for stage in DEFAULT_LATENCY_MS)
+    print(f'target={args.url or "in-process"} clients={args.clients} endpoints={",".join(args.endpoints)}')
+    print(f'latency={LOAD_TEST_LATENCY_DISTRIBUTION} ({stages}) tool_calls={LOAD_TEST_TOOL_CALLS} cache={args.cache}')
+
+    sessions = ServerSessions()
+    sampler = asyncio.create_task(sessions.sample(sampler_conn, args.sample_interval)) if sampler_conn else None
+
+    results = Results()
+    requests = itertools.count()
+    deadline = time.monotonic() + args.duration if args.duration else None
+    start = time.perf_counter()
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=None) as http:
+        await asyncio.gather(*(client(http, requests, args, deadline, results) for _ in range(args.clients)))
+    wall = time.perf_counter() - start
+
+    if sampler is not None:
+        sampler.cancel()
+    if sampler_conn is not None:
+        sampler_conn.close()
+    report(results, wall, sessions, in_process)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,202 @@
+"""Benchmark the per-parameter tools against the batch `set_parameters` tool.
+
+A machine agent normally sees one tool schema per parameter (71 for a full FM Tone design) and
+makes one tool call per change. The batch tool replaces those schemas with a single tool whose
+description lists the parameters, and takes every change in one call.
+
+Both modes run the same sound design (an FM Tone bass, 18 parameter changes) through the
+FM Tone agent. Each mode runs twice: once with the final output turn (the model restates
+every change) and once with `direct` tool results, where the run ends after the tool calls.
+
+The offline model is scripted, so model turns and tokens are exact. Wall time only measures
+pydantic-ai and tool overhead, plus `--turn-latency-ms` per model request. Input tokens
+are pydantic-ai's estimate for messages plus tool definitions at about 4 characters per
+token.
+
+With `--live` the agent runs against the model in `AGENT_MODEL` instead, and usage is
+reported by the provider.
+
+Usage:
+    uv run python -m benchmarks.parameter_tools [--iterations 20] [--turn-latency-ms 0]
+    AGENT_MODEL=openai:gpt-4o uv run python -m benchmarks.parameter_tools --live --iterations 3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from dataclasses import dataclass
+
+os.environ.setdefault('AGENT_MODEL', 'test')
+
+from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, ToolCallPart, ToolReturnPart  # noqa: E402
+from pydantic_ai.models.function import AgentInfo, FunctionModel  # noqa: E402
+from pydantic_ai.tools import ToolDefinition  # noqa: E402
+from pydantic_ai.toolsets import AbstractToolset  # noqa: E402
+from pydantic_ai.usage import RunUsage  # noqa: E402
+
+from synthgenie.synthesizers.digitone.agents.shared import DigitoneAgentDeps  # noqa: E402
+from synthgenie.synthesizers.digitone.services import MACHINE_AGENT_SETTINGS, get_machine_agent  # noqa: E402
+from synthgenie.synthesizers.digitone.toolsets.tool_selector import (  # noqa: E402
+    DEFAULT_SECTIONS,
+    create_dynamic_toolset,
+)
+from synthgenie.synthesizers.shared.streaming import collect_tool_responses  # noqa: E402
+
+PROMPT = 'design a warm, round FM bass with a short pluck and a little drive'
+TRACK = 1
+
+# (parameter, value) pairs the scripted model sets
+CHANGES = [
+    ('fm_tone_algorithm', 1),
+    ('fm_tone_c_ratio', 1),
+    ('fm_tone_a_ratio', 2),
+    ('fm_tone_b_ratio', 2),
+    ('fm_tone_harmonics', 8063),
+    ('fm_tone_feedback', 20),
+    ('fm_tone_mix', 40),
+    ('fm_tone_a_decay', 45),
+    ('fm_tone_a_level', 70),
+    ('fm_tone_b_level', 30),
+    ('multi_mode_filter_frequency', 6000),
+    ('multi_mode_filter_resonance', 25),
+    ('multi_mode_filter_envelope_depth', 80),
+    ('multi_mode_filter_decay', 40),
+    ('amp_attack', 0),
+    ('amp_decay', 55),
+    ('amp_sustain', 20),
+    ('fx_overdrive', 25),
+]
+
+
+def _tool_returns(messages: list[ModelMessage]) -> list[ToolReturnPart]:
+    return [
+        part
+        for message in messages
+        if isinstance(message, ModelRequest)
+        for part in message.parts
+        if isinstance(part, ToolReturnPart)
+    ]
+
+
+def _schema_tokens(tools: list[ToolDefinition]) -> int:
+    """Approximate tokens of the tool definitions sent with each model request."""
+    characters = sum(
+        len(tool.name) + len(tool.description or '') + len(json.dumps(tool.parameters_json_schema)) for tool in tools
+    )
+    return characters // 4
+
+
+@dataclass
+class ScriptedModel:
+    """Scripted sound designer: one round of tool calls, then the final output restating them."""
+
+    batch: bool
+    turn_latency_ms: float
+    schema_tokens: int = 0
+    tools_sent: int = 0
+
+    async def respond(self, messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        await asyncio.sleep(self.turn_latency_ms / 1000)
+        self.schema_tokens += _schema_tokens(info.function_tools + info.output_tools)
+        self.tools_sent = len(info.function_tools)
+
+        returns = _tool_returns(messages)
+        if returns:
+            responses = [
+                response.model_dump(exclude_none=True)
+                for part in returns
+                for response in (part.content if isinstance(part.content, list) else [part.content])
+            ]
+            return ModelResponse(parts=[ToolCallPart(info.output_tools[0].name, {'response': responses})])
+
+        if self.batch:
+            changes = [{'parameter': name, 'value': value, 'midi_channel': TRACK} for name, value in CHANGES]
+            return ModelResponse(parts=[ToolCallPart('set_parameters', {'changes': changes})])
+        # A few tools (amp) name their channel argument `track`
+        tools = {tool.name: tool for tool in info.function_tools}
+        calls: list[ToolCallPart] = []
+        for name, value in CHANGES:
+            properties = tools[f'set_{name}'].parameters_json_schema['properties']
+            calls.append(
+                ToolCallPart(
+                    f'set_{name}', {'value': value, 'track' if 'track' in properties else 'midi_channel': TRACK}
+                )
+            )
+        return ModelResponse(parts=calls)
+
+
+@dataclass
+class RunStats:
+    tools_sent: int
+    requests: int
+    input_tokens: int
+    output_tokens: int
+    schema_tokens: int
+    responses: int
+    wall_ms: float
+
+
+async def run_once(toolset: AbstractToolset[object], batch: bool, direct: bool, args: argparse.Namespace) -> RunStats:
+    agent = get_machine_agent('fm_tone')
+    usage = RunUsage()
+    model = ScriptedModel(batch=batch, turn_latency_ms=args.turn_latency_ms)
+
+    start = time.perf_counter()
+    run_kwargs = dict(
+        deps=DigitoneAgentDeps(default_midi_channel=TRACK),
+        model_settings=MACHINE_AGENT_SETTINGS,
+        toolsets=[toolset],
+        usage=usage,
+        direct=direct,
+    )
+    if args.live:
+        responses = await collect_tool_responses(agent, PROMPT, **run_kwargs)
+    else:
+        with agent.override(model=FunctionModel(model.respond)):
+            responses = await collect_tool_responses(agent, PROMPT, **run_kwargs)
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    return RunStats(
+        tools_sent=model.tools_sent,
+        requests=usage.requests,
+        input_tokens=usage.input_tokens + model.schema_tokens,
+        output_tokens=usage.output_tokens,
+        schema_tokens=model.schema_tokens,
+        responses=len(responses),
+        wall_ms=wall_ms,
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--turn-latency-ms', type=float, default=0.0, help='Simulated latency per model request')
+    parser.add_argument('--live', action='store_true', help='Use the model in AGENT_MODEL instead of the script')
+    args = parser.parse_args()
+
+    print(f'model={os.environ["AGENT_MODEL"] if args.live else "scripted"} iterations={args.iterations}')
+    print(f'prompt={PROMPT!r} sections={",".join(DEFAULT_SECTIONS)}\n')
+    header = (
+        f'{"tools":<14} {"final turn":<11} {"tools sent":>10} {"turns":>6} {"input tok":>10} '
+        f'{"schema tok":>11} {"output tok":>11} {"changes":>8} {"wall (ms)":>10}'
+    )
+    print(header)
+
+    for batch in (False, True):
+        toolset = create_dynamic_toolset('fm_tone', DEFAULT_SECTIONS, batch=batch)
+        for direct in (False, True):
+            runs = [await run_once(toolset, batch, direct, args) for _ in range(args.iterations)]
+            last = runs[-1]
+            wall_ms = statistics.median(run.wall_ms for run in runs)
+            print(
+                f'{"set_parameters" if batch else "per-parameter":<14} {"skipped" if direct else "yes":<11} '
+                f'{last.tools_sent:>10} {last.requests:>6} {last.input_tokens:>10} {last.schema_tokens:>11} '
+                f'{last.output_tokens:>11} {last.responses:>8} {wall_ms:>10.2f}'
+            )
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
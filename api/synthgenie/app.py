@@ -1,5 +1,6 @@
 import logging
 import os
+from contextlib import asynccontextmanager
 
 import logfire
 import sentry_sdk
@@ -8,9 +9,17 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
+from synthgenie.auth.key_cache import API_KEY_CACHE_ENABLED, api_key_listener
 from synthgenie.auth.routes import router as api_keys_router
-from synthgenie.db.connection import initialize_db
+from synthgenie.auth.usage import UsageEventMiddleware, usage_tracker
+from synthgenie.db.connection import close_pool, initialize_db, open_pool
+from synthgenie.db.executor import shutdown_executor
+from synthgenie.metrics.routes import router as metrics_router
+from synthgenie.metrics.token_usage import TokenUsageMiddleware
 from synthgenie.synthesizers.digitone.routes import router as digitone_router
+from synthgenie.synthesizers.shared.agents.registry import agent_registry
+from synthgenie.synthesizers.shared.budget import AgentBudgetExceeded, budget_exceeded_handler
+from synthgenie.synthesizers.shared.cache import CACHE_HEADER
 from synthgenie.synthesizers.sub37.routes import router as sub37_router
 
 load_dotenv()
@@ -37,10 +46,32 @@ sentry_sdk.init(
     send_default_pii=True,
 )
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Build every agent (model clients + tool schemas) once, before the first request
+    agent_registry.warm_up()
+    # Requests borrow pooled database connections instead of connecting each time
+    open_pool()
+    # Revoked API keys are dropped from every worker's key cache
+    if API_KEY_CACHE_ENABLED:
+        api_key_listener.start()
+    # Request counts are written in batches, and once more on shutdown
+    usage_tracker.start()
+    try:
+        yield
+    finally:
+        await usage_tracker.stop()
+        api_key_listener.stop()
+        shutdown_executor()
+        close_pool()
+
+
 app = FastAPI(
     title='Synthgenie API',
     description='API for controlling Elektron Digitone synthesizer parameters',
     version='1.0.0',
+    lifespan=lifespan,
 )
 
 # Get base URL from environment
@@ -81,11 +112,23 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
     allow_methods=['GET', 'POST', 'DELETE', 'PUT', 'OPTIONS'],
-    allow_headers=['X-API-Key', 'Content-Type', 'Authorization'],
+    allow_headers=['X-API-Key', 'Content-Type', 'Authorization', CACHE_HEADER],
+    # Lets browser clients read the cache status of agent responses
+    expose_headers=[CACHE_HEADER],
     allow_credentials=True,
 )
 
+# Record a usage event per agent request; added before TokenUsageMiddleware so it runs inside it
+app.add_middleware(UsageEventMiddleware)
+
+# Collect model token usage (cached vs uncached input tokens) per request
+app.add_middleware(TokenUsageMiddleware)
+
+# Prompts over their budget get a 429 with the parameter changes made so far
+app.add_exception_handler(AgentBudgetExceeded, budget_exceeded_handler)
+
 # Include routers
 app.include_router(digitone_router)
 app.include_router(sub37_router)
 app.include_router(api_keys_router)
+app.include_router(metrics_router)
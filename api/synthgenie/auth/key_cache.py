@@ -0,0 +1,269 @@
+"""In-process cache of API key verifications.
+
+Every request authenticates its API key, and without a cache each one queries `api_keys` before
+any work starts. Verified keys are cached for `API_KEY_CACHE_TTL_SECONDS`, unknown keys for
+`API_KEY_CACHE_NEGATIVE_TTL_SECONDS`, so repeated requests with a bad key don't reach the
+database either. A verified key's per-prompt usage limits come with it from the same query, so
+agent workflows read them from the cache too.
+
+A revoked key must stop working at once, on every worker. `/api-keys/revoke` invalidates the
+worker's own entry, and a trigger on `api_keys` (see `initialize_db`) sends the key on the
+`api_key_changes` channel, which each worker's `ApiKeyListener` receives with LISTEN to
+invalidate its copy. While the listener is disconnected, the TTLs bound how long a revoked key
+keeps working; it clears the cache whenever it reconnects, since notifications may have been missed.
+"""
+
+import logging
+import os
+import select
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import psycopg2
+import psycopg2.extensions
+
+from synthgenie.db.connection import get_connection
+from synthgenie.metrics.registry import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+API_KEY_CACHE_ENABLED = os.getenv('API_KEY_CACHE_ENABLED', 'true').lower() == 'true'
+API_KEY_CACHE_MAX_ENTRIES = int(os.getenv('API_KEY_CACHE_MAX_ENTRIES', '10000'))
+# Lifetime of a verified key, and of an unknown one (kept short so a new key works quickly without a notification)
+API_KEY_CACHE_TTL_SECONDS = float(os.getenv('API_KEY_CACHE_TTL_SECONDS', '300'))
+API_KEY_CACHE_NEGATIVE_TTL_SECONDS = float(os.getenv('API_KEY_CACHE_NEGATIVE_TTL_SECONDS', '30'))
+
+# Channel the api_keys trigger notifies with the changed key
+API_KEY_CHANNEL = 'api_key_changes'
+
+# How often the listener wakes up to check for shutdown, pings its idle connection, and waits before reconnecting
+LISTENER_POLL_SECONDS = 1.0
+LISTENER_PING_SECONDS = 30.0
+LISTENER_RECONNECT_SECONDS = 5.0
+
+
+@dataclass
+class KeyCacheStats:
+    hits: int = 0
+    negative_hits: int = 0
+    misses: int = 0
+    limit_hits: int = 0
+    limit_misses: int = 0
+    invalidations: int = 0
+    resets: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.negative_hits + self.misses
+        return (self.hits + self.negative_hits) / lookups if lookups else 0.0
+
+
+@dataclass(frozen=True)
+class _KeyEntry:
+    valid: bool
+    expires_at: float
+    # The key's `API_KEY_LIMIT_COLUMNS`, empty for an unknown key
+    limits: Mapping[str, Any]
+
+
+class ApiKeyCache:
+    """
+    Thread-safe LRU cache with a TTL of whether API keys are valid, and of their usage limits.
+
+    The event loop reads it and the listener thread invalidates it. A verification that was
+    in flight while a key was invalidated must not be stored, so `set` takes the `generation`
+    read before querying and drops the result if anything was invalidated since.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = API_KEY_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = API_KEY_CACHE_TTL_SECONDS,
+        negative_ttl_seconds: float = API_KEY_CACHE_NEGATIVE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, _KeyEntry] = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.stats = KeyCacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def _entry(self, key: str) -> _KeyEntry | None:
+        # Called with the lock held
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= self._clock():
+            del self._entries[key]
+            self.stats.expirations += 1
+            return None
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def get(self, key: str) -> bool | None:
+        """Whether the key is valid, or None if it isn't cached."""
+        with self._lock:
+            entry = self._entry(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+
+            if entry.valid:
+                self.stats.hits += 1
+            else:
+                self.stats.negative_hits += 1
+            return entry.valid
+
+    def limits(self, key: str) -> Mapping[str, Any] | None:
+        """The key's limit columns, empty for an unknown key, or None if it isn't cached."""
+        with self._lock:
+            entry = self._entry(key)
+            if entry is None:
+                self.stats.limit_misses += 1
+                return None
+            self.stats.limit_hits += 1
+            return entry.limits
+
+    def set(self, key: str, limits: Mapping[str, Any] | None, generation: int) -> bool:
+        """
+        Store a verification made after reading `generation`.
+
+        Args:
+            key: API key value
+            limits: The key's limit columns, None if it isn't registered
+            generation: `generation` read before querying the key
+
+        Returns:
+            Whether it was stored, False if a key was invalidated in the meantime
+        """
+        valid = limits is not None
+        ttl = self.ttl_seconds if valid else self.negative_ttl_seconds
+        with self._lock:
+            if generation != self._generation:
+                return False
+            self._entries[key] = _KeyEntry(valid, self._clock() + ttl, dict(limits or {}))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+            return True
+
+    def invalidate(self, key: str) -> None:
+        """Forget a revoked, changed or newly created key."""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(key, None)
+            self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self.stats.resets += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                'enabled': API_KEY_CACHE_ENABLED,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'negative_ttl_seconds': self.negative_ttl_seconds,
+                'hits': self.stats.hits,
+                'negative_hits': self.stats.negative_hits,
+                'misses': self.stats.misses,
+                'limit_hits': self.stats.limit_hits,
+                'limit_misses': self.stats.limit_misses,
+                'invalidations': self.stats.invalidations,
+                'resets': self.stats.resets,
+                'evictions': self.stats.evictions,
+                'expirations': self.stats.expirations,
+                'hit_ratio': round(self.stats.hit_ratio, 4),
+                'listening': api_key_listener.listening,
+            }
+
+
+class ApiKeyListener:
+    """Background thread invalidating the cache on `api_key_changes` notifications from other workers."""
+
+    def __init__(
+        self,
+        cache: ApiKeyCache,
+        connect: Callable[[], psycopg2.extensions.connection] = lambda: get_connection(max_retries=1),
+    ):
+        self.cache = cache
+        self._connect = connect
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.listening = False
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='synthgenie-api-key-listener', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=LISTENER_POLL_SECONDS * 5)
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._connect()
+                conn.autocommit = True
+                with conn.cursor() as cursor:
+                    cursor.execute(f'LISTEN {API_KEY_CHANNEL}')
+                # Notifications sent while disconnected are lost, so nothing cached before can be trusted
+                self.cache.clear()
+                self.listening = True
+                logger.info(f'Listening for API key changes on {API_KEY_CHANNEL}')
+                self._listen(conn)
+            except Exception as e:
+                logger.warning(f'API key listener disconnected: {e}')
+            finally:
+                self.listening = False
+                if conn is not None:
+                    conn.close()
+            self._stop.wait(LISTENER_RECONNECT_SECONDS)
+
+    def _listen(self, conn: psycopg2.extensions.connection) -> None:
+        last_activity = time.monotonic()
+        while not self._stop.is_set():
+            if select.select([conn], [], [], LISTENER_POLL_SECONDS) == ([], [], []):
+                # A silently dropped connection only shows up when it's used
+                if time.monotonic() - last_activity >= LISTENER_PING_SECONDS:
+                    with conn.cursor() as cursor:
+                        cursor.execute('SELECT 1')
+                    last_activity = time.monotonic()
+                continue
+
+            conn.poll()
+            last_activity = time.monotonic()
+            while conn.notifies:
+                self.cache.invalidate(conn.notifies.pop(0).payload)
+
+
+api_key_cache = ApiKeyCache()
+api_key_listener = ApiKeyListener(api_key_cache)
+metrics_registry.register('api_key_cache', api_key_cache.snapshot)
@@ -1,13 +1,18 @@
 import logging
 import secrets
+from collections.abc import Mapping
 from datetime import datetime
 from typing import Any
 
 import psycopg2
+import psycopg2.extras
 from psycopg2.extras import DictCursor, DictRow
 
 logger = logging.getLogger(__name__)
 
+# Per-key agent budget columns, NULL where the default applies (see synthgenie.synthesizers.shared.budget)
+API_KEY_LIMIT_COLUMNS = ('max_model_requests', 'max_tool_calls', 'max_input_tokens', 'max_output_tokens')
+
 
 def create_api_key(conn: psycopg2.extensions.connection, user_id: str) -> dict[str, Any]:
     """
@@ -53,6 +58,23 @@ def get_api_key_from_db(conn: psycopg2.extensions.connection, key: str) -> dict[
     return dict(row) if row else None
 
 
+def get_api_key_limits(conn: psycopg2.extensions.connection, key: str) -> dict[str, Any] | None:
+    """
+    Get the usage limits of an API key.
+
+    Args:
+        conn: Database connection
+        key: API key value
+
+    Returns:
+        The key's limit columns (NULL where the default applies) if found, None otherwise
+    """
+    cursor: DictCursor = conn.cursor(cursor_factory=DictCursor)
+    cursor.execute(f'SELECT {", ".join(API_KEY_LIMIT_COLUMNS)} FROM api_keys WHERE key = %s', (key,))  # type: ignore
+    row: DictRow | None = cursor.fetchone()
+    return dict(row) if row else None
+
+
 def get_user_api_keys(conn: psycopg2.extensions.connection, user_id: str) -> list[dict[str, Any]]:
     """
     Get all API keys for a user.
@@ -86,48 +108,72 @@ def delete_api_key(conn: psycopg2.extensions.connection, key: str) -> bool:
     return cursor.rowcount > 0
 
 
-def track_api_key_usage(conn: psycopg2.extensions.connection, key: str) -> None:
+def write_api_key_usage(conn: psycopg2.extensions.connection, counts: Mapping[str, int]) -> int:
     """
-    Track usage of an API key by incrementing its request counter.
+    Add request counts to several API keys in one statement.
+
+    Keys that no longer exist (the admin key, or revoked since their requests) are skipped. Rows
+    are written in key order, so concurrent writes from several workers can't deadlock.
 
     Args:
         conn: Database connection
-        key: API key value
+        counts: Requests to record per API key value
+
+    Returns:
+        Number of keys whose usage was recorded
+
+    Raises:
+        psycopg2.Error: If the write fails; the transaction is rolled back
     """
-    cursor: DictCursor = conn.cursor(cursor_factory=DictCursor)
+    rows = sorted((key, count) for key, count in counts.items() if count > 0)
+    if not rows:
+        return 0
 
+    cursor = conn.cursor()
     try:
-        # First check if API key exists in api_keys table
-        cursor.execute('SELECT key FROM api_keys WHERE key = %s', (key,))  # type: ignore
-        api_key_exists = cursor.fetchone()
-
-        if not api_key_exists:
-            # API key doesn't exist, skip tracking
-            logger.warning(f'Attempted to track usage for non-existent API key: {key}')
-            return
-
-        # Check if key exists in usage table
-        cursor.execute('SELECT key FROM api_key_usage WHERE key = %s', (key,))  # type: ignore
-        exists = cursor.fetchone()
-
-        if exists:
-            # Update existing record
-            cursor.execute(  # type: ignore
-                'UPDATE api_key_usage SET request_count = request_count + 1, last_used_at = CURRENT_TIMESTAMP WHERE key = %s',
-                (key,),
-            )
-        else:
-            # Insert new record
-            cursor.execute(  # type: ignore
-                'INSERT INTO api_key_usage (key, request_count, last_used_at) VALUES (%s, 1, CURRENT_TIMESTAMP)',
-                (key,),
-            )
-
+        psycopg2.extras.execute_values(  # type: ignore
+            cursor,
+            """
+            INSERT INTO api_key_usage (key, request_count, last_used_at)
+            SELECT v.key, v.request_count, CURRENT_TIMESTAMP
+            FROM (VALUES %s) AS v (key, request_count)
+            JOIN api_keys a ON a.key = v.key
+            ORDER BY v.key
+            ON CONFLICT (key) DO UPDATE
+            SET request_count = api_key_usage.request_count + EXCLUDED.request_count,
+                last_used_at = EXCLUDED.last_used_at
+            """,
+            rows,
+            page_size=len(rows),
+        )
+        written = cursor.rowcount
         conn.commit()
+    except psycopg2.Error:
+        conn.rollback()
+        raise
+
+    if written < len(rows):
+        logger.info(f'Skipped usage of {len(rows) - written} non-existent API keys')
+    return written
+
+
+def track_api_key_usage(conn: psycopg2.extensions.connection, key: str, count: int = 1) -> None:
+    """
+    Track usage of an API key by incrementing its request counter right away.
+
+    Requests record their usage through `synthgenie.auth.usage.usage_tracker`, which batches
+    these writes; this is for scripts and benchmarks.
+
+    Args:
+        conn: Database connection
+        key: API key value
+        count: Number of requests to record, e.g. the size of a batch
+    """
+    try:
+        write_api_key_usage(conn, {key: count})
     except psycopg2.Error as e:
         # Log error but don't fail the request
         logger.error(f'Error tracking API key usage: {e}')
-        conn.rollback()
 
 
 def get_api_key_usage(conn: psycopg2.extensions.connection, key: str) -> dict[str, Any] | None:
@@ -1,21 +1,35 @@
 import os
+from typing import Any
 
-import psycopg2
-from fastapi import APIRouter, Depends, HTTPException, Security
+from fastapi import APIRouter, HTTPException, Query, Security
 
 from synthgenie.auth.models import get_all_api_key_usage, get_api_key_usage, get_user_api_keys
 from synthgenie.auth.schemas import ApiKeyRequest, ApiKeyResponse, ApiKeyUsage, RevokeRequest
 from synthgenie.auth.services import get_api_key, register_api_key, revoke_api_key
-from synthgenie.db.connection import get_db
+from synthgenie.auth.usage_events import Granularity, get_usage_rollups, rollup_since
+from synthgenie.db.executor import run_db
 
 router = APIRouter(prefix='/api-keys', tags=['api-keys'])
 
+# Hourly or daily rollups to return, and how many of the most recent ones
+GRANULARITY_QUERY = Query(default='day', description='Rollup bucket size')
+PERIODS_QUERY = Query(default=7, ge=1, le=366, description='Number of most recent buckets, the current one included')
+
+
+async def _with_rollups(
+    usage: list[dict[str, Any]], granularity: Granularity, periods: int, key: str | None = None
+) -> list[dict[str, Any]]:
+    rollups = await run_db(get_usage_rollups, None, granularity, rollup_since(granularity, periods), key)
+    by_key: dict[str, list[dict[str, Any]]] = {}
+    for rollup in rollups:
+        by_key.setdefault(rollup['key'], []).append(rollup)
+    return [{**row, 'rollups': by_key.get(row['key'], [])} for row in usage]
+
 
 @router.post('/generate', response_model=ApiKeyResponse)
 async def create_api_key(
     request: ApiKeyRequest,
     admin_key: str = Security(get_api_key),
-    conn: psycopg2.extensions.connection = Depends(get_db),
 ):
     """
     Generate a new API key for a user.
@@ -26,7 +40,7 @@ async def create_api_key(
     if not admin_api_key or admin_key != admin_api_key:
         raise HTTPException(status_code=403, detail='Only admin can generate API keys')
 
-    api_key = register_api_key(conn, request.user_id)
+    api_key = await run_db(register_api_key, None, request.user_id)
     return ApiKeyResponse(api_key=api_key, message=f'API key generated for user {request.user_id}')
 
 
@@ -34,7 +48,6 @@ async def create_api_key(
 async def delete_api_key(
     request: RevokeRequest,
     admin_key: str = Security(get_api_key),
-    conn: psycopg2.extensions.connection = Depends(get_db),
 ):
     """
     Revoke an API key.
@@ -45,7 +58,7 @@ async def delete_api_key(
     if not admin_api_key or admin_key != admin_api_key:
         raise HTTPException(status_code=403, detail='Only admin can revoke API keys')
 
-    if revoke_api_key(conn, request.api_key):
+    if await run_db(revoke_api_key, None, request.api_key):
         return ApiKeyResponse(api_key=request.api_key, message='API key successfully revoked')
 
     raise HTTPException(status_code=404, detail='API key not found')
@@ -55,7 +68,6 @@ async def delete_api_key(
 async def list_user_api_keys(
     user_id: str,
     admin_key: str = Security(get_api_key),
-    conn: psycopg2.extensions.connection = Depends(get_db),
 ):
     """
     List all API keys for a user.
@@ -66,17 +78,18 @@ async def list_user_api_keys(
     if not admin_api_key or admin_key != admin_api_key:
         raise HTTPException(status_code=403, detail='Only admin can list API keys')
 
-    api_keys = get_user_api_keys(conn, user_id)
+    api_keys = await run_db(get_user_api_keys, None, user_id)
     return [key['key'] for key in api_keys]
 
 
 @router.get('/usage', response_model=list[ApiKeyUsage])
 async def get_all_usage_stats(
     admin_key: str = Security(get_api_key),
-    conn: psycopg2.extensions.connection = Depends(get_db),
+    granularity: Granularity = GRANULARITY_QUERY,
+    periods: int = PERIODS_QUERY,
 ):
     """
-    Get usage statistics for all API keys.
+    Get usage statistics for all API keys, with their hourly or daily rollups.
     Only accessible with admin API key.
     """
     # Check if using admin key
@@ -84,17 +97,18 @@ async def get_all_usage_stats(
     if not admin_api_key or admin_key != admin_api_key:
         raise HTTPException(status_code=403, detail='Only admin can view usage statistics')
 
-    return get_all_api_key_usage(conn)
+    return await _with_rollups(await run_db(get_all_api_key_usage, None), granularity, periods)
 
 
 @router.get('/usage/{api_key_value}', response_model=ApiKeyUsage)
 async def get_key_usage_stats(
     api_key_value: str,
     current_api_key: str = Security(get_api_key),
-    conn: psycopg2.extensions.connection = Depends(get_db),
+    granularity: Granularity = GRANULARITY_QUERY,
+    periods: int = PERIODS_QUERY,
 ):
     """
-    Get usage statistics for a specific API key.
+    Get usage statistics for a specific API key, with its hourly or daily rollups.
     Accessible by admin or the owner of the API key.
     """
     admin_api_key = os.getenv('ADMIN_API_KEY')
@@ -108,8 +122,9 @@ async def get_key_usage_stats(
             detail='You can only view usage statistics for your own API key',
         )
 
-    usage = get_api_key_usage(conn, api_key_value)
+    usage = await run_db(get_api_key_usage, None, api_key_value)
     if not usage:
         raise HTTPException(status_code=404, detail='API key not found or no usage data')
 
+    [usage] = await _with_rollups([usage], granularity, periods, api_key_value)
     return usage
@@ -16,7 +16,25 @@ class RevokeRequest(BaseModel):
     api_key: str
 
 
+class UsageRollup(BaseModel):
+    """Agent requests of an API key to one synth in one hour or day."""
+
+    bucket: datetime
+    synth: str
+    requests: int
+    errors: int
+    cache_hits: int
+    avg_latency_ms: float
+    max_latency_ms: int
+    input_tokens: int
+    cached_input_tokens: int
+    output_tokens: int
+    tool_calls: int
+    cost_usd: float
+
+
 class ApiKeyUsage(BaseModel):
     key: str
     request_count: int
     last_used_at: datetime | None = None
+    rollups: list[UsageRollup] = []
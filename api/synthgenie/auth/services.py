@@ -1,20 +1,29 @@
 import os
+from collections.abc import Mapping
+from typing import Any
 
-from fastapi import Depends, HTTPException, Security
+from fastapi import HTTPException, Security
 from fastapi.security.api_key import APIKeyHeader
 from psycopg2.extensions import connection as PgConnection
 from starlette.status import HTTP_403_FORBIDDEN
 
-from synthgenie.auth.models import create_api_key, delete_api_key, get_api_key_from_db
-from synthgenie.db.connection import get_db
+from synthgenie.auth.key_cache import API_KEY_CACHE_ENABLED, api_key_cache
+from synthgenie.auth.models import (
+    API_KEY_LIMIT_COLUMNS,
+    create_api_key,
+    delete_api_key,
+    get_api_key_from_db,
+    get_api_key_limits,
+)
+from synthgenie.auth.usage import set_request_api_key
+from synthgenie.db.executor import run_db
 
 API_KEY_NAME = 'X-API-Key'
 _api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
 
 
-def get_api_key(
+async def get_api_key(
     api_key_header: str | None = Security(_api_key_header),
-    conn: PgConnection = Depends(get_db),
 ) -> str:
     """
     Validate API key from header.
@@ -27,24 +36,66 @@ def get_api_key(
     if admin_api_key and api_key_header == admin_api_key:
         return api_key_header
 
-    # Then check against registered API keys in database
-    api_key_data = get_api_key_from_db(conn, api_key_header)
-    if api_key_data:
+    # Then check against registered API keys, cached in-process
+    if await verify_api_key(api_key_header):
+        set_request_api_key(api_key_header)
         return api_key_header
 
     raise HTTPException(status_code=HTTP_403_FORBIDDEN, detail='Invalid API Key')
 
 
+async def verify_api_key(api_key: str) -> bool:
+    """
+    Check that an API key is registered, from the API key cache when possible.
+    """
+    if not API_KEY_CACHE_ENABLED:
+        return await run_db(get_api_key_from_db, None, api_key) is not None
+
+    valid = api_key_cache.get(api_key)
+    if valid is None:
+        generation = api_key_cache.generation
+        row = await run_db(get_api_key_from_db, None, api_key)
+        # The row has the key's limits too, cached for `get_api_key_limits_cached`
+        limits = {column: row.get(column) for column in API_KEY_LIMIT_COLUMNS} if row else None
+        api_key_cache.set(api_key, limits, generation)
+        valid = row is not None
+    return valid
+
+
+async def get_api_key_limits_cached(api_key: str) -> Mapping[str, Any]:
+    """
+    Get the usage limit columns of an API key, from the API key cache when possible.
+
+    Returns:
+        The key's limit columns (NULL where the default applies), empty if it isn't registered
+    """
+    if not API_KEY_CACHE_ENABLED:
+        return await run_db(get_api_key_limits, None, api_key) or {}
+
+    limits = api_key_cache.limits(api_key)
+    if limits is None:
+        generation = api_key_cache.generation
+        limits = await run_db(get_api_key_limits, None, api_key)
+        api_key_cache.set(api_key, limits, generation)
+    return limits or {}
+
+
 def register_api_key(conn: PgConnection, user_id: str) -> str:
     """
     Register a new API key for a user.
     """
     api_key = create_api_key(conn, user_id)
+    api_key_cache.invalidate(api_key['key'])
     return api_key['key']
 
 
 def revoke_api_key(conn: PgConnection, api_key: str) -> bool:
     """
     Revoke an API key.
+
+    The worker's cached verification is dropped at once; other workers drop theirs on the
+    notification sent by the api_keys trigger.
     """
-    return delete_api_key(conn, api_key)
+    revoked = delete_api_key(conn, api_key)
+    api_key_cache.invalidate(api_key)
+    return revoked
@@ -0,0 +1,287 @@
+"""Write-behind usage tracking for API keys.
+
+Every request counts against its API key. Writing each count as it happens puts a database
+round trip on the request path, and concurrent requests for a popular key queue on the same
+`api_key_usage` row. Requests instead add their counts in memory with `usage_tracker.record`,
+and a background task writes them every `USAGE_FLUSH_INTERVAL_SECONDS` as one multi-row upsert
+(`write_api_key_usage`). `UsageEventMiddleware` queues a usage event per agent request the same
+way, written with its rollups by `write_usage_events` (see `synthgenie.auth.usage_events`).
+
+The tracker flushes once more when the app shuts down. A crashed worker loses at most the last
+interval's counts and events; a failed flush keeps them for the next one, up to
+`USAGE_EVENTS_MAX_PENDING` events.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from synthgenie.auth.models import write_api_key_usage
+from synthgenie.auth.usage_events import USAGE_EVENTS_ENABLED, UsageEvent, maintain_usage_partitions, write_usage_events
+from synthgenie.db.executor import run_db
+from synthgenie.metrics.registry import metrics_registry
+from synthgenie.metrics.token_usage import current_request_totals
+
+logger = logging.getLogger(__name__)
+
+# How often pending usage is written, i.e. the most usage a crashed worker can lose
+USAGE_FLUSH_INTERVAL_SECONDS = float(os.getenv('USAGE_FLUSH_INTERVAL_SECONDS', '5'))
+# Events kept while the database can't take them; the oldest are dropped beyond this
+USAGE_EVENTS_MAX_PENDING = int(os.getenv('USAGE_EVENTS_MAX_PENDING', '50000'))
+
+# How often event partitions are created ahead and expired
+PARTITION_MAINTENANCE_SECONDS = 3600
+
+# Response header with the cache status, see synthgenie.synthesizers.shared.cache
+CACHE_HEADER = b'x-synthgenie-cache'
+
+
+@dataclass
+class UsageStats:
+    flushes: int = 0
+    flush_failures: int = 0
+    flushed_requests: int = 0
+    flushed_events: int = 0
+    dropped_events: int = 0
+    last_flush_ms: float | None = None
+
+
+class UsageTracker:
+    """Accumulates request counts and usage events on the event loop and writes them in batches."""
+
+    def __init__(
+        self, interval_seconds: float = USAGE_FLUSH_INTERVAL_SECONDS, max_pending_events: int = USAGE_EVENTS_MAX_PENDING
+    ):
+        self.interval_seconds = interval_seconds
+        self._pending: Counter[str] = Counter()
+        self._events: deque[UsageEvent] = deque(maxlen=max_pending_events)
+        self._task: asyncio.Task[None] | None = None
+        self._flush_lock = asyncio.Lock()
+        self._maintained_at: float | None = None
+        self.stats = UsageStats()
+
+    def record(self, api_key: str, count: int = 1) -> None:
+        """Count requests against an API key, written with the next flush."""
+        if count > 0:
+            self._pending[api_key] += count
+
+    def record_event(self, event: UsageEvent) -> None:
+        """Queue a usage event, written with the next flush."""
+        if len(self._events) == self._events.maxlen:
+            self.stats.dropped_events += 1
+        self._events.append(event)
+
+    async def flush(self) -> int:
+        """
+        Write the pending counts in one statement, then the pending events and their rollups in one transaction.
+
+        Returns:
+            Number of requests written; on failure the counts or events stay pending
+        """
+        async with self._flush_lock:
+            started = time.perf_counter()
+            requests = await self._flush_counts()
+            await self._flush_events()
+            self.stats.last_flush_ms = round((time.perf_counter() - started) * 1000, 2)
+            return requests
+
+    async def _flush_counts(self) -> int:
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, Counter()
+        try:
+            await run_db(write_api_key_usage, None, pending)
+        except Exception as e:
+            # Keep the counts, including any recorded meanwhile, for the next flush
+            self._pending.update(pending)
+            self.stats.flush_failures += 1
+            logger.error(f'Error writing usage of {len(pending)} API keys: {e}')
+            return 0
+
+        requests = pending.total()
+        self.stats.flushes += 1
+        self.stats.flushed_requests += requests
+        return requests
+
+    async def _flush_events(self) -> None:
+        if not self._events:
+            return
+
+        events = list(self._events)
+        self._events.clear()
+        try:
+            await run_db(write_usage_events, None, events)
+        except Exception as e:
+            # Requeue ahead of the events recorded meanwhile, dropping the oldest beyond the limit
+            requeued = deque(events, maxlen=self._events.maxlen)
+            requeued.extend(self._events)
+            self.stats.dropped_events += len(events) + len(self._events) - len(requeued)
+            self._events = requeued
+            # A missing partition is created before the next flush
+            self._maintained_at = None
+            self.stats.flush_failures += 1
+            logger.error(f'Error writing {len(events)} usage events: {e}')
+            return
+
+        self.stats.flushed_events += len(events)
+
+    async def maintain(self) -> None:
+        """Create the coming days' event partitions and drop the expired ones."""
+        try:
+            await run_db(maintain_usage_partitions, None)
+        except Exception as e:
+            logger.error(f'Error maintaining usage event partitions: {e}')
+            return
+        self._maintained_at = time.monotonic()
+
+    async def _run(self) -> None:
+        while True:
+            if USAGE_EVENTS_ENABLED and (
+                self._maintained_at is None or time.monotonic() - self._maintained_at >= PARTITION_MAINTENANCE_SECONDS
+            ):
+                await self.maintain()
+            await asyncio.sleep(self.interval_seconds)
+            await self.flush()
+
+    def start(self) -> None:
+        """Start the periodic flush, from the app lifespan."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name='synthgenie-usage-flush')
+
+    async def stop(self) -> None:
+        """Stop the periodic flush and write what's pending, before the database executor shuts down."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.flush()
+        if self._pending:
+            logger.error(f'Lost usage of {len(self._pending)} API keys at shutdown: {self._pending.total()} requests')
+        if self._events:
+            logger.error(f'Lost {len(self._events)} usage events at shutdown')
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            'flush_interval_seconds': self.interval_seconds,
+            'pending_keys': len(self._pending),
+            'pending_requests': self._pending.total(),
+            'pending_events': len(self._events),
+            'flushes': self.stats.flushes,
+            'flush_failures': self.stats.flush_failures,
+            'flushed_requests': self.stats.flushed_requests,
+            'flushed_events': self.stats.flushed_events,
+            'dropped_events': self.stats.dropped_events,
+            'last_flush_ms': self.stats.last_flush_ms,
+        }
+
+
+usage_tracker = UsageTracker()
+metrics_registry.register('api_key_usage', usage_tracker.snapshot)
+
+
+@dataclass
+class _RequestKey:
+    api_key: str | None = None
+
+
+_request_key: ContextVar[_RequestKey | None] = ContextVar('request_key', default=None)
+
+
+def set_request_api_key(api_key: str) -> None:
+    """Attribute the current request's usage event to a verified API key."""
+    request_key = _request_key.get()
+    if request_key is not None:
+        request_key.api_key = api_key
+
+
+class UsageEventMiddleware:
+    """
+    Record a usage event for each agent request (`/agent/<synth>/...`) made with a registered API key.
+
+    Must run inside `TokenUsageMiddleware`, whose totals supply the request's models and tokens.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path: str = scope.get('path', '')
+        if scope['type'] != 'http' or not USAGE_EVENTS_ENABLED or not path.startswith('/agent/'):
+            await self.app(scope, receive, send)
+            return
+
+        occurred_at = datetime.now(UTC)
+        started = time.perf_counter()
+        request_key = _RequestKey()
+        token = _request_key.set(request_key)
+        response: dict[str, Any] = {'status': 500, 'cache': None}
+
+        async def send_with_status(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+                for name, value in message.get('headers', []):
+                    if name.lower() == CACHE_HEADER:
+                        response['cache'] = value.decode()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _request_key.reset(token)
+            _, synth, *endpoint = path.strip('/').split('/') + ['']
+            if request_key.api_key is not None:
+                usage_tracker.record_event(
+                    _usage_event(
+                        occurred_at,
+                        request_key.api_key,
+                        synth,
+                        '/'.join(endpoint).strip('/'),
+                        response,
+                        round((time.perf_counter() - started) * 1000),
+                    )
+                )
+
+
+def _usage_event(
+    occurred_at: datetime, api_key: str, synth: str, endpoint: str, response: dict[str, Any], latency_ms: int
+) -> UsageEvent:
+    totals = current_request_totals()
+    if totals is None:
+        return UsageEvent(occurred_at, api_key, synth, endpoint, response['status'], latency_ms, response['cache'])
+
+    # Digitone machine agents run as `digitone.<machine>` stages
+    machines = sorted(
+        stage.removeprefix(f'{synth}.')
+        for stage in totals.stages
+        if synth == 'digitone' and stage.startswith('digitone.') and stage != 'digitone.router'
+    )
+    return UsageEvent(
+        occurred_at=occurred_at,
+        key=api_key,
+        synth=synth,
+        endpoint=endpoint,
+        status_code=response['status'],
+        latency_ms=latency_ms,
+        cache=response['cache'],
+        machines=tuple(machines),
+        models=tuple(sorted(totals.models)),
+        model_requests=totals.usage.requests,
+        input_tokens=totals.usage.input_tokens,
+        cached_input_tokens=totals.usage.cache_read_tokens,
+        output_tokens=totals.usage.output_tokens,
+        tool_calls=sum(stage.tool_calls for stage in totals.stages.values()),
+        cost_usd=totals.cost,
+    )
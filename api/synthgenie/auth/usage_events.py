@@ -0,0 +1,299 @@
+"""Per-request usage events, partitioned by day, with hourly and daily rollups.
+
+`api_key_usage` only counts requests. Each agent request also leaves a `usage_events` row with
+its synth, endpoint, status, cache status, latency, machines, models, tokens and cost. The table
+is append-only and range-partitioned by day (`usage_events_pYYYYMMDD`), so expiring old events
+drops whole partitions instead of deleting rows.
+
+Events are written in batches by `synthgenie.auth.usage.usage_tracker`. The same transaction
+adds them to `usage_rollup_hourly` and `usage_rollup_daily`, one row per key, synth and bucket,
+so usage reports read a handful of rollup rows rather than scanning events. Raw events and
+hourly rollups are kept for `USAGE_EVENTS_RETENTION_DAYS`; daily rollups are kept indefinitely.
+"""
+
+import logging
+import os
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from typing import Any, Literal
+
+import psycopg2
+import psycopg2.extras
+from psycopg2.extras import DictCursor
+
+logger = logging.getLogger(__name__)
+
+USAGE_EVENTS_ENABLED = os.getenv('USAGE_EVENTS_ENABLED', 'true').lower() == 'true'
+# Days of raw events and hourly rollups kept, and daily partitions created ahead of time
+USAGE_EVENTS_RETENTION_DAYS = int(os.getenv('USAGE_EVENTS_RETENTION_DAYS', '30'))
+USAGE_EVENTS_PARTITIONS_AHEAD = int(os.getenv('USAGE_EVENTS_PARTITIONS_AHEAD', '2'))
+
+# Serializes partition maintenance across workers (pg_advisory_xact_lock key)
+PARTITION_LOCK_ID = 7_215_032
+PARTITION_PREFIX = 'usage_events_p'
+
+Granularity = Literal['hour', 'day']
+
+ROLLUP_TABLES: dict[Granularity, str] = {'hour': 'usage_rollup_hourly', 'day': 'usage_rollup_daily'}
+
+
+@dataclass(frozen=True)
+class UsageEvent:
+    """One agent request of an API key."""
+
+    occurred_at: datetime
+    key: str
+    synth: str
+    endpoint: str
+    status_code: int
+    latency_ms: int
+    cache: str | None = None
+    machines: tuple[str, ...] = ()
+    models: tuple[str, ...] = ()
+    model_requests: int = 0
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    output_tokens: int = 0
+    tool_calls: int = 0
+    cost_usd: float = 0.0
+
+
+@dataclass
+class _Rollup:
+    requests: int = 0
+    errors: int = 0
+    cache_hits: int = 0
+    latency_ms_total: int = 0
+    latency_ms_max: int = 0
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    output_tokens: int = 0
+    tool_calls: int = 0
+    cost_usd: float = 0.0
+
+    def add(self, event: UsageEvent) -> None:
+        self.requests += 1
+        self.errors += event.status_code >= 400
+        self.cache_hits += event.cache in ('hit', 'semantic')
+        self.latency_ms_total += event.latency_ms
+        self.latency_ms_max = max(self.latency_ms_max, event.latency_ms)
+        self.input_tokens += event.input_tokens
+        self.cached_input_tokens += event.cached_input_tokens
+        self.output_tokens += event.output_tokens
+        self.tool_calls += event.tool_calls
+        self.cost_usd += event.cost_usd
+
+    def values(self) -> tuple[Any, ...]:
+        return (
+            self.requests,
+            self.errors,
+            self.cache_hits,
+            self.latency_ms_total,
+            self.latency_ms_max,
+            self.input_tokens,
+            self.cached_input_tokens,
+            self.output_tokens,
+            self.tool_calls,
+            self.cost_usd,
+        )
+
+
+def bucket_start(moment: datetime, granularity: Granularity) -> datetime:
+    """Start of the UTC hour or day containing `moment`."""
+    moment = moment.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0) if granularity == 'day' else moment
+
+
+def rollup_since(granularity: Granularity, periods: int, now: datetime | None = None) -> datetime:
+    """Start of the oldest of the last `periods` hours or days, the current one included."""
+    step = timedelta(hours=1) if granularity == 'hour' else timedelta(days=1)
+    return bucket_start(now or datetime.now(UTC), granularity) - step * (periods - 1)
+
+
+def _rollup_rows(events: Sequence[UsageEvent], granularity: Granularity) -> list[tuple[Any, ...]]:
+    rollups: dict[tuple[str, datetime, str], _Rollup] = {}
+    for event in events:
+        rollups.setdefault((event.key, bucket_start(event.occurred_at, granularity), event.synth), _Rollup()).add(event)
+    # Key order, so concurrent flushes from several workers can't deadlock on the rollup rows
+    return [(*group, *rollup.values()) for group, rollup in sorted(rollups.items())]
+
+
+def write_usage_events(conn: psycopg2.extensions.connection, events: Sequence[UsageEvent]) -> None:
+    """
+    Append events and add them to the hourly and daily rollups, in one transaction.
+
+    Args:
+        conn: Database connection
+        events: Events to write
+
+    Raises:
+        psycopg2.Error: If the write fails, e.g. no partition covers an event; the transaction is rolled back
+    """
+    if not events:
+        return
+
+    cursor = conn.cursor()
+    try:
+        psycopg2.extras.execute_values(  # type: ignore
+            cursor,
+            """
+            INSERT INTO usage_events (
+                occurred_at, key, synth, endpoint, status_code, latency_ms, cache, machines, models,
+                model_requests, input_tokens, cached_input_tokens, output_tokens, tool_calls, cost_usd
+            ) VALUES %s
+            """,
+            [
+                (
+                    event.occurred_at,
+                    event.key,
+                    event.synth,
+                    event.endpoint,
+                    event.status_code,
+                    event.latency_ms,
+                    event.cache,
+                    list(event.machines),
+                    list(event.models),
+                    event.model_requests,
+                    event.input_tokens,
+                    event.cached_input_tokens,
+                    event.output_tokens,
+                    event.tool_calls,
+                    event.cost_usd,
+                )
+                for event in events
+            ],
+            page_size=1000,
+        )
+        for granularity, table in ROLLUP_TABLES.items():
+            rows = _rollup_rows(events, granularity)
+            psycopg2.extras.execute_values(  # type: ignore
+                cursor,
+                f"""
+                INSERT INTO {table} (
+                    key, bucket, synth, requests, errors, cache_hits, latency_ms_total, latency_ms_max,
+                    input_tokens, cached_input_tokens, output_tokens, tool_calls, cost_usd
+                ) VALUES %s
+                ON CONFLICT (key, bucket, synth) DO UPDATE SET
+                    requests = {table}.requests + EXCLUDED.requests,
+                    errors = {table}.errors + EXCLUDED.errors,
+                    cache_hits = {table}.cache_hits + EXCLUDED.cache_hits,
+                    latency_ms_total = {table}.latency_ms_total + EXCLUDED.latency_ms_total,
+                    latency_ms_max = GREATEST({table}.latency_ms_max, EXCLUDED.latency_ms_max),
+                    input_tokens = {table}.input_tokens + EXCLUDED.input_tokens,
+                    cached_input_tokens = {table}.cached_input_tokens + EXCLUDED.cached_input_tokens,
+                    output_tokens = {table}.output_tokens + EXCLUDED.output_tokens,
+                    tool_calls = {table}.tool_calls + EXCLUDED.tool_calls,
+                    cost_usd = {table}.cost_usd + EXCLUDED.cost_usd
+                """,
+                rows,
+                page_size=len(rows),
+            )
+        conn.commit()
+    except psycopg2.Error:
+        conn.rollback()
+        raise
+
+
+def get_usage_rollups(
+    conn: psycopg2.extensions.connection, granularity: Granularity, since: datetime, key: str | None = None
+) -> list[dict[str, Any]]:
+    """
+    Get the rollups from `since` on, of one API key or of all of them.
+
+    Args:
+        conn: Database connection
+        granularity: 'hour' or 'day'
+        since: Start of the oldest bucket
+        key: API key value, None for every key
+
+    Returns:
+        One dictionary per key, bucket and synth, ordered by key and bucket
+    """
+    table = ROLLUP_TABLES[granularity]
+    cursor: DictCursor = conn.cursor(cursor_factory=DictCursor)
+    cursor.execute(  # type: ignore
+        f"""
+        SELECT key, bucket, synth, requests, errors, cache_hits,
+            ROUND(latency_ms_total::numeric / requests, 1)::float AS avg_latency_ms,
+            latency_ms_max AS max_latency_ms, input_tokens, cached_input_tokens, output_tokens, tool_calls, cost_usd
+        FROM {table}
+        WHERE bucket >= %s AND (%s::text IS NULL OR key = %s)
+        ORDER BY key, bucket, synth
+        """,
+        (since, key, key),
+    )
+    return [dict(row) for row in cursor.fetchall()]
+
+
+def _partition_day(name: str) -> date | None:
+    try:
+        return datetime.strptime(name.removeprefix(PARTITION_PREFIX), '%Y%m%d').date()
+    except ValueError:
+        return None
+
+
+def maintain_usage_partitions(
+    conn: psycopg2.extensions.connection,
+    today: date | None = None,
+    days_ahead: int = USAGE_EVENTS_PARTITIONS_AHEAD,
+    retention_days: int = USAGE_EVENTS_RETENTION_DAYS,
+) -> tuple[list[str], list[str]]:
+    """
+    Create the coming days' event partitions, and drop partitions and hourly rollups past retention.
+
+    Workers run this concurrently; an advisory lock makes them take turns.
+
+    Args:
+        conn: Database connection
+        today: The current UTC day
+        days_ahead: Days after today to create partitions for
+        retention_days: Days of events and hourly rollups to keep, today included
+
+    Returns:
+        The partitions created and dropped
+    """
+    today = today or datetime.now(UTC).date()
+    cutoff = today - timedelta(days=retention_days - 1)
+    cursor = conn.cursor()
+    try:
+        cursor.execute('SELECT pg_advisory_xact_lock(%s)', (PARTITION_LOCK_ID,))
+        cursor.execute(
+            """
+            SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'usage_events'::regclass
+            """
+        )
+        existing = {name for (name,) in cursor.fetchall()}
+
+        created: list[str] = []
+        for offset in range(days_ahead + 1):
+            day = today + timedelta(days=offset)
+            name = f'{PARTITION_PREFIX}{day:%Y%m%d}'
+            if name not in existing:
+                start = datetime(day.year, day.month, day.day, tzinfo=UTC)
+                cursor.execute(
+                    f'CREATE TABLE {name} PARTITION OF usage_events FOR VALUES FROM (%s) TO (%s)',
+                    (start, start + timedelta(days=1)),
+                )
+                created.append(name)
+
+        dropped: list[str] = []
+        for name in sorted(existing):
+            day = _partition_day(name)
+            if day is not None and day < cutoff:
+                cursor.execute(f'DROP TABLE {name}')
+                dropped.append(name)
+
+        cursor.execute(
+            'DELETE FROM usage_rollup_hourly WHERE bucket < %s',
+            (datetime(cutoff.year, cutoff.month, cutoff.day, tzinfo=UTC),),
+        )
+        conn.commit()
+    except psycopg2.Error:
+        conn.rollback()
+        raise
+
+    if created or dropped:
+        logger.info(f'Usage event partitions created: {created or "none"}, dropped: {dropped or "none"}')
+    return created, dropped
@@ -0,0 +1,573 @@
+"""Curated Digitone presets: a full parameter set per machine and sound archetype.
+
+Parameters are keyed by their registry name (the tool name without `set_`) and hold MIDI
+values, as sent by the tools. A preset's `keywords` are the words that select it in a prompt,
+matched whole and case-insensitively.
+
+Bump a preset's `version` whenever its parameters change, and `PRESET_LIBRARY_VERSION`
+whenever any preset is added, removed or changed.
+"""
+
+PRESET_LIBRARY_VERSION = 1
+
+DIGITONE_PRESETS = {
+    'fm_tone': {
+        'piano': {
+            'version': 1,
+            'keywords': ['electric piano', 'e-piano', 'epiano', 'rhodes', 'piano', 'keys'],
+            'parameters': {
+                'fm_tone_algorithm': 4,
+                'fm_tone_c_ratio': 3,
+                'fm_tone_a_ratio': 11,
+                'fm_tone_b_ratio': 40,
+                'fm_tone_harmonics': 8063,
+                'fm_tone_detune': 350,
+                'fm_tone_feedback': 8,
+                'fm_tone_mix': 50,
+                'fm_tone_a_attack': 0,
+                'fm_tone_a_decay': 62,
+                'fm_tone_a_end': 0,
+                'fm_tone_a_level': 72,
+                'fm_tone_b_attack': 0,
+                'fm_tone_b_decay': 48,
+                'fm_tone_b_end': 0,
+                'fm_tone_b_level': 40,
+                'amp_attack': 0,
+                'amp_decay': 84,
+                'amp_sustain': 38,
+                'amp_release': 52,
+                'multi_mode_filter_frequency': 12288,
+                'multi_mode_filter_resonance': 10,
+                'fx_chorus': 28,
+                'fx_reverb': 30,
+            },
+        },
+        'bass': {
+            'version': 1,
+            'keywords': ['sub bass', 'bassline', 'bass'],
+            'parameters': {
+                'fm_tone_algorithm': 0,
+                'fm_tone_c_ratio': 3,
+                'fm_tone_a_ratio': 3,
+                'fm_tone_b_ratio': 20,
+                'fm_tone_harmonics': 8063,
+                'fm_tone_detune': 0,
+                'fm_tone_feedback': 24,
+                'fm_tone_mix': 36,
+                'fm_tone_a_attack': 0,
+                'fm_tone_a_decay': 42,
+                'fm_tone_a_end': 10,
+                'fm_tone_a_level': 64,
+                'fm_tone_b_attack': 0,
+                'fm_tone_b_decay': 30,
+                'fm_tone_b_end': 0,
+                'fm_tone_b_level': 28,
+                'amp_attack': 0,
+                'amp_decay': 60,
+                'amp_sustain': 90,
+                'amp_release': 18,
+                'multi_mode_filter_frequency': 6144,
+                'multi_mode_filter_resonance': 24,
+                'multi_mode_filter_envelope_depth': 80,
+                'multi_mode_filter_decay': 40,
+                'fx_overdrive': 20,
+                'fx_reverb': 0,
+            },
+        },
+        'bell': {
+            'version': 1,
+            'keywords': ['bells', 'bell', 'chimes', 'chime', 'glockenspiel'],
+            'parameters': {
+                'fm_tone_algorithm': 2,
+                'fm_tone_c_ratio': 3,
+                'fm_tone_a_ratio': 17,
+                'fm_tone_b_ratio': 150,
+                'fm_tone_harmonics': 9500,
+                'fm_tone_detune': 600,
+                'fm_tone_feedback': 4,
+                'fm_tone_mix': 70,
+                'fm_tone_a_attack': 0,
+                'fm_tone_a_decay': 96,
+                'fm_tone_a_end': 0,
+                'fm_tone_a_level': 80,
+                'fm_tone_b_attack': 0,
+                'fm_tone_b_decay': 70,
+                'fm_tone_b_end': 0,
+                'fm_tone_b_level': 56,
+                'amp_attack': 0,
+                'amp_decay': 110,
+                'amp_sustain': 0,
+                'amp_release': 90,
+                'multi_mode_filter_frequency': 14336,
+                'multi_mode_filter_resonance': 8,
+                'fx_delay': 24,
+                'fx_reverb': 56,
+            },
+        },
+        'pad': {
+            'version': 1,
+            'keywords': ['pads', 'pad'],
+            'parameters': {
+                'fm_tone_algorithm': 6,
+                'fm_tone_c_ratio': 3,
+                'fm_tone_a_ratio': 7,
+                'fm_tone_b_ratio': 60,
+                'fm_tone_harmonics': 8063,
+                'fm_tone_detune': 900,
+                'fm_tone_feedback': 12,
+                'fm_tone_mix': 64,
+                'fm_tone_a_attack': 70,
+                'fm_tone_a_decay': 100,
+                'fm_tone_a_end': 90,
+                'fm_tone_a_level': 60,
+                'fm_tone_b_attack': 80,
+                'fm_tone_b_decay': 110,
+                'fm_tone_b_end': 70,
+                'fm_tone_b_level': 44,
+                'amp_attack': 80,
+                'amp_decay': 100,
+                'amp_sustain': 110,
+                'amp_release': 96,
+                'multi_mode_filter_frequency': 9216,
+                'multi_mode_filter_resonance': 16,
+                'fx_chorus': 48,
+                'fx_reverb': 72,
+            },
+        },
+        'lead': {
+            'version': 1,
+            'keywords': ['lead'],
+            'parameters': {
+                'fm_tone_algorithm': 1,
+                'fm_tone_c_ratio': 3,
+                'fm_tone_a_ratio': 7,
+                'fm_tone_b_ratio': 40,
+                'fm_tone_harmonics': 8800,
+                'fm_tone_detune': 500,
+                'fm_tone_feedback': 48,
+                'fm_tone_mix': 56,
+                'fm_tone_a_attack': 0,
+                'fm_tone_a_decay': 80,
+                'fm_tone_a_end': 70,
+                'fm_tone_a_level': 76,
+                'fm_tone_b_attack': 0,
+                'fm_tone_b_decay': 64,
+                'fm_tone_b_end': 50,
+                'fm_tone_b_level': 52,
+                'amp_attack': 4,
+                'amp_decay': 70,
+                'amp_sustain': 100,
+                'amp_release': 36,
+                'multi_mode_filter_frequency': 11264,
+                'multi_mode_filter_resonance': 30,
+                'fx_delay': 30,
+                'fx_reverb': 24,
+            },
+        },
+        'brass': {
+            'version': 1,
+            'keywords': ['brass', 'horns', 'horn'],
+            'parameters': {
+                'fm_tone_algorithm': 0,
+                'fm_tone_c_ratio': 3,
+                'fm_tone_a_ratio': 3,
+                'fm_tone_b_ratio': 20,
+                'fm_tone_harmonics': 8063,
+                'fm_tone_detune': 400,
+                'fm_tone_feedback': 60,
+                'fm_tone_mix': 48,
+                'fm_tone_a_attack': 20,
+                'fm_tone_a_decay': 76,
+                'fm_tone_a_end': 80,
+                'fm_tone_a_level': 82,
+                'fm_tone_b_attack': 24,
+                'fm_tone_b_decay': 60,
+                'fm_tone_b_end': 60,
+                'fm_tone_b_level': 60,
+                'amp_attack': 18,
+                'amp_decay': 70,
+                'amp_sustain': 96,
+                'amp_release': 40,
+                'multi_mode_filter_frequency': 10240,
+                'multi_mode_filter_resonance': 14,
+                'multi_mode_filter_attack': 20,
+                'multi_mode_filter_envelope_depth': 90,
+                'fx_reverb': 34,
+            },
+        },
+    },
+    'fm_drum': {
+        'kick': {
+            'version': 1,
+            'keywords': ['kick drum', 'bass drum', 'kick', 'bd'],
+            'parameters': {
+                'fm_drum_tune': 6400,
+                'fm_drum_sweep_time': 2400,
+                'fm_drum_sweep_depth': 84,
+                'fm_drum_algorithm': 0,
+                'fm_drum_ratio1': 256,
+                'fm_drum_decay1': 3000,
+                'fm_drum_end1': 0,
+                'fm_drum_mod1': 30,
+                'fm_drum_feedback': 10,
+                'fm_drum_fold': 0,
+                'fm_drum_body_hold': 1200,
+                'fm_drum_body_decay': 6000,
+                'fm_drum_body_level': 110,
+                'fm_drum_noise_level': 10,
+                'fm_drum_transient': 2000,
+                'fm_drum_transient_level': 70,
+                'amp_attack': 0,
+                'amp_decay': 70,
+                'amp_sustain': 0,
+                'amp_release': 20,
+                'multi_mode_filter_frequency': 16383,
+                'fx_overdrive': 16,
+                'fx_reverb': 0,
+            },
+        },
+        'snare': {
+            'version': 1,
+            'keywords': ['snare drum', 'snare', 'sd'],
+            'parameters': {
+                'fm_drum_tune': 9400,
+                'fm_drum_sweep_time': 800,
+                'fm_drum_sweep_depth': 40,
+                'fm_drum_algorithm': 2,
+                'fm_drum_ratio1': 1200,
+                'fm_drum_decay1': 2000,
+                'fm_drum_end1': 0,
+                'fm_drum_mod1': 56,
+                'fm_drum_feedback': 30,
+                'fm_drum_fold': 1600,
+                'fm_drum_body_hold': 400,
+                'fm_drum_body_decay': 3200,
+                'fm_drum_body_level': 80,
+                'fm_drum_noise_hold': 600,
+                'fm_drum_noise_decay': 4200,
+                'fm_drum_noise_base': 40,
+                'fm_drum_noise_width': 100,
+                'fm_drum_noise_level': 96,
+                'fm_drum_transient': 6000,
+                'fm_drum_transient_level': 80,
+                'amp_attack': 0,
+                'amp_decay': 60,
+                'amp_sustain': 0,
+                'fx_reverb': 24,
+            },
+        },
+        'tom': {
+            'version': 1,
+            'keywords': ['toms', 'tom'],
+            'parameters': {
+                'fm_drum_tune': 7600,
+                'fm_drum_sweep_time': 3000,
+                'fm_drum_sweep_depth': 56,
+                'fm_drum_algorithm': 0,
+                'fm_drum_ratio1': 512,
+                'fm_drum_decay1': 4000,
+                'fm_drum_end1': 0,
+                'fm_drum_mod1': 20,
+                'fm_drum_feedback': 6,
+                'fm_drum_fold': 0,
+                'fm_drum_body_hold': 1000,
+                'fm_drum_body_decay': 7000,
+                'fm_drum_body_level': 104,
+                'fm_drum_noise_level': 16,
+                'fm_drum_transient': 3000,
+                'fm_drum_transient_level': 54,
+                'amp_attack': 0,
+                'amp_decay': 80,
+                'amp_sustain': 0,
+                'fx_reverb': 30,
+            },
+        },
+        'hihat': {
+            'version': 1,
+            'keywords': ['hi-hats', 'hi-hat', 'hihats', 'hihat', 'hats', 'hat'],
+            'parameters': {
+                'fm_drum_tune': 12000,
+                'fm_drum_sweep_time': 0,
+                'fm_drum_sweep_depth': 0,
+                'fm_drum_algorithm': 5,
+                'fm_drum_ratio1': 9000,
+                'fm_drum_decay1': 1200,
+                'fm_drum_end1': 0,
+                'fm_drum_mod1': 110,
+                'fm_drum_feedback': 90,
+                'fm_drum_fold': 4000,
+                'fm_drum_body_hold': 0,
+                'fm_drum_body_decay': 1000,
+                'fm_drum_body_level': 40,
+                'fm_drum_noise_hold': 200,
+                'fm_drum_noise_decay': 1800,
+                'fm_drum_noise_base': 110,
+                'fm_drum_noise_width': 60,
+                'fm_drum_noise_level': 110,
+                'amp_attack': 0,
+                'amp_decay': 30,
+                'amp_sustain': 0,
+                'multi_mode_filter_type': 127,
+                'multi_mode_filter_frequency': 10240,
+                'fx_reverb': 12,
+            },
+        },
+        'clap': {
+            'version': 1,
+            'keywords': ['handclap', 'claps', 'clap'],
+            'parameters': {
+                'fm_drum_tune': 9000,
+                'fm_drum_sweep_time': 0,
+                'fm_drum_sweep_depth': 0,
+                'fm_drum_algorithm': 4,
+                'fm_drum_ratio1': 2000,
+                'fm_drum_decay1': 1000,
+                'fm_drum_end1': 0,
+                'fm_drum_mod1': 60,
+                'fm_drum_feedback': 50,
+                'fm_drum_body_level': 30,
+                'fm_drum_noise_hold': 800,
+                'fm_drum_noise_decay': 3600,
+                'fm_drum_noise_base': 70,
+                'fm_drum_noise_width': 80,
+                'fm_drum_noise_grain': 90,
+                'fm_drum_noise_level': 120,
+                'amp_attack': 0,
+                'amp_decay': 56,
+                'amp_sustain': 0,
+                'fx_reverb': 40,
+            },
+        },
+    },
+    'swarmer': {
+        'pad': {
+            'version': 1,
+            'keywords': ['pads', 'pad'],
+            'parameters': {
+                'swarmer_tune': 8192,
+                'swarmer_swarm': 90,
+                'swarmer_detune': 48,
+                'swarmer_mix': 64,
+                'swarmer_main_octave': 1,
+                'swarmer_main': 40,
+                'swarmer_animation': 60,
+                'swarmer_noise_mod': 0,
+                'amp_attack': 84,
+                'amp_decay': 100,
+                'amp_sustain': 110,
+                'amp_release': 100,
+                'multi_mode_filter_frequency': 9216,
+                'multi_mode_filter_resonance': 18,
+                'fx_chorus': 56,
+                'fx_reverb': 80,
+            },
+        },
+        'strings': {
+            'version': 1,
+            'keywords': ['string ensemble', 'strings', 'string'],
+            'parameters': {
+                'swarmer_tune': 8192,
+                'swarmer_swarm': 110,
+                'swarmer_detune': 36,
+                'swarmer_mix': 80,
+                'swarmer_main_octave': 0,
+                'swarmer_main': 40,
+                'swarmer_animation': 40,
+                'swarmer_noise_mod': 10,
+                'amp_attack': 60,
+                'amp_decay': 90,
+                'amp_sustain': 104,
+                'amp_release': 80,
+                'multi_mode_filter_frequency': 10752,
+                'multi_mode_filter_resonance': 6,
+                'fx_chorus': 40,
+                'fx_reverb': 64,
+            },
+        },
+        'lead': {
+            'version': 1,
+            'keywords': ['supersaw lead', 'supersaw', 'lead'],
+            'parameters': {
+                'swarmer_tune': 8192,
+                'swarmer_swarm': 100,
+                'swarmer_detune': 70,
+                'swarmer_mix': 90,
+                'swarmer_main_octave': 0,
+                'swarmer_main': 40,
+                'swarmer_animation': 20,
+                'swarmer_noise_mod': 0,
+                'amp_attack': 2,
+                'amp_decay': 80,
+                'amp_sustain': 100,
+                'amp_release': 40,
+                'multi_mode_filter_frequency': 12800,
+                'multi_mode_filter_resonance': 24,
+                'fx_delay': 32,
+                'fx_reverb': 36,
+            },
+        },
+        'bass': {
+            'version': 1,
+            'keywords': ['bassline', 'bass'],
+            'parameters': {
+                'swarmer_tune': 8192,
+                'swarmer_swarm': 40,
+                'swarmer_detune': 20,
+                'swarmer_mix': 40,
+                'swarmer_main_octave': 0,
+                'swarmer_main': 40,
+                'swarmer_animation': 10,
+                'swarmer_noise_mod': 0,
+                'amp_attack': 0,
+                'amp_decay': 64,
+                'amp_sustain': 96,
+                'amp_release': 20,
+                'multi_mode_filter_frequency': 5120,
+                'multi_mode_filter_resonance': 30,
+                'multi_mode_filter_envelope_depth': 76,
+                'multi_mode_filter_decay': 44,
+                'fx_overdrive': 24,
+            },
+        },
+        'drone': {
+            'version': 1,
+            'keywords': ['drones', 'drone'],
+            'parameters': {
+                'swarmer_tune': 8192,
+                'swarmer_swarm': 127,
+                'swarmer_detune': 90,
+                'swarmer_mix': 100,
+                'swarmer_main_octave': 0,
+                'swarmer_main': 40,
+                'swarmer_animation': 110,
+                'swarmer_noise_mod': 40,
+                'amp_attack': 100,
+                'amp_decay': 127,
+                'amp_sustain': 127,
+                'amp_release': 120,
+                'multi_mode_filter_frequency': 7168,
+                'multi_mode_filter_resonance': 40,
+                'fx_delay': 40,
+                'fx_reverb': 96,
+            },
+        },
+    },
+    'wavetone': {
+        'pad': {
+            'version': 1,
+            'keywords': ['pads', 'pad'],
+            'parameters': {
+                'wavetone_osc1_table': 0,
+                'wavetone_osc1_waveform': 80,
+                'wavetone_osc1_level': 90,
+                'wavetone_osc2_table': 1,
+                'wavetone_osc2_waveform': 40,
+                'wavetone_osc2_level': 70,
+                'wavetone_osc2_pitch': 8400,
+                'wavetone_drift': 40,
+                'wavetone_attack': 70,
+                'wavetone_decay': 100,
+                'amp_attack': 80,
+                'amp_decay': 100,
+                'amp_sustain': 110,
+                'amp_release': 96,
+                'multi_mode_filter_frequency': 9216,
+                'multi_mode_filter_resonance': 16,
+                'fx_chorus': 48,
+                'fx_reverb': 72,
+            },
+        },
+        'lead': {
+            'version': 1,
+            'keywords': ['lead'],
+            'parameters': {
+                'wavetone_osc1_table': 0,
+                'wavetone_osc1_waveform': 80,
+                'wavetone_osc1_level': 100,
+                'wavetone_osc2_table': 0,
+                'wavetone_osc2_waveform': 80,
+                'wavetone_osc2_level': 80,
+                'wavetone_osc2_pitch': 8280,
+                'wavetone_osc1_phase_distortion': 30,
+                'wavetone_drift': 16,
+                'amp_attack': 2,
+                'amp_decay': 80,
+                'amp_sustain': 100,
+                'amp_release': 36,
+                'multi_mode_filter_frequency': 11776,
+                'multi_mode_filter_resonance': 28,
+                'fx_delay': 30,
+                'fx_reverb': 28,
+            },
+        },
+        'bass': {
+            'version': 1,
+            'keywords': ['sub bass', 'bassline', 'bass'],
+            'parameters': {
+                'wavetone_osc1_table': 0,
+                'wavetone_osc1_waveform': 80,
+                'wavetone_osc1_level': 110,
+                'wavetone_osc2_table': 0,
+                'wavetone_osc2_waveform': 0,
+                'wavetone_osc2_level': 90,
+                'wavetone_osc2_pitch': 8192,
+                'wavetone_drift': 4,
+                'amp_attack': 0,
+                'amp_decay': 60,
+                'amp_sustain': 96,
+                'amp_release': 16,
+                'multi_mode_filter_frequency': 5632,
+                'multi_mode_filter_resonance': 28,
+                'multi_mode_filter_envelope_depth': 80,
+                'multi_mode_filter_decay': 40,
+                'fx_overdrive': 18,
+            },
+        },
+        'pluck': {
+            'version': 1,
+            'keywords': ['plucks', 'pluck', 'plucked'],
+            'parameters': {
+                'wavetone_osc1_table': 1,
+                'wavetone_osc1_waveform': 60,
+                'wavetone_osc1_level': 100,
+                'wavetone_osc2_table': 0,
+                'wavetone_osc2_waveform': 40,
+                'wavetone_osc2_level': 60,
+                'wavetone_osc2_pitch': 8192,
+                'wavetone_drift': 8,
+                'amp_attack': 0,
+                'amp_decay': 44,
+                'amp_sustain': 0,
+                'amp_release': 30,
+                'multi_mode_filter_frequency': 8192,
+                'multi_mode_filter_resonance': 22,
+                'multi_mode_filter_envelope_depth': 96,
+                'multi_mode_filter_decay': 34,
+                'fx_delay': 28,
+                'fx_reverb': 32,
+            },
+        },
+        'organ': {
+            'version': 1,
+            'keywords': ['organ'],
+            'parameters': {
+                'wavetone_osc1_table': 1,
+                'wavetone_osc1_waveform': 20,
+                'wavetone_osc1_level': 100,
+                'wavetone_osc2_table': 1,
+                'wavetone_osc2_waveform': 50,
+                'wavetone_osc2_level': 80,
+                'wavetone_osc2_pitch': 9830,
+                'wavetone_drift': 10,
+                'amp_attack': 0,
+                'amp_decay': 127,
+                'amp_sustain': 127,
+                'amp_release': 12,
+                'multi_mode_filter_frequency': 13312,
+                'multi_mode_filter_resonance': 0,
+                'fx_chorus': 44,
+                'fx_reverb': 36,
+            },
+        },
+    },
+}
@@ -1,9 +1,17 @@
 import logging
 import os
+import threading
 import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
 
 import psycopg2
-import psycopg2.extras
+import psycopg2.extensions
+
+from synthgenie.db.pool import ConnectionPool
+from synthgenie.metrics.registry import metrics_registry
+from synthgenie.synthesizers.shared.semantic_cache import SEMANTIC_CACHE_ENABLED
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +79,34 @@ def initialize_db():
         """
         )
 
+        # Tell every worker's API key cache about new, changed and revoked keys (see synthgenie.auth.key_cache)
+        cursor.execute(
+            """
+        CREATE OR REPLACE FUNCTION notify_api_key_change() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM pg_notify('api_key_changes', OLD.key);
+            END IF;
+            IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.key IS DISTINCT FROM OLD.key) THEN
+                PERFORM pg_notify('api_key_changes', NEW.key);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+        )
+        cursor.execute(
+            """
+        CREATE OR REPLACE TRIGGER api_keys_notify_change
+        AFTER INSERT OR UPDATE OR DELETE ON api_keys
+        FOR EACH ROW EXECUTE FUNCTION notify_api_key_change()
+        """
+        )
+
+        # Per-key agent budgets per prompt, NULL for the defaults (see synthgenie.synthesizers.shared.budget)
+        for column in ('max_model_requests', 'max_tool_calls', 'max_input_tokens', 'max_output_tokens'):
+            cursor.execute(f'ALTER TABLE api_keys ADD COLUMN IF NOT EXISTS {column} INTEGER')
+
         cursor.execute(
             """
         CREATE TABLE IF NOT EXISTS api_key_usage (
@@ -82,6 +118,57 @@ def initialize_db():
         """
         )
 
+        # Per-request usage events, partitioned by day, and their rollups (see synthgenie.auth.usage_events)
+        cursor.execute(
+            """
+        CREATE TABLE IF NOT EXISTS usage_events (
+            occurred_at TIMESTAMPTZ NOT NULL,
+            key TEXT NOT NULL,
+            synth TEXT NOT NULL,
+            endpoint TEXT NOT NULL,
+            status_code SMALLINT NOT NULL,
+            latency_ms INTEGER NOT NULL,
+            cache TEXT,
+            machines TEXT[] NOT NULL DEFAULT '{}',
+            models TEXT[] NOT NULL DEFAULT '{}',
+            model_requests INTEGER NOT NULL DEFAULT 0,
+            input_tokens INTEGER NOT NULL DEFAULT 0,
+            cached_input_tokens INTEGER NOT NULL DEFAULT 0,
+            output_tokens INTEGER NOT NULL DEFAULT 0,
+            tool_calls INTEGER NOT NULL DEFAULT 0,
+            cost_usd DOUBLE PRECISION NOT NULL DEFAULT 0
+        ) PARTITION BY RANGE (occurred_at)
+        """
+        )
+        cursor.execute('CREATE INDEX IF NOT EXISTS usage_events_key_idx ON usage_events (key, occurred_at)')
+        for table in ('usage_rollup_hourly', 'usage_rollup_daily'):
+            cursor.execute(
+                f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                key TEXT NOT NULL,
+                bucket TIMESTAMPTZ NOT NULL,
+                synth TEXT NOT NULL,
+                requests INTEGER NOT NULL,
+                errors INTEGER NOT NULL,
+                cache_hits INTEGER NOT NULL,
+                latency_ms_total BIGINT NOT NULL,
+                latency_ms_max INTEGER NOT NULL,
+                input_tokens BIGINT NOT NULL,
+                cached_input_tokens BIGINT NOT NULL,
+                output_tokens BIGINT NOT NULL,
+                tool_calls BIGINT NOT NULL,
+                cost_usd DOUBLE PRECISION NOT NULL,
+                PRIMARY KEY (key, bucket, synth)
+            )
+            """
+            )
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {table}_bucket_idx ON {table} (bucket)')
+
+        # Near-duplicate prompt cache, see synthgenie.synthesizers.shared.semantic_cache. Only set up when
+        # enabled, so databases without the pgvector extension work as long as it stays off.
+        if SEMANTIC_CACHE_ENABLED:
+            _create_semantic_cache_table(cursor)
+
         conn.commit()
         logger.info('Database initialized successfully')
     except Exception as e:
@@ -94,13 +181,85 @@ def initialize_db():
             conn.close()
 
 
-def get_db():
-    """Get database connection for dependency injection."""
-    conn = None
-    try:
-        conn = get_connection()
-        conn.cursor_factory = psycopg2.extras.RealDictCursor
+def _create_semantic_cache_table(cursor: psycopg2.extensions.cursor) -> None:
+    cursor.execute('CREATE EXTENSION IF NOT EXISTS vector')
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS semantic_prompt_cache (
+            id BIGSERIAL PRIMARY KEY,
+            synth TEXT NOT NULL,
+            model TEXT NOT NULL,
+            version TEXT NOT NULL,
+            signature TEXT NOT NULL,
+            prompt TEXT NOT NULL,
+            embedding vector(512) NOT NULL,
+            responses JSONB NOT NULL,
+            hit_count INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            last_hit_at TIMESTAMP,
+            UNIQUE (synth, model, version, prompt)
+        )
+        """
+    )
+    cursor.execute(
+        """
+        CREATE INDEX IF NOT EXISTS semantic_prompt_cache_embedding_idx
+        ON semantic_prompt_cache USING hnsw (embedding vector_cosine_ops)
+        """
+    )
+
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def _connect() -> psycopg2.extensions.connection:
+    # A request shouldn't sit in the startup retry loop; the pool reports the failure instead
+    return get_connection(max_retries=1)
+
+
+def open_pool() -> ConnectionPool:
+    """Open the worker's connection pool (from the app lifespan), waiting for the database like `initialize_db`."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            pool = ConnectionPool(_connect)
+            pool.open(get_connection)
+            _pool = pool
+        return _pool
+
+
+def close_pool() -> None:
+    """Close the worker's connection pool when the app shuts down."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+def get_pool() -> ConnectionPool:
+    """The worker's connection pool, opened on first use outside the app lifespan (scripts, benchmarks)."""
+    return _pool or open_pool()
+
+
+def pool_snapshot() -> dict[str, Any]:
+    return _pool.snapshot() if _pool is not None else {'open': False}
+
+
+metrics_registry.register('db_pool', pool_snapshot)
+
+
+@contextmanager
+def pooled_connection(timeout: float | None = None) -> Iterator[psycopg2.extensions.connection]:
+    """
+    Borrow a connection from the worker's pool for the duration of a `with` block.
+
+    Args:
+        timeout: Seconds to wait for a free connection, `DB_POOL_TIMEOUT_SECONDS` if None
+
+    Raises:
+        PoolTimeout: If no connection became free in time
+    """
+    with get_pool().connection(timeout) as conn:
         yield conn
-    finally:
-        if conn:
-            conn.close()
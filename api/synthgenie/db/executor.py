@@ -0,0 +1,124 @@
+"""Async facade over the blocking psycopg2 data-access functions.
+
+The routes and agent workflows are coroutines, and a psycopg2 query called from one blocks the
+worker's event loop, stalling every in-flight LLM request until it returns. `run_db` runs a
+data-access function (`get_api_key_from_db`, `track_api_key_usage`, ...) on a dedicated thread
+pool instead, so database I/O overlaps with the model awaits:
+
+    usage = await run_db(get_api_key_usage, None, api_key)
+
+With `conn` None the call borrows a pooled connection for just that query, so a request holds
+a connection for its auth check and its usage write, never across a multi-second agent run.
+
+The pool has `DB_EXECUTOR_THREADS` threads, by default as many as the connection pool has
+connections, so queries queue for a connection rather than for a thread.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Concatenate
+
+import psycopg2.extensions
+from fastapi import HTTPException
+
+from synthgenie.db.connection import pooled_connection
+from synthgenie.db.pool import DB_POOL_MAX_SIZE, PoolTimeout
+from synthgenie.metrics.registry import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+DB_EXECUTOR_THREADS = int(os.getenv('DB_EXECUTOR_THREADS', str(DB_POOL_MAX_SIZE)))
+
+LATENCY_WINDOW = 1000
+
+Connection = psycopg2.extensions.connection
+
+
+@dataclass
+class ExecutorStats:
+    """Queries run on the database executor, how long they queued for a thread, and how long they ran."""
+
+    queries: int = 0
+    in_flight: int = 0
+    queue_latencies: deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+    query_latencies: deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def snapshot(self) -> dict[str, Any]:
+        def p95_ms(latencies: list[float]) -> float | None:
+            return round(statistics.quantiles(latencies, n=20)[-1] * 1000, 2) if len(latencies) > 1 else None
+
+        with self.lock:
+            queued, ran = list(self.queue_latencies), list(self.query_latencies)
+            return {
+                'threads': DB_EXECUTOR_THREADS,
+                'queries': self.queries,
+                'in_flight': self.in_flight,
+                'queue_p95_ms': p95_ms(queued),
+                'query_p50_ms': round(statistics.median(ran) * 1000, 2) if ran else None,
+                'query_p95_ms': p95_ms(ran),
+            }
+
+
+executor_stats = ExecutorStats()
+metrics_registry.register('db_executor', executor_stats.snapshot)
+
+_executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_THREADS, thread_name_prefix='synthgenie-db')
+
+
+async def run_db[**P, T](
+    query: Callable[Concatenate[Connection, P], T], conn: Connection | None, *args: P.args, **kwargs: P.kwargs
+) -> T:
+    """
+    Run a blocking data-access function on the database executor and await its result.
+
+    Args:
+        query: Function taking the connection first, e.g. `track_api_key_usage`
+        conn: Connection to run it on, or None to borrow one from the pool for the call.
+            psycopg2 connections are thread safe, but calls sharing one share its transaction.
+        *args: Further arguments of `query`
+        **kwargs: Keyword arguments of `query`
+
+    Raises:
+        HTTPException: 503 if `conn` is None and no pooled connection became free in time
+    """
+    submitted = time.perf_counter()
+
+    def call() -> T:
+        started = time.perf_counter()
+        with executor_stats.lock:
+            executor_stats.queue_latencies.append(started - submitted)
+            executor_stats.in_flight += 1
+        try:
+            if conn is not None:
+                return query(conn, *args, **kwargs)
+            with pooled_connection() as pooled:
+                return query(pooled, *args, **kwargs)
+        finally:
+            with executor_stats.lock:
+                executor_stats.queries += 1
+                executor_stats.in_flight -= 1
+                executor_stats.query_latencies.append(time.perf_counter() - started)
+
+    # Keep the caller's context (logfire spans) in the worker thread
+    context = contextvars.copy_context()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, functools.partial(context.run, call))
+    except PoolTimeout as e:
+        logger.warning(f'Database pool exhausted: {e}')
+        raise HTTPException(status_code=503, detail='Database busy - please try again')
+
+
+def shutdown_executor() -> None:
+    """Wait for queued queries to finish, called when the app shuts down before the pool closes."""
+    _executor.shutdown(wait=True)
@@ -0,0 +1,270 @@
+"""Pool of PostgreSQL connections shared by every request of a worker.
+
+Opening a connection per request meant a TCP and authentication handshake to Postgres for
+every prompt. The pool is opened in the app lifespan with `DB_POOL_MIN_SIZE` connections and
+grows on demand up to `DB_POOL_MAX_SIZE`; a request that finds every connection in use waits
+up to `DB_POOL_TIMEOUT_SECONDS` for one to be returned.
+
+Connections are health checked before being handed out once they have been idle for
+`DB_POOL_CHECK_AFTER_SECONDS`, rolled back when returned mid-transaction, and replaced after
+`DB_POOL_MAX_LIFETIME_SECONDS` so server-side state doesn't build up.
+"""
+
+import logging
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+import psycopg2
+import psycopg2.extensions
+
+logger = logging.getLogger(__name__)
+
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', '2'))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', '20'))
+# How long a request waits for a free connection before failing
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv('DB_POOL_TIMEOUT_SECONDS', '5'))
+# Connections idle for longer are checked with `SELECT 1` before being handed out
+DB_POOL_CHECK_AFTER_SECONDS = float(os.getenv('DB_POOL_CHECK_AFTER_SECONDS', '30'))
+DB_POOL_MAX_LIFETIME_SECONDS = float(os.getenv('DB_POOL_MAX_LIFETIME_SECONDS', '1800'))
+
+ACQUIRE_LATENCY_WINDOW = 1000
+
+Connection = psycopg2.extensions.connection
+
+
+class PoolTimeout(TimeoutError):
+    """No connection became free within the pool timeout."""
+
+
+@dataclass
+class PooledConnection:
+    conn: Connection
+    created_at: float = field(default_factory=time.monotonic)
+    returned_at: float = field(default_factory=time.monotonic)
+
+    def expired(self) -> bool:
+        return time.monotonic() - self.created_at >= DB_POOL_MAX_LIFETIME_SECONDS
+
+
+@dataclass
+class PoolStats:
+    """Acquisition counters and latency window of a connection pool."""
+
+    acquisitions: int = 0
+    timeouts: int = 0
+    connections_opened: int = 0
+    health_check_failures: int = 0
+    acquire_latencies: deque[float] = field(default_factory=lambda: deque(maxlen=ACQUIRE_LATENCY_WINDOW))
+
+    def snapshot(self) -> dict[str, Any]:
+        latencies = list(self.acquire_latencies)
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else None
+        return {
+            'acquisitions': self.acquisitions,
+            'timeouts': self.timeouts,
+            'connections_opened': self.connections_opened,
+            'health_check_failures': self.health_check_failures,
+            'acquire_p50_ms': round(statistics.median(latencies) * 1000, 2) if latencies else None,
+            'acquire_p95_ms': round(p95 * 1000, 2) if p95 is not None else None,
+        }
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of psycopg2 connections with bounded size and acquisition timeouts.
+
+    Connections are borrowed on the database executor's threads (`run_db`), so waiting for one
+    blocks an executor thread, never the event loop.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Connection],
+        min_size: int = DB_POOL_MIN_SIZE,
+        max_size: int = DB_POOL_MAX_SIZE,
+        timeout: float = DB_POOL_TIMEOUT_SECONDS,
+    ) -> None:
+        """
+        Args:
+            connect: Opens a new connection
+            min_size: Connections opened up front and kept open
+            max_size: Most connections open at once, idle or in use
+            timeout: Default seconds to wait in `getconn`
+        """
+        self.connect = connect
+        self.min_size = min(min_size, max_size)
+        self.max_size = max_size
+        self.timeout = timeout
+        self.stats = PoolStats()
+        self._idle: deque[PooledConnection] = deque()
+        self._in_use: dict[int, PooledConnection] = {}
+        # Connections being opened count against max_size too
+        self._opening = 0
+        self._waiting = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    @property
+    def size(self) -> int:
+        return len(self._idle) + len(self._in_use) + self._opening
+
+    def open(self, connect: Callable[[], Connection] | None = None) -> None:
+        """
+        Open the minimum number of connections.
+
+        Args:
+            connect: Opens the initial connections instead of the pool's `connect`, e.g. waiting for the database
+        """
+        for _ in range(self.min_size - self.size):
+            pooled = self._open_connection(connect)
+            with self._condition:
+                self._idle.append(pooled)
+        logger.info(f'Database pool opened with {self.min_size} connections (max {self.max_size})')
+
+    def _open_connection(self, connect: Callable[[], Connection] | None = None) -> PooledConnection:
+        pooled = PooledConnection((connect or self.connect)())
+        self.stats.connections_opened += 1
+        return pooled
+
+    def _healthy(self, pooled: PooledConnection) -> bool:
+        conn = pooled.conn
+        if conn.closed or pooled.expired():
+            return False
+        if time.monotonic() - pooled.returned_at < DB_POOL_CHECK_AFTER_SECONDS:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            conn.rollback()
+            return True
+        except psycopg2.Error as e:
+            self.stats.health_check_failures += 1
+            logger.warning(f'Discarding pooled database connection that failed its health check: {e}')
+            return False
+
+    def _discard(self, pooled: PooledConnection) -> None:
+        try:
+            pooled.conn.close()
+        except psycopg2.Error:
+            pass
+
+    def getconn(self, timeout: float | None = None) -> Connection:
+        """
+        Borrow a connection, opening one if the pool is below its maximum size.
+
+        Args:
+            timeout: Seconds to wait for a free connection, the pool's timeout if None
+
+        Raises:
+            PoolTimeout: If no connection became free in time
+            ConnectionError: If a new connection can't be opened
+        """
+        start = time.perf_counter()
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            pooled: PooledConnection | None = None
+            with self._condition:
+                while not self._idle and self.size >= self.max_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats.timeouts += 1
+                        raise PoolTimeout(f'No database connection free within {timeout:g}s')
+                    self._waiting += 1
+                    try:
+                        self._condition.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+
+                if self._closed:
+                    raise ConnectionError('Database pool is closed')
+                if self._idle:
+                    # Most recently returned first: the likeliest to still be alive
+                    pooled = self._idle.pop()
+                else:
+                    self._opening += 1
+
+            if pooled is None:
+                try:
+                    pooled = self._open_connection()
+                finally:
+                    with self._condition:
+                        self._opening -= 1
+                        self._condition.notify()
+            elif not self._healthy(pooled):
+                self._discard(pooled)
+                with self._condition:
+                    self._condition.notify()
+                continue
+
+            with self._condition:
+                self._in_use[id(pooled.conn)] = pooled
+                self.stats.acquisitions += 1
+                self.stats.acquire_latencies.append(time.perf_counter() - start)
+            return pooled.conn
+
+    def putconn(self, conn: Connection) -> None:
+        """Return a borrowed connection, rolling back any open transaction."""
+        with self._condition:
+            pooled = self._in_use.pop(id(conn), None)
+        if pooled is None:
+            logger.warning('Connection returned to a pool it does not belong to')
+            return
+
+        keep = not self._closed and not conn.closed and not pooled.expired()
+        if keep:
+            try:
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                conn.cursor_factory = psycopg2.extensions.cursor
+            except psycopg2.Error:
+                keep = False
+
+        if keep:
+            pooled.returned_at = time.monotonic()
+        else:
+            self._discard(pooled)
+        with self._condition:
+            if keep:
+                self._idle.append(pooled)
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self, timeout: float | None = None) -> Iterator[Connection]:
+        """Borrow a connection for the duration of a `with` block."""
+        conn = self.getconn(timeout)
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def close(self) -> None:
+        """Close the idle connections; borrowed ones are closed as they are returned."""
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._condition.notify_all()
+        for pooled in idle:
+            self._discard(pooled)
+        logger.info('Database pool closed')
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._condition:
+            state = {
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'size': self.size,
+                'idle': len(self._idle),
+                'in_use': len(self._in_use),
+                'waiting': self._waiting,
+            }
+        return state | self.stats.snapshot()
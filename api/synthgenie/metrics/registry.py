@@ -0,0 +1,30 @@
+"""In-process metrics sources exposed through the admin metrics endpoint."""
+
+from collections.abc import Callable
+from typing import Any
+
+MetricsSource = Callable[[], dict[str, Any]]
+
+
+class MetricsRegistry:
+    """Named callables returning point-in-time metric snapshots."""
+
+    def __init__(self) -> None:
+        self._sources: dict[str, MetricsSource] = {}
+
+    def register(self, name: str, source: MetricsSource) -> None:
+        """
+        Register a snapshot callable under `name`.
+
+        Args:
+            name: Section name in the metrics snapshot, e.g. 'digitone_routing'
+            source: Callable returning a JSON-serializable dict
+        """
+        self._sources[name] = source
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Collect the current values of every registered source."""
+        return {name: source() for name, source in sorted(self._sources.items())}
+
+
+metrics_registry = MetricsRegistry()
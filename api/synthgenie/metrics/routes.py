@@ -0,0 +1,23 @@
+import os
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Security
+
+from synthgenie.auth.services import get_api_key
+from synthgenie.metrics.registry import metrics_registry
+
+router = APIRouter(prefix='/metrics', tags=['metrics'])
+
+
+@router.get('', response_model=dict[str, dict[str, Any]])
+async def get_metrics(admin_key: str = Security(get_api_key)):
+    """
+    Get in-process performance metrics for this worker.
+    Only accessible with admin API key.
+    """
+    # Check if using admin key
+    admin_api_key = os.getenv('ADMIN_API_KEY')
+    if not admin_api_key or admin_key != admin_api_key:
+        raise HTTPException(status_code=403, detail='Only admin can view metrics')
+
+    return metrics_registry.snapshot()
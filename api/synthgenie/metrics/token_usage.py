@@ -0,0 +1,247 @@
+"""Model token usage and cost per HTTP request and per agent stage.
+
+Every model response is recorded by the agents' model wrapper (see
+`synthesizers/shared/agents/prompt_cache.py`) into the usage of the request it belongs to, so
+validation, routing and machine agent calls add up to one figure per request without being
+threaded through the workflows. The same responses are aggregated per agent stage with their
+latency and cost, to compare the models assigned to each stage, and kept per stage in each
+request's totals for callers outside HTTP requests (e.g. the eval suite) via
+`collect_request_usage`.
+
+Costs are estimated from the provider's published prices with `genai-prices`; responses from
+models it doesn't know (e.g. the offline test model) count as free.
+"""
+
+import logging
+import statistics
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from pydantic_ai.messages import ModelResponse
+from pydantic_ai.usage import RunUsage
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from synthgenie.metrics.registry import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+# Response header with the request's model input tokens, e.g. `input=12000; cached=10500; written=0`
+TOKEN_USAGE_HEADER = 'X-SynthGenie-Input-Tokens'
+
+LATENCY_WINDOW = 500
+
+
+@dataclass
+class StageTotals:
+    """One agent stage's share of a request's model usage."""
+
+    requests: int = 0
+    latency: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    tool_calls: int = 0
+    retries: int = 0
+    cost: float = 0.0
+
+
+@dataclass
+class RequestTotals:
+    usage: RunUsage = field(default_factory=RunUsage)
+    cost: float = 0.0
+    models: set[str] = field(default_factory=set[str])
+    stages: dict[str, StageTotals] = field(default_factory=dict[str, StageTotals])
+
+
+_request_totals: ContextVar[RequestTotals | None] = ContextVar('request_totals', default=None)
+
+
+@dataclass
+class TokenUsageStats:
+    requests: int = 0
+    model_requests: int = 0
+    input_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    output_tokens: int = 0
+    cost: float = 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'model_requests': self.model_requests,
+            'input_tokens': self.input_tokens,
+            'cached_input_tokens': self.cache_read_tokens,
+            'uncached_input_tokens': self.input_tokens - self.cache_read_tokens,
+            'cache_write_tokens': self.cache_write_tokens,
+            'output_tokens': self.output_tokens,
+            'cached_input_ratio': round(self.cache_read_tokens / self.input_tokens, 4) if self.input_tokens else 0.0,
+            'cost_usd': round(self.cost, 6),
+        }
+
+
+@dataclass
+class StageUsageStats:
+    """Requests, latency, tokens and cost of one agent stage, with the models that served it."""
+
+    models: set[str] = field(default_factory=set[str])
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+    requests: int = 0
+    input_tokens: int = 0
+    cache_read_tokens: int = 0
+    output_tokens: int = 0
+    tool_calls: int = 0
+    retries: int = 0
+    cost: float = 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        latencies = list(self.latencies)
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else None
+        return {
+            'models': sorted(self.models),
+            'requests': self.requests,
+            'latency_p50_ms': round(statistics.median(latencies) * 1000) if latencies else None,
+            'latency_p95_ms': round(p95 * 1000) if p95 is not None else None,
+            'input_tokens': self.input_tokens,
+            'cached_input_tokens': self.cache_read_tokens,
+            'output_tokens': self.output_tokens,
+            'tool_calls': self.tool_calls,
+            'retries': self.retries,
+            'cost_usd': round(self.cost, 6),
+            'cost_per_request_usd': round(self.cost / self.requests, 6) if self.requests else 0.0,
+        }
+
+
+token_usage_stats = TokenUsageStats()
+metrics_registry.register('token_usage', token_usage_stats.snapshot)
+
+stage_usage_stats: dict[str, StageUsageStats] = {}
+metrics_registry.register(
+    'agent_stages', lambda: {stage: stats.snapshot() for stage, stats in sorted(stage_usage_stats.items())}
+)
+
+
+def response_cost(response: ModelResponse) -> float:
+    """Estimated price of a model response in USD, 0 for models without known prices."""
+    if not response.model_name:
+        return 0.0
+    try:
+        return float(response.cost().total_price)
+    except LookupError:
+        return 0.0
+
+
+def record_model_usage(
+    response: ModelResponse, stage: str, latency: float, tool_calls: int = 0, retries: int = 0
+) -> None:
+    """
+    Add one model response's usage to the worker totals, its stage and the current request.
+
+    Args:
+        response: The model response, with its usage and model name
+        stage: The agent stage that made the request, its registry name
+        latency: Time the request took in seconds
+        tool_calls: Function tool calls in the response (not counting output tools)
+        retries: Retry prompts (`ModelRetry`, validation errors) the request answered
+    """
+    usage = response.usage
+    cost = response_cost(response)
+
+    token_usage_stats.model_requests += 1
+    token_usage_stats.input_tokens += usage.input_tokens
+    token_usage_stats.cache_read_tokens += usage.cache_read_tokens
+    token_usage_stats.cache_write_tokens += usage.cache_write_tokens
+    token_usage_stats.output_tokens += usage.output_tokens
+    token_usage_stats.cost += cost
+
+    stage_stats = stage_usage_stats.setdefault(stage, StageUsageStats())
+    if response.model_name:
+        stage_stats.models.add(response.model_name)
+    stage_stats.latencies.append(latency)
+    stage_stats.requests += 1
+    stage_stats.input_tokens += usage.input_tokens
+    stage_stats.cache_read_tokens += usage.cache_read_tokens
+    stage_stats.output_tokens += usage.output_tokens
+    stage_stats.tool_calls += tool_calls
+    stage_stats.retries += retries
+    stage_stats.cost += cost
+
+    totals = _request_totals.get()
+    if totals is not None:
+        totals.usage.requests += 1
+        totals.usage.incr(usage)
+        totals.cost += cost
+        if response.model_name:
+            totals.models.add(response.model_name)
+
+        stage_totals = totals.stages.setdefault(stage, StageTotals())
+        stage_totals.requests += 1
+        stage_totals.latency += latency
+        stage_totals.input_tokens += usage.input_tokens
+        stage_totals.output_tokens += usage.output_tokens
+        stage_totals.tool_calls += tool_calls
+        stage_totals.retries += retries
+        stage_totals.cost += cost
+
+
+@contextmanager
+def collect_request_usage() -> Iterator[RequestTotals]:
+    """Collect the model usage of everything run inside the block, as for one HTTP request."""
+    totals = RequestTotals()
+    token = _request_totals.set(totals)
+    try:
+        yield totals
+    finally:
+        _request_totals.reset(token)
+
+
+def current_request_totals() -> RequestTotals | None:
+    """The model usage collected so far for the current request, None outside `collect_request_usage`."""
+    return _request_totals.get()
+
+
+def format_input_tokens(usage: RunUsage) -> str:
+    return f'input={usage.input_tokens}; cached={usage.cache_read_tokens}; written={usage.cache_write_tokens}'
+
+
+class TokenUsageMiddleware:
+    """
+    Collect the model usage of each HTTP request and report it once the request completes.
+
+    Responses whose model calls finish before the headers are sent (everything but streams)
+    carry the totals in the `X-SynthGenie-Input-Tokens` header; every request with model calls
+    is logged.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        with collect_request_usage() as totals:
+            usage = totals.usage
+
+            async def send_with_usage(message: Message) -> None:
+                if message['type'] == 'http.response.start' and usage.requests:
+                    headers = list(message.get('headers', []))
+                    headers.append((TOKEN_USAGE_HEADER.lower().encode(), format_input_tokens(usage).encode()))
+                    message['headers'] = headers
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_usage)
+            finally:
+                if usage.requests:
+                    token_usage_stats.requests += 1
+                    logger.info(
+                        f'{scope["method"]} {scope["path"]}: {usage.requests} model requests, '
+                        f'{usage.input_tokens} input tokens ({usage.cache_read_tokens} cached, '
+                        f'{usage.input_tokens - usage.cache_read_tokens} uncached, {usage.cache_write_tokens} written), '
+                        f'{usage.output_tokens} output tokens, ${totals.cost:.4f}'
+                    )
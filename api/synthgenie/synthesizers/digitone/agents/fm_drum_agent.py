@@ -1,7 +1,6 @@
 """FM Drum synthesis specialist agent for Digitone."""
 
 import logging
-import os
 
 from pydantic_ai import Agent, RunContext
 
@@ -10,177 +9,30 @@ from synthgenie.synthesizers.digitone.agents.shared import (
     DigitoneAgentDeps,
     validate_synth_response,
 )
-from synthgenie.synthesizers.digitone.tools.amp_fx_tool import (
-    set_amp_attack,
-    set_amp_decay,
-    set_amp_envelope_mode,
-    set_amp_envelope_reset,
-    set_amp_hold,
-    set_amp_pan,
-    set_amp_release,
-    set_amp_sustain,
-    set_amp_volume,
-    set_fx_bit_reduction,
-    set_fx_chorus,
-    set_fx_delay,
-    set_fx_overdrive,
-    set_fx_overdrive_routing,
-    set_fx_reverb,
-    set_fx_sample_rate_reduction,
-    set_fx_sample_rate_routing,
-)
-from synthgenie.synthesizers.digitone.tools.filter_tool import (
-    set_multi_mode_filter_attack,
-    set_multi_mode_filter_decay,
-    set_multi_mode_filter_envelope_depth,
-    set_multi_mode_filter_frequency,
-    set_multi_mode_filter_release,
-    set_multi_mode_filter_resonance,
-    set_multi_mode_filter_sustain,
-    set_multi_mode_filter_type,
-)
-from synthgenie.synthesizers.digitone.tools.fm_drum_tool import (
-    set_fm_drum_algorithm,
-    set_fm_drum_body_decay,
-    set_fm_drum_body_hold,
-    set_fm_drum_body_level,
-    set_fm_drum_decay1,
-    set_fm_drum_decay2,
-    set_fm_drum_end1,
-    set_fm_drum_end2,
-    set_fm_drum_feedback,
-    set_fm_drum_fold,
-    set_fm_drum_mod1,
-    set_fm_drum_mod2,
-    set_fm_drum_noise_base,
-    set_fm_drum_noise_decay,
-    set_fm_drum_noise_grain,
-    set_fm_drum_noise_hold,
-    set_fm_drum_noise_level,
-    set_fm_drum_noise_reset,
-    set_fm_drum_noise_ring_mod,
-    set_fm_drum_noise_width,
-    set_fm_drum_op_ab_wave,
-    set_fm_drum_op_c_phase,
-    set_fm_drum_op_c_wave,
-    set_fm_drum_ratio1,
-    set_fm_drum_ratio2,
-    set_fm_drum_sweep_depth,
-    set_fm_drum_sweep_time,
-    set_fm_drum_transient,
-    set_fm_drum_transient_level,
-    set_fm_drum_tune,
-)
-from synthgenie.synthesizers.digitone.tools.lfo_tool import (
-    set_lfo1_depth,
-    set_lfo1_destination,
-    set_lfo1_fade,
-    set_lfo1_multiplier,
-    set_lfo1_speed,
-    set_lfo1_start_phase,
-    set_lfo1_trigger_mode,
-    set_lfo1_waveform,
-    set_lfo2_depth,
-    set_lfo2_destination,
-    set_lfo2_fade,
-    set_lfo2_multiplier,
-    set_lfo2_speed,
-    set_lfo2_start_phase,
-    set_lfo2_trigger_mode,
-    set_lfo2_waveform,
-)
+from synthgenie.synthesizers.shared.agents.models import stage_model
+from synthgenie.synthesizers.shared.agents.registry import agent_registry
 from synthgenie.synthesizers.shared.schemas.agent import SynthGenieAmbiguousResponse, SynthGenieResponse
 
 logger = logging.getLogger(__name__)
 
 
+@agent_registry.register('digitone.fm_drum')
 def get_fm_drum_agent() -> Agent[DigitoneAgentDeps, list[SynthGenieResponse | SynthGenieAmbiguousResponse]]:
     """
     Create the FM Drum synthesis specialist agent.
 
+    Built once per process and shared through the agent registry.
+
     Returns:
-        Agent configured with FM Drum-specific knowledge and tools
+        Agent configured with FM Drum-specific knowledge; tools are passed per run
     """
     agent = Agent(
-        model=os.getenv('AGENT_MODEL', 'openai:gpt-4'),
+        model=stage_model('sound_design'),
         deps_type=DigitoneAgentDeps,
         output_type=list[SynthGenieResponse | SynthGenieAmbiguousResponse],
         retries=2,
-        tools=[
-            # FM Drum-specific tools
-            set_fm_drum_tune,
-            set_fm_drum_sweep_time,
-            set_fm_drum_sweep_depth,
-            set_fm_drum_algorithm,
-            set_fm_drum_op_c_wave,
-            set_fm_drum_op_ab_wave,
-            set_fm_drum_feedback,
-            set_fm_drum_fold,
-            set_fm_drum_ratio1,
-            set_fm_drum_decay1,
-            set_fm_drum_end1,
-            set_fm_drum_mod1,
-            set_fm_drum_ratio2,
-            set_fm_drum_decay2,
-            set_fm_drum_end2,
-            set_fm_drum_mod2,
-            set_fm_drum_body_hold,
-            set_fm_drum_body_decay,
-            set_fm_drum_op_c_phase,
-            set_fm_drum_body_level,
-            set_fm_drum_noise_reset,
-            set_fm_drum_noise_ring_mod,
-            set_fm_drum_noise_hold,
-            set_fm_drum_noise_decay,
-            set_fm_drum_transient,
-            set_fm_drum_transient_level,
-            set_fm_drum_noise_base,
-            set_fm_drum_noise_width,
-            set_fm_drum_noise_grain,
-            set_fm_drum_noise_level,
-            # Universal tools
-            set_multi_mode_filter_attack,
-            set_multi_mode_filter_decay,
-            set_multi_mode_filter_sustain,
-            set_multi_mode_filter_release,
-            set_multi_mode_filter_frequency,
-            set_multi_mode_filter_resonance,
-            set_multi_mode_filter_type,
-            set_multi_mode_filter_envelope_depth,
-            set_amp_attack,
-            set_amp_hold,
-            set_amp_decay,
-            set_amp_sustain,
-            set_amp_release,
-            set_amp_envelope_reset,
-            set_amp_envelope_mode,
-            set_amp_pan,
-            set_amp_volume,
-            set_fx_bit_reduction,
-            set_fx_overdrive,
-            set_fx_sample_rate_reduction,
-            set_fx_sample_rate_routing,
-            set_fx_overdrive_routing,
-            set_fx_delay,
-            set_fx_reverb,
-            set_fx_chorus,
-            set_lfo1_speed,
-            set_lfo1_multiplier,
-            set_lfo1_fade,
-            set_lfo1_destination,
-            set_lfo1_waveform,
-            set_lfo1_start_phase,
-            set_lfo1_trigger_mode,
-            set_lfo1_depth,
-            set_lfo2_speed,
-            set_lfo2_multiplier,
-            set_lfo2_fade,
-            set_lfo2_destination,
-            set_lfo2_waveform,
-            set_lfo2_start_phase,
-            set_lfo2_trigger_mode,
-            set_lfo2_depth,
-        ],
+        # Tools are selected per prompt from the section toolsets (see digitone/toolsets)
+        tools=[],
         system_prompt=f"""You are an FM Drum synthesis expert for the Elektron Digitone synthesizer.
 
 {COMMON_SOUND_DESIGN_PRINCIPLES}
@@ -1,36 +1,88 @@
 """Router agent for Digitone sound design - determines which machine-specific agent to use."""
 
 import logging
-import os
+import re
+from dataclasses import dataclass
+from typing import Any
 
 from fastapi import HTTPException
 from pydantic_ai import Agent
 
-from synthgenie.synthesizers.digitone.agents.shared import DigitoneAgentDeps, MachineRoutingDecision
+from synthgenie.metrics.registry import metrics_registry
+from synthgenie.synthesizers.digitone.agents.shared import (
+    DigitoneAgentDeps,
+    MachineName,
+    MachineRoutingDecision,
+    RoutingPlan,
+)
+from synthgenie.synthesizers.shared.agents.models import stage_model
+from synthgenie.synthesizers.shared.agents.registry import agent_registry
 
 logger = logging.getLogger(__name__)
 
 # Input validation constants
 VALID_MACHINES = {'fm_tone', 'fm_drum', 'wavetone', 'swarmer'}
 MAX_PROMPT_LENGTH = 2000
+MIDI_TRACK_MIN = 1
+MIDI_TRACK_MAX = 16
+DEFAULT_TRACK = 1
 
+# Machine aliases accepted by the fast path, mirroring the router agent's system prompt
+MACHINE_PATTERNS: dict[MachineName, re.Pattern[str]] = {
+    'fm_tone': re.compile(r'\bfm[\s_-]?tone\b', re.IGNORECASE),
+    'fm_drum': re.compile(r'\bfm[\s_-]?drum\b', re.IGNORECASE),
+    'wavetone': re.compile(r'\bwave[\s_-]?tone\b', re.IGNORECASE),
+    'swarmer': re.compile(r'\bswarmer\b', re.IGNORECASE),
+}
+TRACK_PATTERN = re.compile(r'\b(?:track|channel)\s*(?::|#|number)?\s*(\d+)\b', re.IGNORECASE)
+# Separators between the per-track parts of a multi-track prompt
+PART_SPLIT_PATTERN = re.compile(r'\s*(?:[,;:]|\band\b|\bplus\b)\s*', re.IGNORECASE)
 
-def get_router_agent() -> Agent[DigitoneAgentDeps, MachineRoutingDecision]:
+
+@dataclass
+class RoutingStats:
+    """Counters for how often routing is resolved without a model call."""
+
+    fast_path_hits: int = 0
+    llm_fallbacks: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.fast_path_hits + self.llm_fallbacks
+        return self.fast_path_hits / total if total else 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            'fast_path_hits': self.fast_path_hits,
+            'llm_fallbacks': self.llm_fallbacks,
+            'fast_path_hit_rate': round(self.hit_rate, 4),
+        }
+
+
+routing_stats = RoutingStats()
+metrics_registry.register('digitone_routing', routing_stats.snapshot)
+
+
+@agent_registry.register('digitone.router')
+def get_router_agent() -> Agent[DigitoneAgentDeps, RoutingPlan]:
     """
     Create the router agent that analyzes user prompts and routes to the correct machine agent.
 
+    Built once per process and shared through the agent registry.
+
     Returns:
-        Agent configured to return routing decisions
+        Agent configured to return a routing plan
     """
     return Agent(
-        model=os.getenv('AGENT_MODEL', 'openai:gpt-4'),
+        model=stage_model('routing'),
         deps_type=DigitoneAgentDeps,
-        output_type=MachineRoutingDecision,
+        output_type=RoutingPlan,
         retries=1,
         system_prompt="""You are a routing specialist for the Elektron Digitone synthesizer.
 
 **Your Role:**
 Extract the synthesis machine and track number from the user's prompt. The user MUST specify which machine to use.
+A prompt may design several tracks at once; return one decision per track.
 
 **Valid Machines:**
 - **fm_tone** (or "FM Tone", "FM TONE", "fmtone")
@@ -65,43 +117,172 @@ User: "Make a fat kick drum on track 5 using FM Drum machine"
 User: "Lush detuned pad with swarmer on track 3"
 → machine: swarmer, track: 3, reasoning: "User specified swarmer machine on track 3"
 
+User: "Build a techno kit: kick on track 1 with FM Drum, bass on track 2 with Wavetone, pad on track 3 with Swarmer"
+→ three decisions:
+  - machine: fm_drum, track: 1, original_prompt: "Build a techno kit: kick on track 1 with FM Drum"
+  - machine: wavetone, track: 2, original_prompt: "Build a techno kit: bass on track 2 with Wavetone"
+  - machine: swarmer, track: 3, original_prompt: "Build a techno kit: pad on track 3 with Swarmer"
+
+**Multiple Tracks:**
+- Return one decision per track; each track appears at most once
+- Each decision's `original_prompt` is the part of the prompt about that track, plus any shared context
+  (genre, mood) so the machine agent can design it on its own
+- With a single track, `original_prompt` is the exact user prompt
+
 **CRITICAL:**
 The user MUST specify a machine name. If you cannot find a machine name in the prompt, default to "wavetone" but explain in the reasoning that the machine was not specified.
 
 **Output Format:**
-Always return a MachineRoutingDecision with:
+Always return a RoutingPlan whose `decisions` each have:
 - `machine`: One of ['fm_tone', 'fm_drum', 'wavetone', 'swarmer']
 - `track`: Integer 1-16
 - `reasoning`: Brief explanation (mention if machine was not specified by user)
-- `original_prompt`: Exact user prompt
+- `original_prompt`: The user prompt for this track (see Multiple Tracks)
 """,
     )
 
 
-async def route_to_machine(user_prompt: str, deps: DigitoneAgentDeps) -> MachineRoutingDecision:
+def parse_routing_decision(user_prompt: str) -> MachineRoutingDecision | None:
     """
-    Route a user prompt to the appropriate machine agent.
+    Extract the machine and track from a prompt without calling a model.
+
+    The prompt must name exactly one machine and at most one track in the 1-16 range;
+    the track defaults to 1 when none is given, like the router agent does.
+
+    Args:
+        user_prompt: The user's sound design request
+
+    Returns:
+        MachineRoutingDecision, or None if the prompt is ambiguous and needs the router agent
+    """
+    machines: list[MachineName] = [
+        machine for machine, pattern in MACHINE_PATTERNS.items() if pattern.search(user_prompt)
+    ]
+    if len(machines) != 1:
+        return None
+
+    tracks = {int(track) for track in TRACK_PATTERN.findall(user_prompt)}
+    if len(tracks) > 1:
+        return None
+
+    if tracks:
+        track = tracks.pop()
+        reasoning = f'Fast path: prompt names {machines[0]} on track {track}'
+    else:
+        track = DEFAULT_TRACK
+        reasoning = f'Fast path: prompt names {machines[0]}, defaulting to track {DEFAULT_TRACK}'
+
+    if not MIDI_TRACK_MIN <= track <= MIDI_TRACK_MAX:
+        return None
+
+    return MachineRoutingDecision(machine=machines[0], track=track, reasoning=reasoning, original_prompt=user_prompt)
+
+
+def _machines_in(text: str) -> list[MachineName]:
+    return [machine for machine, pattern in MACHINE_PATTERNS.items() if pattern.search(text)]
+
+
+def parse_routing_plan(user_prompt: str) -> RoutingPlan | None:
+    """
+    Extract the routing decisions from a prompt without calling a model.
+
+    Single-machine prompts go through `parse_routing_decision`. A prompt naming several
+    machines is split into parts at commas, colons, semicolons and "and"; every part must
+    then name one machine and one track (all distinct). Text before the first machine is
+    shared context for every track, and text between machines belongs to the preceding one.
+
+    Args:
+        user_prompt: The user's sound design request
+
+    Returns:
+        RoutingPlan, or None if the prompt is ambiguous and needs the router agent
+    """
+    machines = _machines_in(user_prompt)
+    if len(machines) <= 1:
+        decision = parse_routing_decision(user_prompt)
+        return RoutingPlan(decisions=[decision]) if decision else None
+
+    context: list[str] = []
+    parts: list[list[str]] = []
+    for part in PART_SPLIT_PATTERN.split(user_prompt.strip()):
+        if not part:
+            continue
+        if _machines_in(part):
+            parts.append([part])
+        elif parts:
+            parts[-1].append(part)
+        else:
+            context.append(part)
+
+    decisions: list[MachineRoutingDecision] = []
+    for part in parts:
+        track_prompt = ', '.join(part)
+        part_machines = _machines_in(track_prompt)
+        tracks = {int(track) for track in TRACK_PATTERN.findall(track_prompt)}
+        if len(part_machines) != 1 or len(tracks) != 1:
+            return None
+
+        track = tracks.pop()
+        if not MIDI_TRACK_MIN <= track <= MIDI_TRACK_MAX:
+            return None
+
+        decisions.append(
+            MachineRoutingDecision(
+                machine=part_machines[0],
+                track=track,
+                reasoning=f'Fast path: prompt part names {part_machines[0]} on track {track}',
+                original_prompt=': '.join([*context, track_prompt]) if context else track_prompt,
+            )
+        )
+
+    if len({decision.track for decision in decisions}) != len(decisions):
+        return None
+    return RoutingPlan(decisions=decisions)
+
+
+async def route_to_machines(user_prompt: str, deps: DigitoneAgentDeps) -> RoutingPlan:
+    """
+    Route a user prompt to the machine agent(s) for each track it designs.
+
+    Prompts that name their machines and tracks unambiguously are routed locally by
+    `parse_routing_plan`; only the rest go to the router agent.
 
     Args:
         user_prompt: The user's sound design request
         deps: Agent dependencies
 
     Returns:
-        MachineRoutingDecision with machine, track, and reasoning
+        RoutingPlan with one decision (machine, track, reasoning) per track
 
     Raises:
         HTTPException: If prompt exceeds maximum length
+        AgentBudgetExceeded: If the router agent exceeds the prompt's budget
     """
     # Input validation
     if len(user_prompt) > MAX_PROMPT_LENGTH:
         raise HTTPException(status_code=400, detail=f'Prompt too long (max {MAX_PROMPT_LENGTH} characters)')
 
+    plan = parse_routing_plan(user_prompt)
+    if plan is not None:
+        routing_stats.fast_path_hits += 1
+        logger.info(f'Fast-path routed to {_describe(plan)}')
+        return plan
+
+    routing_stats.llm_fallbacks += 1
     agent = get_router_agent()
     logger.info(f'Routing prompt: {user_prompt[:100]}...')
 
-    result = await agent.run(user_prompt, deps=deps)
-    decision = result.output
+    result = await deps.budget.run(agent, user_prompt, deps=deps)
+    plan = result.output
+
+    # A single decision always designs the whole prompt
+    if len(plan.decisions) == 1:
+        plan.decisions[0].original_prompt = user_prompt
+
+    logger.info(f'Routed to {_describe(plan)}. Reasoning: {[decision.reasoning for decision in plan.decisions]}')
+
+    return plan
 
-    logger.info(f'Routed to {decision.machine} on track {decision.track}. Reasoning: {decision.reasoning}')
 
-    return decision
+def _describe(plan: RoutingPlan) -> str:
+    return ', '.join(f'{decision.machine} on track {decision.track}' for decision in plan.decisions)
@@ -1,13 +1,13 @@
 """Shared utilities, dependencies, and validators for Digitone agents."""
 
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Literal
 
-import psycopg2
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, field_validator
 from pydantic_ai import ModelRetry, RunContext
 
+from synthgenie.synthesizers.shared.budget import AgentBudget
 from synthgenie.synthesizers.shared.schemas.agent import SynthGenieAmbiguousResponse, SynthGenieResponse
 
 logger = logging.getLogger(__name__)
@@ -18,6 +18,8 @@ MIDI_14BIT_MAX = 16383
 MIDI_CHANNEL_MIN = 1
 MIDI_CHANNEL_MAX = 16
 
+MachineName = Literal['fm_tone', 'fm_drum', 'wavetone', 'swarmer']
+
 
 @dataclass
 class DigitoneAgentDeps:
@@ -25,20 +27,33 @@ class DigitoneAgentDeps:
 
     default_midi_channel: int = 1
     api_key: str | None = None
-    conn: psycopg2.extensions.connection | None = None
-    max_requests: int = 16
-    request_timeout: int = 30
+    # Shared by every agent run of the prompt
+    budget: AgentBudget = field(default_factory=AgentBudget)
 
 
 class MachineRoutingDecision(BaseModel):
     """Decision made by the router agent about which machine to use."""
 
-    machine: Literal['fm_tone', 'fm_drum', 'wavetone', 'swarmer']
+    machine: MachineName
     track: int  # 1-16
     reasoning: str
     original_prompt: str
 
 
+class RoutingPlan(BaseModel):
+    """Routing decisions for every track a prompt designs, each handled by its own machine agent."""
+
+    decisions: list[MachineRoutingDecision] = Field(min_length=1, max_length=MIDI_CHANNEL_MAX)
+
+    @field_validator('decisions')
+    @classmethod
+    def tracks_are_distinct(cls, decisions: list[MachineRoutingDecision]) -> list[MachineRoutingDecision]:
+        tracks = [decision.track for decision in decisions]
+        if len(set(tracks)) != len(tracks):
+            raise ValueError(f'Each track can only be routed once, got tracks {tracks}')
+        return decisions
+
+
 def validate_synth_response(
     _ctx: RunContext[DigitoneAgentDeps], result: list[SynthGenieResponse | SynthGenieAmbiguousResponse]
 ) -> list[SynthGenieResponse | SynthGenieAmbiguousResponse]:
@@ -1,14 +1,12 @@
 import logging
-import os
 from dataclasses import dataclass
 
-import psycopg2
 from fastapi import HTTPException
 from pydantic import ValidationError
 from pydantic_ai import Agent, ModelRetry, RunContext
 from pydantic_ai.exceptions import UsageLimitExceeded
 
-from synthgenie.auth.models import track_api_key_usage
+from synthgenie.auth.usage import usage_tracker
 from synthgenie.synthesizers.digitone.tools.amp_fx_tool import (
     set_amp_attack,
     set_amp_decay,
@@ -155,6 +153,7 @@ from synthgenie.synthesizers.digitone.tools.wavetone_tool import (
     set_wavetone_osc2_waveform,
     set_wavetone_reset_mode,
 )
+from synthgenie.synthesizers.shared.agents.models import stage_model
 from synthgenie.synthesizers.shared.schemas.agent import SynthGenieAmbiguousResponse, SynthGenieResponse
 
 logger = logging.getLogger(__name__)
@@ -166,7 +165,6 @@ class DigitoneAgentDeps:
 
     default_midi_channel: int = 1
     api_key: str | None = None
-    conn: psycopg2.extensions.connection | None = None
     max_requests: int = 64
 
 
@@ -178,7 +176,7 @@ def get_digitone_agent() -> Agent[DigitoneAgentDeps, list[SynthGenieResponse | S
         Agent configured with tools, dependencies, and output validation
     """
     agent = Agent(
-        model=os.getenv('AGENT_MODEL', 'openai:gpt-4'),
+        model=stage_model('sound_design'),
         deps_type=DigitoneAgentDeps,
         output_type=list[SynthGenieResponse | SynthGenieAmbiguousResponse],
         tools=[
@@ -405,7 +403,6 @@ The Digitone has 4 machines. Tools are machine-specific:
 async def run_digitone_sound_design_agent(
     user_prompt: str,
     api_key: str,
-    conn: psycopg2.extensions.connection,
     midi_channel: int = 1,
 ) -> list[SynthGenieResponse | SynthGenieAmbiguousResponse]:
     """
@@ -414,7 +411,6 @@ async def run_digitone_sound_design_agent(
     Args:
         user_prompt: The user's sound design request
         api_key: API key for authentication and usage tracking
-        conn: Database connection for usage tracking
         midi_channel: Default MIDI channel (track) to use (1-16)
 
     Returns:
@@ -430,7 +426,6 @@ async def run_digitone_sound_design_agent(
     deps = DigitoneAgentDeps(
         default_midi_channel=midi_channel,
         api_key=api_key,
-        conn=conn,
         max_requests=64,
     )
 
@@ -446,8 +441,8 @@ async def run_digitone_sound_design_agent(
         logger.info(f'Agent completed successfully with {len(result.output)} responses')
 
         # Track API usage
-        if deps.conn and deps.api_key:
-            track_api_key_usage(deps.conn, deps.api_key)
+        if deps.api_key:
+            usage_tracker.record(deps.api_key)
 
         return result.output
 
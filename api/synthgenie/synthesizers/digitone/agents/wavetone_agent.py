@@ -1,7 +1,6 @@
 """Wavetone synthesis specialist agent for Digitone."""
 
 import logging
-import os
 
 from pydantic_ai import Agent
 
@@ -10,163 +9,30 @@ from synthgenie.synthesizers.digitone.agents.shared import (
     DigitoneAgentDeps,
     validate_synth_response,
 )
-from synthgenie.synthesizers.digitone.tools.amp_fx_tool import (
-    set_amp_attack,
-    set_amp_decay,
-    set_amp_envelope_mode,
-    set_amp_envelope_reset,
-    set_amp_hold,
-    set_amp_pan,
-    set_amp_release,
-    set_amp_sustain,
-    set_amp_volume,
-    set_fx_bit_reduction,
-    set_fx_chorus,
-    set_fx_delay,
-    set_fx_overdrive,
-    set_fx_overdrive_routing,
-    set_fx_reverb,
-    set_fx_sample_rate_reduction,
-    set_fx_sample_rate_routing,
-)
-from synthgenie.synthesizers.digitone.tools.filter_tool import (
-    set_multi_mode_filter_attack,
-    set_multi_mode_filter_decay,
-    set_multi_mode_filter_envelope_depth,
-    set_multi_mode_filter_frequency,
-    set_multi_mode_filter_release,
-    set_multi_mode_filter_resonance,
-    set_multi_mode_filter_sustain,
-    set_multi_mode_filter_type,
-)
-from synthgenie.synthesizers.digitone.tools.lfo_tool import (
-    set_lfo1_depth,
-    set_lfo1_destination,
-    set_lfo1_fade,
-    set_lfo1_multiplier,
-    set_lfo1_speed,
-    set_lfo1_start_phase,
-    set_lfo1_trigger_mode,
-    set_lfo1_waveform,
-    set_lfo2_depth,
-    set_lfo2_destination,
-    set_lfo2_fade,
-    set_lfo2_multiplier,
-    set_lfo2_speed,
-    set_lfo2_start_phase,
-    set_lfo2_trigger_mode,
-    set_lfo2_waveform,
-)
-from synthgenie.synthesizers.digitone.tools.wavetone_tool import (
-    set_wavetone_attack,
-    set_wavetone_decay,
-    set_wavetone_drift,
-    set_wavetone_hold,
-    set_wavetone_mod_type,
-    set_wavetone_noise_base,
-    set_wavetone_noise_character,
-    set_wavetone_noise_level,
-    set_wavetone_noise_type,
-    set_wavetone_noise_width,
-    set_wavetone_osc1_level,
-    set_wavetone_osc1_offset,
-    set_wavetone_osc1_phase_distortion,
-    set_wavetone_osc1_pitch,
-    set_wavetone_osc1_table,
-    set_wavetone_osc1_waveform,
-    set_wavetone_osc2_level,
-    set_wavetone_osc2_offset,
-    set_wavetone_osc2_phase_distortion,
-    set_wavetone_osc2_pitch,
-    set_wavetone_osc2_table,
-    set_wavetone_osc2_waveform,
-    set_wavetone_reset_mode,
-)
+from synthgenie.synthesizers.shared.agents.models import stage_model
+from synthgenie.synthesizers.shared.agents.registry import agent_registry
 from synthgenie.synthesizers.shared.schemas.agent import SynthGenieAmbiguousResponse, SynthGenieResponse
 
 logger = logging.getLogger(__name__)
 
 
+@agent_registry.register('digitone.wavetone')
 def get_wavetone_agent() -> Agent[DigitoneAgentDeps, list[SynthGenieResponse | SynthGenieAmbiguousResponse]]:
     """
     Create the Wavetone synthesis specialist agent.
 
+    Built once per process and shared through the agent registry.
+
     Returns:
-        Agent configured with Wavetone-specific knowledge and tools
+        Agent configured with Wavetone-specific knowledge; tools are passed per run
     """
     agent = Agent(
-        model=os.getenv('AGENT_MODEL', 'openai:gpt-4'),
+        model=stage_model('sound_design'),
         deps_type=DigitoneAgentDeps,
         output_type=list[SynthGenieResponse | SynthGenieAmbiguousResponse],
         retries=2,
-        tools=[
-            # Wavetone-specific tools
-            set_wavetone_osc1_pitch,
-            set_wavetone_osc1_waveform,
-            set_wavetone_osc1_phase_distortion,
-            set_wavetone_osc1_level,
-            set_wavetone_osc1_offset,
-            set_wavetone_osc1_table,
-            set_wavetone_osc2_pitch,
-            set_wavetone_osc2_waveform,
-            set_wavetone_osc2_phase_distortion,
-            set_wavetone_osc2_level,
-            set_wavetone_osc2_offset,
-            set_wavetone_osc2_table,
-            set_wavetone_mod_type,
-            set_wavetone_reset_mode,
-            set_wavetone_drift,
-            set_wavetone_attack,
-            set_wavetone_hold,
-            set_wavetone_decay,
-            set_wavetone_noise_level,
-            set_wavetone_noise_base,
-            set_wavetone_noise_width,
-            set_wavetone_noise_type,
-            set_wavetone_noise_character,
-            # Universal tools
-            set_multi_mode_filter_attack,
-            set_multi_mode_filter_decay,
-            set_multi_mode_filter_sustain,
-            set_multi_mode_filter_release,
-            set_multi_mode_filter_frequency,
-            set_multi_mode_filter_resonance,
-            set_multi_mode_filter_type,
-            set_multi_mode_filter_envelope_depth,
-            set_amp_attack,
-            set_amp_hold,
-            set_amp_decay,
-            set_amp_sustain,
-            set_amp_release,
-            set_amp_envelope_reset,
-            set_amp_envelope_mode,
-            set_amp_pan,
-            set_amp_volume,
-            set_fx_bit_reduction,
-            set_fx_overdrive,
-            set_fx_sample_rate_reduction,
-            set_fx_sample_rate_routing,
-            set_fx_overdrive_routing,
-            set_fx_delay,
-            set_fx_reverb,
-            set_fx_chorus,
-            set_lfo1_speed,
-            set_lfo1_multiplier,
-            set_lfo1_fade,
-            set_lfo1_destination,
-            set_lfo1_waveform,
-            set_lfo1_start_phase,
-            set_lfo1_trigger_mode,
-            set_lfo1_depth,
-            set_lfo2_speed,
-            set_lfo2_multiplier,
-            set_lfo2_fade,
-            set_lfo2_destination,
-            set_lfo2_waveform,
-            set_lfo2_start_phase,
-            set_lfo2_trigger_mode,
-            set_lfo2_depth,
-        ],
+        # Tools are selected per prompt from the section toolsets (see digitone/toolsets)
+        tools=[],
         system_prompt=f"""You are a Wavetone synthesis expert for the Elektron Digitone synthesizer.
 
 {COMMON_SOUND_DESIGN_PRINCIPLES}
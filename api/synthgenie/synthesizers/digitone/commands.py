@@ -0,0 +1,199 @@
+"""Direct, LLM-free execution of explicit Digitone parameter commands.
+
+Prompts such as "set filter cutoff to 80 on track 2" or
+"set lfo2_destination on track 4 to filter_envelope_depth" name a parameter and a value,
+so they can be resolved against the tool functions without validation, routing or a
+machine agent. Anything that doesn't resolve unambiguously is left to the agents.
+"""
+
+import logging
+import re
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any, cast
+
+import synthgenie.synthesizers.digitone.tools as digitone_tools
+from synthgenie.data.amp import AMP_PARAMS_DATA
+from synthgenie.data.filters import BASE_WIDTH_FILTER_PARAMS, MULTI_MODE_FILTER_PARAMS
+from synthgenie.data.fm_drum import FM_DRUM_PARAMS
+from synthgenie.data.fm_tone import FM_TONE_PARAMS
+from synthgenie.data.fx import FX_PARAMS_DATA
+from synthgenie.data.lfo import LFO1_PARAMS, LFO2_PARAMS, LFO3_PARAMS
+from synthgenie.data.swarmer import SWARMER_PARAMS
+from synthgenie.data.wavetone import WAVETONE_PARAMS
+from synthgenie.metrics.registry import metrics_registry
+from synthgenie.synthesizers.digitone.agents.router_agent import (
+    DEFAULT_TRACK,
+    MACHINE_PATTERNS,
+    MIDI_TRACK_MAX,
+    MIDI_TRACK_MIN,
+    TRACK_PATTERN,
+)
+from synthgenie.synthesizers.shared.parameters import ParameterRegistry, ParameterSpec, ToolFunction
+from synthgenie.synthesizers.shared.schemas.agent import SynthGenieResponse
+
+logger = logging.getLogger(__name__)
+
+# `synthgenie.data` tables holding named values for the tools with these prefixes
+DATA_PARAMETER_TABLES: dict[str, list[Mapping[str, Any]]] = {
+    'set_amp_': [AMP_PARAMS_DATA],
+    'set_fx_': [FX_PARAMS_DATA],
+    'set_multi_mode_filter_': [MULTI_MODE_FILTER_PARAMS, BASE_WIDTH_FILTER_PARAMS],
+    'set_lfo1_': [LFO1_PARAMS],
+    'set_lfo2_': [LFO2_PARAMS],
+    'set_lfo3_': [LFO3_PARAMS],
+    'set_fm_tone_': [FM_TONE_PARAMS],
+    'set_fm_drum_': [FM_DRUM_PARAMS],
+    'set_wavetone_': [WAVETONE_PARAMS],
+    'set_swarmer_': [SWARMER_PARAMS],
+}
+MACHINE_TOOL_PREFIXES = {
+    'fm_tone': 'fm_tone_',
+    'fm_drum': 'fm_drum_',
+    'wavetone': 'wavetone_',
+    'swarmer': 'swarmer_',
+}
+
+COMMAND_VERB_PATTERN = re.compile(r'^\s*(?:please\s+)?(?:set|change|adjust|put|turn)\s+', re.IGNORECASE)
+CLAUSE_SPLIT_PATTERN = re.compile(r'\s*(?:,|;|\band\b|\bthen\b)\s*', re.IGNORECASE)
+CLAUSE_PATTERN = re.compile(
+    r'^(?:(?:set|change|adjust|put|turn)\s+)?(?P<parameter>.+?)\s+(?:to|=|at)\s+(?P<value>.+?)\s*\.?$',
+    re.IGNORECASE,
+)
+NUMBER_PATTERN = re.compile(r'^(?P<number>[-+]?\d+(?:\.\d+)?)\s*(?P<percent>%|percent)?$', re.IGNORECASE)
+TRACK_PHRASE_PATTERN = re.compile(r'(?:\b(?:on|for|in)\s+)?' + TRACK_PATTERN.pattern, re.IGNORECASE)
+MACHINE_PHRASE_PATTERN = re.compile(
+    r'(?:\b(?:using|with|on|for)\s+)?(?:the\s+)?(?:'
+    + '|'.join(pattern.pattern for pattern in MACHINE_PATTERNS.values())
+    + r')(?:\s+machine)?',
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class CommandStats:
+    """Counters for prompts answered directly versus escalated to the agents."""
+
+    direct_hits: int = 0
+    escalations: int = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        total = self.direct_hits + self.escalations
+        return {
+            'direct_hits': self.direct_hits,
+            'escalations': self.escalations,
+            'direct_hit_rate': round(self.direct_hits / total, 4) if total else 0.0,
+        }
+
+
+command_stats = CommandStats()
+metrics_registry.register('digitone_commands', command_stats.snapshot)
+
+
+def _iter_data_entries(table: Mapping[str, Any]) -> Iterator[Mapping[str, Any]]:
+    """Yield the parameter entries of a (possibly page-nested) `synthgenie.data` table."""
+    for entry in table.values():
+        if isinstance(entry, Mapping) and 'cc_msb' in entry:
+            yield entry
+        elif isinstance(entry, Mapping):
+            yield from _iter_data_entries(entry)  # type: ignore[arg-type]
+
+
+def _data_options(tool: ToolFunction, probe: SynthGenieResponse) -> dict[str, int]:
+    """Named values from `synthgenie.data` for the parameter on the tool's CC."""
+    for prefix, tables in DATA_PARAMETER_TABLES.items():
+        if not tool.__name__.startswith(prefix):
+            continue
+        for table in tables:
+            for entry in _iter_data_entries(table):
+                options = entry.get('options')
+                if entry['cc_msb'] != probe.midi_cc or not options:
+                    continue
+                if isinstance(options, Mapping):
+                    return dict(options)  # type: ignore[arg-type]
+                return {str(name): index for index, name in enumerate(options)}
+    return {}
+
+
+def build_digitone_parameter_registry() -> ParameterRegistry:
+    """Index every Digitone tool, enriched with named values from `synthgenie.data`."""
+    tools = [cast(ToolFunction, tool) for name, tool in vars(digitone_tools).items() if name.startswith('set_')]
+    registry = ParameterRegistry(tools)
+    options = {
+        spec.tool_name: _data_options(spec.tool, spec.build_response(spec.min_value, MIDI_TRACK_MIN))
+        for spec in registry.specs.values()
+    }
+    return ParameterRegistry(tools, options)
+
+
+digitone_parameters = build_digitone_parameter_registry()
+
+
+def _resolve_value(spec: ParameterSpec, raw_value: str) -> int | None:
+    if number_match := NUMBER_PATTERN.match(raw_value):
+        return spec.to_midi_value(float(number_match.group('number')), bool(number_match.group('percent')))
+    return spec.option_value(raw_value)
+
+
+def parse_parameter_command(user_prompt: str) -> list[SynthGenieResponse] | None:
+    """
+    Resolve an explicit parameter command into responses without calling a model.
+
+    Every clause must name exactly one parameter and a value in range (a number, a
+    percentage or a documented option name); one track may be given for the whole prompt.
+
+    Args:
+        user_prompt: e.g. "set filter cutoff to 80 and resonance to 40 on track 2"
+
+    Returns:
+        One SynthGenieResponse per clause, or None if the prompt must go to the agents
+    """
+    if not COMMAND_VERB_PATTERN.match(user_prompt):
+        return None
+
+    tracks = {int(track) for track in TRACK_PATTERN.findall(user_prompt)}
+    if len(tracks) > 1:
+        return None
+    track = tracks.pop() if tracks else DEFAULT_TRACK
+    if not MIDI_TRACK_MIN <= track <= MIDI_TRACK_MAX:
+        return None
+
+    # Only consider the named machine's tools (plus the universal ones)
+    named_machines = {machine for machine, pattern in MACHINE_PATTERNS.items() if pattern.search(user_prompt)}
+    if len(named_machines) > 1:
+        return None
+    other_prefixes = tuple(prefix for machine, prefix in MACHINE_TOOL_PREFIXES.items() if machine not in named_machines)
+
+    def is_other_machine(spec: ParameterSpec) -> bool:
+        return bool(named_machines) and spec.name.startswith(other_prefixes)
+
+    command = MACHINE_PHRASE_PATTERN.sub(' ', TRACK_PHRASE_PATTERN.sub(' ', user_prompt))
+    responses: list[SynthGenieResponse] = []
+    for clause in CLAUSE_SPLIT_PATTERN.split(command.strip()):
+        match = CLAUSE_PATTERN.match(clause)
+        if not match:
+            return None
+
+        candidates = digitone_parameters.resolve(match.group('parameter'), exclude=is_other_machine)
+        if len(candidates) != 1:
+            return None
+
+        spec = candidates[0]
+        value = _resolve_value(spec, match.group('value'))
+        if value is None:
+            return None
+        responses.append(spec.build_response(value, track))
+
+    return responses or None
+
+
+def interpret_parameter_command(user_prompt: str) -> list[SynthGenieResponse] | None:
+    """Run `parse_parameter_command` and count direct hits versus escalations."""
+    responses = parse_parameter_command(user_prompt)
+    if responses is None:
+        command_stats.escalations += 1
+        return None
+
+    command_stats.direct_hits += 1
+    logger.info(f'Executed {len(responses)} parameter changes directly: {[r.used_tool for r in responses]}')
+    return responses
@@ -0,0 +1,228 @@
+"""Instant Digitone sounds from the curated preset library.
+
+Most prompts ask for a common archetype on a named machine ("piano with FM Tone", "kick with
+FM Drum on track 2"). When a prompt names exactly one machine and exactly one of that machine's
+archetypes in `synthgenie/data/presets.py`, the preset's full parameter set is returned without
+validation, routing or a machine agent.
+
+A prompt that also describes the sound ("dark piano with FM Tone and a long release") starts
+from the preset too: with `DIGITONE_PRESET_REFINEMENT` the machine agent is given the preset and
+only sets the parameters that have to change, and those deltas are merged over the preset.
+"""
+
+import logging
+import os
+import re
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any
+
+from synthgenie.data.presets import DIGITONE_PRESETS, PRESET_LIBRARY_VERSION
+from synthgenie.metrics.registry import metrics_registry
+from synthgenie.synthesizers.digitone.agents.router_agent import parse_routing_decision
+from synthgenie.synthesizers.digitone.agents.shared import MachineName, MachineRoutingDecision
+from synthgenie.synthesizers.digitone.commands import (
+    MACHINE_PHRASE_PATTERN,
+    TRACK_PHRASE_PATTERN,
+    digitone_parameters,
+)
+from synthgenie.synthesizers.shared.schemas.agent import SynthGenieAmbiguousResponse, SynthGenieResponse
+from synthgenie.synthesizers.shared.semantic_cache import FILLER_WORDS
+
+logger = logging.getLogger(__name__)
+
+PRESETS_ENABLED = os.getenv('DIGITONE_PRESETS', 'true').lower() == 'true'
+# Refine a matched preset with the machine agent when the prompt describes more than the archetype
+PRESET_REFINEMENT = os.getenv('DIGITONE_PRESET_REFINEMENT', 'true').lower() == 'true'
+
+# Words that leave a preset as is: besides the machine, track and archetype, a prompt made of
+# these only asks for the preset
+NEUTRAL_WORDS = FILLER_WORDS | frozenset(
+    'can you could would just get set up put load new this be as at by via its from '
+    'machine track channel preset patch program voice instrument synth synthesizer '
+    'basic classic typical standard simple default normal regular good nice'.split()
+)
+WORD_PATTERN = re.compile(r'[a-z0-9]+(?:-[a-z0-9]+)*')
+
+AgentResponse = SynthGenieResponse | SynthGenieAmbiguousResponse
+
+
+@dataclass(frozen=True)
+class Preset:
+    """A full parameter set for one archetype on one machine, as MIDI values keyed by parameter name."""
+
+    machine: MachineName
+    archetype: str
+    version: int
+    keywords: tuple[str, ...]
+    parameters: Mapping[str, int]
+
+    @property
+    def label(self) -> str:
+        return f'{self.machine}/{self.archetype} v{self.version}'
+
+    @cached_property
+    def pattern(self) -> re.Pattern[str]:
+        # Longest keyword first, so "electric piano" is consumed whole
+        keywords = sorted(self.keywords, key=len, reverse=True)
+        return re.compile(r'\b(?:' + '|'.join(re.escape(keyword) for keyword in keywords) + r')\b', re.IGNORECASE)
+
+    def responses(self, track: int) -> list[SynthGenieResponse]:
+        """The tool responses setting every parameter of the preset on a track."""
+        return [digitone_parameters.specs[name].build_response(value, track) for name, value in self.parameters.items()]
+
+
+def load_presets(library: Mapping[str, Mapping[str, Mapping[str, Any]]]) -> dict[str, list[Preset]]:
+    """
+    Build the presets of a library, checking every parameter against the Digitone tools.
+
+    Raises:
+        ValueError: If a preset names an unknown parameter or a value out of its range
+    """
+    presets: dict[str, list[Preset]] = {}
+    for machine, archetypes in library.items():
+        for archetype, entry in archetypes.items():
+            preset = Preset(
+                machine=machine,  # type: ignore[arg-type]
+                archetype=archetype,
+                version=entry['version'],
+                keywords=tuple(entry['keywords']),
+                parameters=dict(entry['parameters']),
+            )
+            for name, value in preset.parameters.items():
+                spec = digitone_parameters.get(name)
+                if spec is None:
+                    raise ValueError(f'Preset {preset.label} sets unknown parameter {name}')
+                if not spec.min_value <= value <= spec.max_value:
+                    raise ValueError(f'Preset {preset.label} sets {name} to {value}, out of range')
+            presets.setdefault(machine, []).append(preset)
+    return presets
+
+
+digitone_presets = load_presets(DIGITONE_PRESETS)
+
+
+@dataclass(frozen=True)
+class PresetMatch:
+    """A preset matched to a prompt, with the track it goes on and the descriptors it doesn't capture."""
+
+    preset: Preset
+    decision: MachineRoutingDecision
+    descriptors: tuple[str, ...] = ()
+
+    @property
+    def exact(self) -> bool:
+        """Whether the prompt asks for nothing beyond the preset."""
+        return not self.descriptors
+
+    def responses(self) -> list[SynthGenieResponse]:
+        return self.preset.responses(self.decision.track)
+
+    def refinement_note(self) -> str:
+        """Note for the machine agent's prompt: the preset it starts from and that it should only send changes."""
+        values = ', '.join(f'{name}={value}' for name, value in self.preset.parameters.items())
+        return (
+            f'Track {self.decision.track} already has the {self.preset.archetype} preset loaded, in MIDI values: '
+            f'{values}. Only set the parameters that must change for this request; '
+            'do not set any parameter to its preset value.'
+        )
+
+    def is_delta(self, response: AgentResponse) -> bool:
+        """Whether a machine agent response changes the preset, rather than restating one of its values."""
+        return response not in self.responses()
+
+    def merge(self, refinements: list[AgentResponse]) -> list[AgentResponse]:
+        """The preset with the machine agent's changes applied, followed by any parameters it adds."""
+        deltas = [response for response in refinements if self.is_delta(response)]
+        changed = {
+            (response.used_tool, response.midi_channel)
+            for response in deltas
+            if isinstance(response, SynthGenieResponse)
+        }
+        base: list[AgentResponse] = [
+            response for response in self.responses() if (response.used_tool, response.midi_channel) not in changed
+        ]
+        return base + deltas
+
+
+def match_preset(user_prompt: str) -> PresetMatch | None:
+    """
+    Match a prompt to a preset of the machine it names.
+
+    The prompt must name exactly one machine, at most one track and exactly one of the machine's
+    archetypes; whatever else it says, apart from filler and neutral words, is a descriptor for
+    the refinement pass.
+
+    Args:
+        user_prompt: e.g. "piano with FM Tone on track 3"
+
+    Returns:
+        PresetMatch, or None if the prompt doesn't match a single preset
+    """
+    decision = parse_routing_decision(user_prompt)
+    if decision is None:
+        return None
+
+    candidates = [preset for preset in digitone_presets.get(decision.machine, []) if preset.pattern.search(user_prompt)]
+    if len(candidates) != 1:
+        return None
+
+    preset = candidates[0]
+    rest = preset.pattern.sub(' ', MACHINE_PHRASE_PATTERN.sub(' ', TRACK_PHRASE_PATTERN.sub(' ', user_prompt)))
+    descriptors = tuple(word for word in WORD_PATTERN.findall(rest.lower()) if word not in NEUTRAL_WORDS)
+    return PresetMatch(preset, decision, descriptors)
+
+
+@dataclass
+class PresetStats:
+    """Counters for prompts answered from the preset library, refined from it, or left to the agents."""
+
+    exact_hits: int = 0
+    refinements: int = 0
+    misses: int = 0
+    presets: Counter[str] = field(default_factory=Counter[str])
+
+    def snapshot(self) -> dict[str, Any]:
+        total = self.exact_hits + self.refinements + self.misses
+        return {
+            'library_version': PRESET_LIBRARY_VERSION,
+            'exact_hits': self.exact_hits,
+            'refinements': self.refinements,
+            'misses': self.misses,
+            'hit_rate': round((self.exact_hits + self.refinements) / total, 4) if total else 0.0,
+            'presets': dict(self.presets.most_common()),
+        }
+
+
+preset_stats = PresetStats()
+metrics_registry.register('digitone_presets', preset_stats.snapshot)
+
+
+def find_preset(user_prompt: str) -> PresetMatch | None:
+    """
+    Run `match_preset` and count exact hits, refinements and misses.
+
+    Returns:
+        The match, or None if presets are disabled, nothing matches, or the match needs a
+        refinement pass and `DIGITONE_PRESET_REFINEMENT` is off
+    """
+    if not PRESETS_ENABLED:
+        return None
+
+    match = match_preset(user_prompt)
+    if match is None or (not match.exact and not PRESET_REFINEMENT):
+        preset_stats.misses += 1
+        return None
+
+    preset_stats.presets[match.preset.label] += 1
+    if match.exact:
+        preset_stats.exact_hits += 1
+        logger.info(f'Applied preset {match.preset.label} on track {match.decision.track}')
+    else:
+        preset_stats.refinements += 1
+        logger.info(
+            f'Refining preset {match.preset.label} on track {match.decision.track} for {", ".join(match.descriptors)}'
+        )
+    return match
@@ -1,65 +1,75 @@
 """Service layer for Digitone sound design agent orchestration."""
 
+import asyncio
 import logging
+import os
+import time
+from collections.abc import AsyncIterator, Awaitable, Iterator
+from contextlib import contextmanager
+from typing import Any
 
-import psycopg2
 from fastapi import HTTPException
 from pydantic import ValidationError
+from pydantic_ai import Agent
+from pydantic_ai.settings import ModelSettings
+from pydantic_ai.toolsets import AbstractToolset
+from pydantic_ai.usage import UsageLimits
 
-from synthgenie.auth.models import track_api_key_usage
+from synthgenie.auth.usage import usage_tracker
 from synthgenie.synthesizers.digitone.agents.fm_drum_agent import get_fm_drum_agent
 from synthgenie.synthesizers.digitone.agents.fm_tone_agent import get_fm_tone_agent
-from synthgenie.synthesizers.digitone.agents.router_agent import route_to_machine
-from synthgenie.synthesizers.digitone.agents.shared import DigitoneAgentDeps
+from synthgenie.synthesizers.digitone.agents.router_agent import route_to_machines
+from synthgenie.synthesizers.digitone.agents.shared import DigitoneAgentDeps, MachineRoutingDecision, RoutingPlan
 from synthgenie.synthesizers.digitone.agents.swarmer_agent import get_swarmer_agent
 from synthgenie.synthesizers.digitone.agents.wavetone_agent import get_wavetone_agent
+from synthgenie.synthesizers.digitone.commands import interpret_parameter_command
+from synthgenie.synthesizers.digitone.presets import PresetMatch, find_preset
+from synthgenie.synthesizers.digitone.toolsets.tool_selector import (
+    create_dynamic_toolset,
+    describe_sections,
+    select_sections,
+)
 from synthgenie.synthesizers.shared.agents.validation_agent import prompt_validation_agent
+from synthgenie.synthesizers.shared.budget import (
+    AgentBudget,
+    AgentBudgetExceeded,
+    default_usage_limits,
+    usage_limits_for_key,
+)
 from synthgenie.synthesizers.shared.schemas.agent import SynthGenieAmbiguousResponse, SynthGenieResponse
+from synthgenie.synthesizers.shared.streaming import collect_tool_responses, stream_tool_responses
 
 logger = logging.getLogger(__name__)
 
+# Start routing alongside validation instead of after it
+SPECULATIVE_ROUTING = os.getenv('DIGITONE_SPECULATIVE_ROUTING', 'true').lower() == 'true'
 
-async def run_digitone_agent_workflow(
-    user_prompt: str, api_key: str, conn: psycopg2.extensions.connection
-) -> list[SynthGenieResponse | SynthGenieAmbiguousResponse]:
-    """
-    Orchestrate the multi-agent Digitone sound design workflow.
+# Lower temperature for more consistent tool usage
+MACHINE_AGENT_SETTINGS: ModelSettings = {'temperature': 0.3}
 
-    Workflow:
-    1. Validate prompt is about sound design
-    2. Route to appropriate machine-specific agent
-    3. Execute machine agent with context
-    4. Track API usage
-    5. Return results
+# Deadline for the routing stage (the router agent, when the prompt isn't routed locally)
+ROUTING_TIMEOUT_SECONDS = float(os.getenv('DIGITONE_ROUTING_TIMEOUT_SECONDS', '20'))
 
-    Args:
-        user_prompt: The user's sound design request
-        api_key: API key for authentication and usage tracking
-        conn: Database connection for usage tracking
+# Time limit for each machine agent run; multi-track prompts run one per track concurrently
+MACHINE_AGENT_TIMEOUT_SECONDS = float(os.getenv('DIGITONE_MACHINE_AGENT_TIMEOUT_SECONDS', '90'))
 
-    Returns:
-        List of SynthGenieResponse or SynthGenieAmbiguousResponse objects
+AgentResponse = SynthGenieResponse | SynthGenieAmbiguousResponse
 
-    Raises:
-        HTTPException: For validation errors, routing errors, or agent failures
-    """
-    # Step 1: Validate the prompt
-    logger.info(f'Validating prompt: {user_prompt[:100]}...')
-    is_valid = await prompt_validation_agent(user_prompt)
-    if not is_valid:
-        raise HTTPException(status_code=422, detail='This prompt is not about sound design.')
 
-    # Step 2: Route to appropriate machine agent
-    try:
-        deps = DigitoneAgentDeps(api_key=api_key, conn=conn)
-        routing_decision = await route_to_machine(user_prompt, deps)
+async def _timed[T](awaitable: Awaitable[T]) -> tuple[T, float]:
+    """Await `awaitable` and return its result with the elapsed time in seconds."""
+    start = time.perf_counter()
+    result = await awaitable
+    return result, time.perf_counter() - start
 
-        logger.info(
-            f'Routed to {routing_decision.machine} on track {routing_decision.track}: {routing_decision.reasoning}'
-        )
 
+async def _route(user_prompt: str, deps: DigitoneAgentDeps) -> RoutingPlan:
+    """Run the router within the routing deadline and translate its failures into HTTP errors."""
+    try:
+        async with asyncio.timeout(ROUTING_TIMEOUT_SECONDS):
+            routing_plan = await route_to_machines(user_prompt, deps)
     except HTTPException:
-        # Re-raise HTTPExceptions from route_to_machine (e.g., input validation)
+        # Re-raise HTTPExceptions from route_to_machines (e.g., input validation)
         raise
     except ValidationError:
         raise HTTPException(status_code=422, detail='Invalid routing decision')
@@ -69,48 +79,368 @@ async def run_digitone_agent_workflow(
         logger.exception('Unexpected routing error')
         raise HTTPException(status_code=500, detail='Internal routing error')
 
-    # Step 3: Get the appropriate machine agent
-    machine_agents = {
-        'fm_tone': get_fm_tone_agent,
-        'fm_drum': get_fm_drum_agent,
-        'wavetone': get_wavetone_agent,
-        'swarmer': get_swarmer_agent,
-    }
+    for decision in routing_plan.decisions:
+        logger.info(f'Routed to {decision.machine} on track {decision.track}: {decision.reasoning}')
+    return routing_plan
 
-    agent_factory = machine_agents.get(routing_decision.machine)
-    if not agent_factory:
-        raise HTTPException(status_code=500, detail=f'Unknown machine type: {routing_decision.machine}')
 
-    agent = agent_factory()
+def _discard(task: asyncio.Task[Any]) -> None:
+    """Cancel a speculative task without leaving its outcome unretrieved."""
+    task.cancel()
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
 
-    # Step 4: Update dependencies with routed track
-    deps.default_midi_channel = routing_decision.track
 
-    # Step 5: Run the machine-specific agent
+async def validate_and_route(user_prompt: str, deps: DigitoneAgentDeps) -> RoutingPlan:
+    """
+    Validate the prompt and route it to a machine agent per track.
+
+    In speculative mode (the default, see `DIGITONE_SPECULATIVE_ROUTING`) routing starts
+    together with validation and is cancelled if validation rejects the prompt, so a valid
+    request pays for one LLM round trip instead of two before the machine agent starts.
+
+    Raises:
+        HTTPException: 422 if the prompt is not about sound design, 429 if validation and routing
+            exceed the prompt's budget, or any routing error
+    """
+    logger.info(f'Validating prompt: {user_prompt[:100]}...')
+
+    if not SPECULATIVE_ROUTING:
+        if not await prompt_validation_agent(user_prompt, deps.budget):
+            raise HTTPException(status_code=422, detail='This prompt is not about sound design.')
+        return await _route(user_prompt, deps)
+
+    start = time.perf_counter()
+    routing_task = asyncio.create_task(_timed(_route(user_prompt, deps)))
     try:
-        logger.info(f'Running {routing_decision.machine} agent on track {routing_decision.track}')
+        is_valid, validation_time = await _timed(prompt_validation_agent(user_prompt, deps.budget))
+    except BaseException:
+        _discard(routing_task)
+        raise
+
+    if not is_valid:
+        _discard(routing_task)
+        raise HTTPException(status_code=422, detail='This prompt is not about sound design.')
+
+    routing_plan, routing_time = await routing_task
+
+    elapsed = time.perf_counter() - start
+    saved = validation_time + routing_time - elapsed
+    logger.info(
+        f'Speculative routing saved {saved * 1000:.0f}ms '
+        f'(validation {validation_time * 1000:.0f}ms, routing {routing_time * 1000:.0f}ms, '
+        f'combined {elapsed * 1000:.0f}ms)'
+    )
+    return routing_plan
+
 
-        result = await agent.run(
-            routing_decision.original_prompt,
-            deps=deps,
-            model_settings={'temperature': 0.3},  # Lower temperature for more consistent tool usage
-        )
+MACHINE_AGENTS = {
+    'fm_tone': get_fm_tone_agent,
+    'fm_drum': get_fm_drum_agent,
+    'wavetone': get_wavetone_agent,
+    'swarmer': get_swarmer_agent,
+}
 
-        responses = result.output
-        logger.info(f'{routing_decision.machine} agent returned {len(responses)} responses')
 
-        # Step 6: Track API usage
-        track_api_key_usage(conn, api_key)
+def get_machine_agent(machine: str) -> Agent[DigitoneAgentDeps, list[SynthGenieResponse | SynthGenieAmbiguousResponse]]:
+    """Look up the shared agent for a routed machine."""
+    agent_factory = MACHINE_AGENTS.get(machine)
+    if not agent_factory:
+        raise HTTPException(status_code=500, detail=f'Unknown machine type: {machine}')
+    return agent_factory()
 
-        return responses
 
+@contextmanager
+def machine_agent_errors(machine: str) -> Iterator[None]:
+    """Translate machine agent failures into HTTP errors."""
+    try:
+        yield
     except ValidationError as e:
-        logger.error(f'Validation error in {routing_decision.machine} agent: {e}')
+        logger.error(f'Validation error in {machine} agent: {e}')
         raise HTTPException(status_code=422, detail='Agent produced invalid response')
-
     except TimeoutError:
         raise HTTPException(status_code=503, detail='Agent timeout - please try again')
-
+    except HTTPException:
+        raise
     except Exception:
-        logger.exception(f'Error in {routing_decision.machine} agent')
+        logger.exception(f'Error in {machine} agent')
         raise HTTPException(status_code=500, detail='Sound design agent failed')
+
+
+def select_machine_toolset(
+    decision: MachineRoutingDecision, context: str | None = None
+) -> tuple[AbstractToolset[Any], str]:
+    """
+    Build the toolset for a routed track from the sections its prompt needs, and the agent prompt.
+
+    A note on narrowed sections goes into the user prompt rather than the instructions, so the
+    system prompt stays identical across requests and remains in the provider's prompt cache.
+
+    Args:
+        decision: The routed track
+        context: Extra note for the agent prompt (e.g. the preset being refined), not used for section selection
+    """
+    sections = select_sections(decision.original_prompt, decision.machine)
+    logger.info(f'Selected {", ".join(sections)} tools for {decision.machine} on track {decision.track}')
+    notes = [note for note in (describe_sections(sections), context) if note]
+    prompt = '\n\n'.join([decision.original_prompt, *notes])
+    return create_dynamic_toolset(decision.machine, sections), prompt
+
+
+async def run_machine_agent(
+    decision: MachineRoutingDecision,
+    api_key: str,
+    budget: AgentBudget,
+    context: str | None = None,
+) -> list[AgentResponse]:
+    """Run the machine agent for one routed track, within the machine agent timeout and the prompt's budget."""
+    agent = get_machine_agent(decision.machine)
+    deps = DigitoneAgentDeps(default_midi_channel=decision.track, api_key=api_key, budget=budget)
+    toolset, prompt = select_machine_toolset(decision, context)
+
+    with machine_agent_errors(decision.machine):
+        logger.info(f'Running {decision.machine} agent on track {decision.track}')
+        async with asyncio.timeout(MACHINE_AGENT_TIMEOUT_SECONDS):
+            responses = await collect_tool_responses(
+                agent,
+                prompt,
+                deps=deps,
+                model_settings=MACHINE_AGENT_SETTINGS,
+                toolsets=[toolset],
+                **budget.run_kwargs(),
+            )
+
+    logger.info(f'{decision.machine} agent returned {len(responses)} responses')
+    return responses
+
+
+def _branch_failure(decision: MachineRoutingDecision, error: HTTPException) -> SynthGenieAmbiguousResponse:
+    return SynthGenieAmbiguousResponse(message=f'Track {decision.track} ({decision.machine}) failed: {error.detail}')
+
+
+async def run_machine_agents(routing_plan: RoutingPlan, api_key: str, budget: AgentBudget) -> list[AgentResponse]:
+    """
+    Run the machine agents of a routing plan concurrently and merge their responses in track order.
+
+    A failing track is reported as an ambiguous response rather than cancelling the other
+    tracks; if every track fails, the first failure is raised. The tracks share the prompt's
+    budget, and exceeding it fails the prompt with the responses of every track so far.
+
+    Raises:
+        HTTPException: If the plan has a single track that fails, or every track fails
+        AgentBudgetExceeded: If the machine agents exceed the prompt's budget
+    """
+    if len(routing_plan.decisions) == 1:
+        return await run_machine_agent(routing_plan.decisions[0], api_key, budget)
+
+    async def run_branch(decision: MachineRoutingDecision) -> list[AgentResponse] | HTTPException:
+        try:
+            return await run_machine_agent(decision, api_key, budget)
+        except HTTPException as e:
+            return e
+
+    async with asyncio.TaskGroup() as task_group:
+        tasks = [task_group.create_task(run_branch(decision)) for decision in routing_plan.decisions]
+
+    outcomes = sorted(zip(routing_plan.decisions, [task.result() for task in tasks]), key=lambda item: item[0].track)
+    exceeded = [outcome for _, outcome in outcomes if isinstance(outcome, AgentBudgetExceeded)]
+    if exceeded:
+        partial: list[AgentResponse] = []
+        for _, outcome in outcomes:
+            if isinstance(outcome, AgentBudgetExceeded):
+                partial.extend(outcome.responses)
+            elif not isinstance(outcome, HTTPException):
+                partial.extend(outcome)
+        raise AgentBudgetExceeded(exceeded[0].reason, partial)
+
+    failures = [outcome for _, outcome in outcomes if isinstance(outcome, HTTPException)]
+    if len(failures) == len(outcomes):
+        raise failures[0]
+
+    responses: list[AgentResponse] = []
+    for decision, outcome in outcomes:
+        responses.extend([_branch_failure(decision, outcome)] if isinstance(outcome, HTTPException) else outcome)
+    return responses
+
+
+async def stream_machine_agent(
+    decision: MachineRoutingDecision, api_key: str, budget: AgentBudget, context: str | None = None
+) -> AsyncIterator[AgentResponse]:
+    """Streaming counterpart of `run_machine_agent`."""
+    agent = get_machine_agent(decision.machine)
+    deps = DigitoneAgentDeps(default_midi_channel=decision.track, api_key=api_key, budget=budget)
+    toolset, prompt = select_machine_toolset(decision, context)
+
+    with machine_agent_errors(decision.machine):
+        logger.info(f'Streaming {decision.machine} agent on track {decision.track}')
+        async with asyncio.timeout(MACHINE_AGENT_TIMEOUT_SECONDS):
+            async for response in stream_tool_responses(
+                agent,
+                prompt,
+                deps=deps,
+                model_settings=MACHINE_AGENT_SETTINGS,
+                toolsets=[toolset],
+                **budget.run_kwargs(),
+            ):
+                yield response
+
+
+async def stream_machine_agents(
+    routing_plan: RoutingPlan, api_key: str, budget: AgentBudget
+) -> AsyncIterator[AgentResponse]:
+    """
+    Streaming counterpart of `run_machine_agents`: responses from all tracks are interleaved
+    in the order their tool calls complete.
+    """
+    if len(routing_plan.decisions) == 1:
+        async for response in stream_machine_agent(routing_plan.decisions[0], api_key, budget):
+            yield response
+        return
+
+    # Each branch reports a failure as an ambiguous response and ends with None
+    queue: asyncio.Queue[AgentResponse | None] = asyncio.Queue()
+
+    async def run_branch(decision: MachineRoutingDecision) -> None:
+        try:
+            async for response in stream_machine_agent(decision, api_key, budget):
+                await queue.put(response)
+        except HTTPException as e:
+            await queue.put(_branch_failure(decision, e))
+        await queue.put(None)
+
+    async with asyncio.TaskGroup() as task_group:
+        for decision in routing_plan.decisions:
+            task_group.create_task(run_branch(decision))
+
+        remaining = len(routing_plan.decisions)
+        while remaining:
+            item = await queue.get()
+            if item is None:
+                remaining -= 1
+            else:
+                yield item
+
+
+async def refine_preset(match: PresetMatch, api_key: str, budget: AgentBudget) -> list[AgentResponse]:
+    """
+    Run the machine agent on top of a matched preset and merge its changes over the preset.
+
+    The prompt names the machine and the archetype, so validation and routing are skipped.
+
+    Raises:
+        HTTPException: If the machine agent fails
+        AgentBudgetExceeded: If it exceeds the prompt's budget, with the preset and the changes so far
+    """
+    try:
+        refinements = await run_machine_agent(match.decision, api_key, budget, match.refinement_note())
+    except AgentBudgetExceeded as e:
+        raise AgentBudgetExceeded(e.reason, match.merge(e.responses))
+    return match.merge(refinements)
+
+
+async def stream_preset(match: PresetMatch, api_key: str, budget: AgentBudget) -> AsyncIterator[AgentResponse]:
+    """Streaming counterpart of `refine_preset`: the preset first, then the machine agent's changes as they come."""
+    for response in match.responses():
+        yield response
+    if match.exact:
+        return
+
+    async for response in stream_machine_agent(match.decision, api_key, budget, match.refinement_note()):
+        if match.is_delta(response):
+            yield response
+
+
+async def run_digitone_agent_workflow(
+    user_prompt: str, api_key: str, track_usage: bool = True, limits: UsageLimits | None = None
+) -> list[AgentResponse]:
+    """
+    Orchestrate the multi-agent Digitone sound design workflow.
+
+    Workflow:
+    0. Execute explicit parameter commands directly, without any agent, and answer common
+       archetypes ("piano with FM Tone") from the preset library, refining the preset with
+       the machine agent when the prompt asks for more
+    1. Validate prompt is about sound design
+    2. Route each track to its machine-specific agent (concurrently with step 1)
+    3. Execute the machine agents, one per track, concurrently
+    4. Track API usage
+    5. Return the merged results
+
+    Args:
+        user_prompt: The user's sound design request
+        api_key: API key for authentication and usage tracking
+        track_usage: Record the request against the API key (batches record usage once)
+        limits: The API key's per-prompt usage limits, looked up if None (batches look them up once)
+
+    Returns:
+        List of SynthGenieResponse or SynthGenieAmbiguousResponse objects
+
+    Steps 1-3 share the API key's per-prompt budget of model requests, tokens and tool calls.
+
+    Raises:
+        HTTPException: For validation errors, routing errors, or agent failures
+        AgentBudgetExceeded: If the agents exceed the prompt's budget, with the responses so far
+    """
+    # Step 0: Explicit parameter commands ("set filter cutoff to 80 on track 2") need no LLM
+    direct_responses = interpret_parameter_command(user_prompt)
+    if direct_responses is not None:
+        if track_usage:
+            usage_tracker.record(api_key)
+        return list(direct_responses)
+
+    # Common archetypes start from the preset library
+    preset_match = find_preset(user_prompt)
+    if preset_match is not None and preset_match.exact:
+        if track_usage:
+            usage_tracker.record(api_key)
+        return list(preset_match.responses())
+
+    if limits is None:
+        limits = await usage_limits_for_key(api_key)
+    deps = DigitoneAgentDeps(api_key=api_key, budget=AgentBudget(limits))
+    if preset_match is not None:
+        responses = await refine_preset(preset_match, api_key, deps.budget)
+    else:
+        # Steps 1-2: Validate the prompt and route each track to a machine agent
+        routing_plan = await validate_and_route(user_prompt, deps)
+
+        # Step 3: Run the machine-specific agents
+        responses = await run_machine_agents(routing_plan, api_key, deps.budget)
+
+    # Step 4: Track API usage
+    if track_usage:
+        usage_tracker.record(api_key)
+
+    return responses
+
+
+async def stream_digitone_agent_workflow(
+    user_prompt: str, api_key: str, limits: UsageLimits | None = None
+) -> AsyncIterator[AgentResponse]:
+    """
+    Streaming variant of `run_digitone_agent_workflow`.
+
+    Yields each parameter change as soon as a machine agent's tool call returns. Errors
+    before the first response are raised as HTTPException; usage tracking is left to the
+    caller.
+
+    Args:
+        user_prompt: The user's sound design request
+        api_key: API key passed on to the agent dependencies
+        limits: The API key's per-prompt usage limits, the defaults if None
+    """
+    direct_responses = interpret_parameter_command(user_prompt)
+    if direct_responses is not None:
+        for response in direct_responses:
+            yield response
+        return
+
+    budget = AgentBudget(limits or default_usage_limits())
+    preset_match = find_preset(user_prompt)
+    if preset_match is not None:
+        async for response in stream_preset(preset_match, api_key, budget):
+            yield response
+        return
+
+    routing_plan = await validate_and_route(user_prompt, DigitoneAgentDeps(api_key=api_key, budget=budget))
+    async for response in stream_machine_agents(routing_plan, api_key, budget):
+        yield response
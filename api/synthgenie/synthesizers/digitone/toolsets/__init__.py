@@ -0,0 +1,41 @@
+"""Section toolsets for the Elektron Digitone machine agents."""
+
+from .amp_toolset import AMP_KEYWORDS, amp_toolset
+from .euclidean_toolset import EUCLIDEAN_KEYWORDS, euclidean_toolset
+from .filter_toolset import FILTER_KEYWORDS, filter_toolset
+from .fm_drum_toolset import FM_DRUM_KEYWORDS, fm_drum_toolset
+from .fm_tone_toolset import FM_TONE_KEYWORDS, fm_tone_toolset
+from .fx_toolset import FX_KEYWORDS, fx_toolset
+from .lfo_toolset import LFO_KEYWORDS, lfo_toolset
+from .mixer_toolset import MIXER_KEYWORDS, mixer_toolset
+from .send_fx_toolset import SEND_FX_KEYWORDS, send_fx_toolset
+from .swarmer_toolset import SWARMER_KEYWORDS, swarmer_toolset
+from .trig_toolset import TRIG_KEYWORDS, trig_toolset
+from .wavetone_toolset import WAVETONE_KEYWORDS, wavetone_toolset
+
+__all__ = [
+    'amp_toolset',
+    'euclidean_toolset',
+    'filter_toolset',
+    'fm_drum_toolset',
+    'fm_tone_toolset',
+    'fx_toolset',
+    'lfo_toolset',
+    'mixer_toolset',
+    'send_fx_toolset',
+    'swarmer_toolset',
+    'trig_toolset',
+    'wavetone_toolset',
+    'AMP_KEYWORDS',
+    'EUCLIDEAN_KEYWORDS',
+    'FILTER_KEYWORDS',
+    'FM_DRUM_KEYWORDS',
+    'FM_TONE_KEYWORDS',
+    'FX_KEYWORDS',
+    'LFO_KEYWORDS',
+    'MIXER_KEYWORDS',
+    'SEND_FX_KEYWORDS',
+    'SWARMER_KEYWORDS',
+    'TRIG_KEYWORDS',
+    'WAVETONE_KEYWORDS',
+]
@@ -0,0 +1,52 @@
+"""Amp toolset for the Elektron Digitone: amp envelope, pan and volume."""
+
+from pydantic_ai.toolsets import FunctionToolset
+
+from synthgenie.synthesizers.digitone.tools.amp_fx_tool import (
+    set_amp_attack,
+    set_amp_decay,
+    set_amp_envelope_mode,
+    set_amp_envelope_reset,
+    set_amp_hold,
+    set_amp_pan,
+    set_amp_release,
+    set_amp_sustain,
+    set_amp_volume,
+)
+
+# Create Amp toolset with all tools
+amp_toolset = FunctionToolset(
+    tools=[
+        set_amp_attack,
+        set_amp_hold,
+        set_amp_decay,
+        set_amp_sustain,
+        set_amp_release,
+        set_amp_envelope_reset,
+        set_amp_envelope_mode,
+        set_amp_pan,
+        set_amp_volume,
+    ]
+)
+
+AMP_KEYWORDS = {
+    'amp',
+    'envelope',
+    'env',
+    'adsr',
+    'attack',
+    'hold',
+    'decay',
+    'sustain',
+    'release',
+    'pan',
+    'volume',
+    'loud',
+    'quiet',
+    'punch',
+    'pluck',
+    'snappy',
+    'short',
+    'long',
+    'tail',
+}
@@ -0,0 +1,36 @@
+"""Euclidean toolset for the Elektron Digitone: Euclidean sequencer."""
+
+from pydantic_ai.toolsets import FunctionToolset
+
+from synthgenie.synthesizers.digitone.tools.euclidean_tool import (
+    set_euclidean_boolean_operator,
+    set_euclidean_mode,
+    set_euclidean_pulse_gen1,
+    set_euclidean_pulse_gen2,
+    set_euclidean_rotation_gen1,
+    set_euclidean_rotation_gen2,
+    set_euclidean_track_rotation,
+)
+
+# Create Euclidean toolset with all tools
+euclidean_toolset = FunctionToolset(
+    tools=[
+        set_euclidean_pulse_gen1,
+        set_euclidean_pulse_gen2,
+        set_euclidean_mode,
+        set_euclidean_rotation_gen1,
+        set_euclidean_rotation_gen2,
+        set_euclidean_track_rotation,
+        set_euclidean_boolean_operator,
+    ]
+)
+
+EUCLIDEAN_KEYWORDS = {
+    'euclid',
+    'pulse',
+    'rotation',
+    'rotate',
+    'polyrhythm',
+    'rhythm',
+    'pattern generator',
+}
@@ -0,0 +1,52 @@
+"""Filter toolset for the Elektron Digitone: multi-mode filter and filter envelope."""
+
+from pydantic_ai.toolsets import FunctionToolset
+
+from synthgenie.synthesizers.digitone.tools.filter_tool import (
+    set_multi_mode_filter_attack,
+    set_multi_mode_filter_decay,
+    set_multi_mode_filter_envelope_depth,
+    set_multi_mode_filter_frequency,
+    set_multi_mode_filter_release,
+    set_multi_mode_filter_resonance,
+    set_multi_mode_filter_sustain,
+    set_multi_mode_filter_type,
+)
+
+# Create Filter toolset with all tools
+filter_toolset = FunctionToolset(
+    tools=[
+        set_multi_mode_filter_attack,
+        set_multi_mode_filter_decay,
+        set_multi_mode_filter_sustain,
+        set_multi_mode_filter_release,
+        set_multi_mode_filter_frequency,
+        set_multi_mode_filter_resonance,
+        set_multi_mode_filter_type,
+        set_multi_mode_filter_envelope_depth,
+    ]
+)
+
+FILTER_KEYWORDS = {
+    'filter',
+    'cutoff',
+    'frequency',
+    'resonance',
+    'reso',
+    'lowpass',
+    'low pass',
+    'highpass',
+    'high pass',
+    'bandpass',
+    'band pass',
+    'bright',
+    'dark',
+    'warm',
+    'muffled',
+    'dull',
+    'open',
+    'closed',
+    'sweep',
+    'envelope',
+    'env',
+}
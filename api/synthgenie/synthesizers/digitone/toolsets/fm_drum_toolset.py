@@ -0,0 +1,93 @@
+"""FM Drum toolset for the Elektron Digitone: FM Drum machine page."""
+
+from pydantic_ai.toolsets import FunctionToolset
+
+from synthgenie.synthesizers.digitone.tools.fm_drum_tool import (
+    set_fm_drum_algorithm,
+    set_fm_drum_body_decay,
+    set_fm_drum_body_hold,
+    set_fm_drum_body_level,
+    set_fm_drum_decay1,
+    set_fm_drum_decay2,
+    set_fm_drum_end1,
+    set_fm_drum_end2,
+    set_fm_drum_feedback,
+    set_fm_drum_fold,
+    set_fm_drum_mod1,
+    set_fm_drum_mod2,
+    set_fm_drum_noise_base,
+    set_fm_drum_noise_decay,
+    set_fm_drum_noise_grain,
+    set_fm_drum_noise_hold,
+    set_fm_drum_noise_level,
+    set_fm_drum_noise_reset,
+    set_fm_drum_noise_ring_mod,
+    set_fm_drum_noise_width,
+    set_fm_drum_op_ab_wave,
+    set_fm_drum_op_c_phase,
+    set_fm_drum_op_c_wave,
+    set_fm_drum_ratio1,
+    set_fm_drum_ratio2,
+    set_fm_drum_sweep_depth,
+    set_fm_drum_sweep_time,
+    set_fm_drum_transient,
+    set_fm_drum_transient_level,
+    set_fm_drum_tune,
+)
+
+# Create FM Drum toolset with all tools
+fm_drum_toolset = FunctionToolset(
+    tools=[
+        set_fm_drum_tune,
+        set_fm_drum_sweep_time,
+        set_fm_drum_sweep_depth,
+        set_fm_drum_algorithm,
+        set_fm_drum_op_c_wave,
+        set_fm_drum_op_ab_wave,
+        set_fm_drum_feedback,
+        set_fm_drum_fold,
+        set_fm_drum_ratio1,
+        set_fm_drum_decay1,
+        set_fm_drum_end1,
+        set_fm_drum_mod1,
+        set_fm_drum_ratio2,
+        set_fm_drum_decay2,
+        set_fm_drum_end2,
+        set_fm_drum_mod2,
+        set_fm_drum_body_hold,
+        set_fm_drum_body_decay,
+        set_fm_drum_op_c_phase,
+        set_fm_drum_body_level,
+        set_fm_drum_noise_reset,
+        set_fm_drum_noise_ring_mod,
+        set_fm_drum_noise_hold,
+        set_fm_drum_noise_decay,
+        set_fm_drum_transient,
+        set_fm_drum_transient_level,
+        set_fm_drum_noise_base,
+        set_fm_drum_noise_width,
+        set_fm_drum_noise_grain,
+        set_fm_drum_noise_level,
+    ]
+)
+
+FM_DRUM_KEYWORDS = {
+    'algorithm',
+    'operator',
+    'ratio',
+    'fold',
+    'feedback',
+    'fm',
+    'sweep',
+    'body',
+    'noise',
+    'transient',
+    'tune',
+    'pitch',
+    'punch',
+    'click',
+    'timbre',
+    'metallic',
+    'bright',
+    'dark',
+}
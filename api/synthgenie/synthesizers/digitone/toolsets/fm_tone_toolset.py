@@ -0,0 +1,90 @@
+"""FM Tone toolset for the Elektron Digitone: FM Tone machine page."""
+
+from pydantic_ai.toolsets import FunctionToolset
+
+from synthgenie.synthesizers.digitone.tools.fm_tone_tool import (
+    set_fm_tone_a_attack,
+    set_fm_tone_a_decay,
+    set_fm_tone_a_delay,
+    set_fm_tone_a_end,
+    set_fm_tone_a_key_track,
+    set_fm_tone_a_level,
+    set_fm_tone_a_ratio,
+    set_fm_tone_a_ratio_offset,
+    set_fm_tone_a_reset,
+    set_fm_tone_a_trigger,
+    set_fm_tone_algorithm,
+    set_fm_tone_b1_key_track,
+    set_fm_tone_b1_ratio_offset,
+    set_fm_tone_b2_key_track,
+    set_fm_tone_b2_ratio_offset,
+    set_fm_tone_b_attack,
+    set_fm_tone_b_decay,
+    set_fm_tone_b_delay,
+    set_fm_tone_b_end,
+    set_fm_tone_b_level,
+    set_fm_tone_b_ratio,
+    set_fm_tone_b_reset,
+    set_fm_tone_b_trigger,
+    set_fm_tone_c_ratio,
+    set_fm_tone_c_ratio_offset,
+    set_fm_tone_detune,
+    set_fm_tone_feedback,
+    set_fm_tone_harmonics,
+    set_fm_tone_mix,
+    set_fm_tone_phase_reset,
+)
+
+# Create FM Tone toolset with all tools
+fm_tone_toolset = FunctionToolset(
+    tools=[
+        set_fm_tone_algorithm,
+        set_fm_tone_c_ratio,
+        set_fm_tone_a_ratio,
+        set_fm_tone_b_ratio,
+        set_fm_tone_harmonics,
+        set_fm_tone_detune,
+        set_fm_tone_feedback,
+        set_fm_tone_mix,
+        set_fm_tone_a_attack,
+        set_fm_tone_a_decay,
+        set_fm_tone_a_end,
+        set_fm_tone_a_level,
+        set_fm_tone_b_attack,
+        set_fm_tone_b_decay,
+        set_fm_tone_b_end,
+        set_fm_tone_b_level,
+        set_fm_tone_a_delay,
+        set_fm_tone_a_trigger,
+        set_fm_tone_a_reset,
+        set_fm_tone_phase_reset,
+        set_fm_tone_b_delay,
+        set_fm_tone_b_trigger,
+        set_fm_tone_b_reset,
+        set_fm_tone_c_ratio_offset,
+        set_fm_tone_a_ratio_offset,
+        set_fm_tone_b1_ratio_offset,
+        set_fm_tone_b2_ratio_offset,
+        set_fm_tone_a_key_track,
+        set_fm_tone_b1_key_track,
+        set_fm_tone_b2_key_track,
+    ]
+)
+
+FM_TONE_KEYWORDS = {
+    'algorithm',
+    'operator',
+    'ratio',
+    'harmonic',
+    'feedback',
+    'fm',
+    'timbre',
+    'tone',
+    'detune',
+    'pitch',
+    'tune',
+    'bright',
+    'dark',
+    'metallic',
+    'bell',
+}
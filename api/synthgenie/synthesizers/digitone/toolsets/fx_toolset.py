@@ -0,0 +1,56 @@
+"""FX toolset for the Elektron Digitone: track effects and send levels."""
+
+from pydantic_ai.toolsets import FunctionToolset
+
+from synthgenie.synthesizers.digitone.tools.amp_fx_tool import (
+    set_fx_bit_reduction,
+    set_fx_chorus,
+    set_fx_delay,
+    set_fx_overdrive,
+    set_fx_overdrive_routing,
+    set_fx_reverb,
+    set_fx_sample_rate_reduction,
+    set_fx_sample_rate_routing,
+)
+
+# Create FX toolset with all tools
+fx_toolset = FunctionToolset(
+    tools=[
+        set_fx_bit_reduction,
+        set_fx_overdrive,
+        set_fx_sample_rate_reduction,
+        set_fx_sample_rate_routing,
+        set_fx_overdrive_routing,
+        set_fx_delay,
+        set_fx_reverb,
+        set_fx_chorus,
+    ]
+)
+
+FX_KEYWORDS = {
+    'fx',
+    'effect',
+    'overdrive',
+    'drive',
+    'distortion',
+    'distort',
+    'saturat',
+    'grit',
+    'dirty',
+    'bit',
+    'crush',
+    'lofi',
+    'lo-fi',
+    'sample rate',
+    'degrade',
+    'delay',
+    'echo',
+    'reverb',
+    'verb',
+    'space',
+    'room',
+    'hall',
+    'ambien',
+    'wet',
+    'chorus',
+}
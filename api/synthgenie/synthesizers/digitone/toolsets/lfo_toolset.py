@@ -0,0 +1,60 @@
+"""LFO toolset for the Elektron Digitone: LFO 1 and 2."""
+
+from pydantic_ai.toolsets import FunctionToolset
+
+from synthgenie.synthesizers.digitone.tools.lfo_tool import (
+    set_lfo1_depth,
+    set_lfo1_destination,
+    set_lfo1_fade,
+    set_lfo1_multiplier,
+    set_lfo1_speed,
+    set_lfo1_start_phase,
+    set_lfo1_trigger_mode,
+    set_lfo1_waveform,
+    set_lfo2_depth,
+    set_lfo2_destination,
+    set_lfo2_fade,
+    set_lfo2_multiplier,
+    set_lfo2_speed,
+    set_lfo2_start_phase,
+    set_lfo2_trigger_mode,
+    set_lfo2_waveform,
+)
+
+# Create LFO toolset with all tools
+lfo_toolset = FunctionToolset(
+    tools=[
+        set_lfo1_speed,
+        set_lfo1_multiplier,
+        set_lfo1_fade,
+        set_lfo1_destination,
+        set_lfo1_waveform,
+        set_lfo1_start_phase,
+        set_lfo1_trigger_mode,
+        set_lfo1_depth,
+        set_lfo2_speed,
+        set_lfo2_multiplier,
+        set_lfo2_fade,
+        set_lfo2_destination,
+        set_lfo2_waveform,
+        set_lfo2_start_phase,
+        set_lfo2_trigger_mode,
+        set_lfo2_depth,
+    ]
+)
+
+LFO_KEYWORDS = {
+    'lfo',
+    'modulat',
+    'wobble',
+    'vibrato',
+    'tremolo',
+    'movement',
+    'moving',
+    'evolv',
+    'pulsing',
+    'rhythmic',
+    'rate',
+    'speed',
+    'wah',
+}
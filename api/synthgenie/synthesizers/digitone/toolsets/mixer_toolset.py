@@ -0,0 +1,81 @@
+"""Mixer toolset for the Elektron Digitone: compressor, track, pattern and external input levels."""
+
+from pydantic_ai.toolsets import FunctionToolset
+
+from synthgenie.synthesizers.digitone.tools.misc_tool import (
+    set_master_overdrive,
+    set_pattern_mute,
+)
+from synthgenie.synthesizers.digitone.tools.mixer_tool import (
+    set_compressor_attack_time,
+    set_compressor_dry_wet_mix,
+    set_compressor_makeup_gain,
+    set_compressor_ratio,
+    set_compressor_release_time,
+    set_compressor_sidechain_filter,
+    set_compressor_sidechain_source,
+    set_compressor_threshold,
+    set_external_input_dual_mono,
+    set_external_input_l_chorus_send,
+    set_external_input_l_delay_send,
+    set_external_input_l_level,
+    set_external_input_l_pan,
+    set_external_input_l_reverb_send,
+    set_external_input_r_chorus_send,
+    set_external_input_r_delay_send,
+    set_external_input_r_level,
+    set_external_input_r_pan,
+    set_external_input_r_reverb_send,
+    set_pattern_volume,
+)
+from synthgenie.synthesizers.digitone.tools.track_tool import (
+    set_track_level,
+    set_track_mute,
+)
+
+# Create Mixer toolset with all tools
+mixer_toolset = FunctionToolset(
+    tools=[
+        set_compressor_threshold,
+        set_compressor_attack_time,
+        set_compressor_release_time,
+        set_compressor_makeup_gain,
+        set_compressor_ratio,
+        set_compressor_sidechain_source,
+        set_compressor_sidechain_filter,
+        set_compressor_dry_wet_mix,
+        set_pattern_volume,
+        set_external_input_dual_mono,
+        set_external_input_l_level,
+        set_external_input_l_pan,
+        set_external_input_r_level,
+        set_external_input_r_pan,
+        set_external_input_l_delay_send,
+        set_external_input_r_delay_send,
+        set_external_input_l_reverb_send,
+        set_external_input_r_reverb_send,
+        set_external_input_l_chorus_send,
+        set_external_input_r_chorus_send,
+        set_track_mute,
+        set_track_level,
+        set_pattern_mute,
+        set_master_overdrive,
+    ]
+)
+
+MIXER_KEYWORDS = {
+    'mixer',
+    'mix',
+    'compress',
+    'compressor',
+    'sidechain',
+    'side-chain',
+    'pump',
+    'glue',
+    'level',
+    'mute',
+    'unmute',
+    'external input',
+    'master',
+    'pattern volume',
+}
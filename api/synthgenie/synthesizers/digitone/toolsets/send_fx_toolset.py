@@ -0,0 +1,74 @@
+"""Send FX toolset for the Elektron Digitone: global delay, reverb and chorus settings."""
+
+from pydantic_ai.toolsets import FunctionToolset
+
+from synthgenie.synthesizers.digitone.tools.send_fx_tool import (
+    set_chorus_delay_send,
+    set_chorus_depth,
+    set_chorus_highpass_filter,
+    set_chorus_mix_volume,
+    set_chorus_reverb_send,
+    set_chorus_speed,
+    set_chorus_width,
+    set_delay_feedback,
+    set_delay_highpass_filter,
+    set_delay_lowpass_filter,
+    set_delay_mix_volume,
+    set_delay_pingpong,
+    set_delay_reverb_send,
+    set_delay_stereo_width,
+    set_delay_time,
+    set_reverb_decay_time,
+    set_reverb_highpass_filter,
+    set_reverb_lowpass_filter,
+    set_reverb_mix_volume,
+    set_reverb_predelay,
+    set_reverb_shelving_freq,
+    set_reverb_shelving_gain,
+)
+
+# Create Send FX toolset with all tools
+send_fx_toolset = FunctionToolset(
+    tools=[
+        set_delay_time,
+        set_delay_pingpong,
+        set_delay_stereo_width,
+        set_delay_feedback,
+        set_delay_highpass_filter,
+        set_delay_lowpass_filter,
+        set_delay_reverb_send,
+        set_delay_mix_volume,
+        set_reverb_predelay,
+        set_reverb_decay_time,
+        set_reverb_shelving_freq,
+        set_reverb_shelving_gain,
+        set_reverb_highpass_filter,
+        set_reverb_lowpass_filter,
+        set_reverb_mix_volume,
+        set_chorus_depth,
+        set_chorus_speed,
+        set_chorus_highpass_filter,
+        set_chorus_width,
+        set_chorus_delay_send,
+        set_chorus_reverb_send,
+        set_chorus_mix_volume,
+    ]
+)
+
+SEND_FX_KEYWORDS = {
+    'delay',
+    'echo',
+    'ping',
+    'pingpong',
+    'reverb',
+    'verb',
+    'space',
+    'room',
+    'hall',
+    'ambien',
+    'decay time',
+    'predelay',
+    'pre-delay',
+    'chorus',
+    'shimmer',
+}
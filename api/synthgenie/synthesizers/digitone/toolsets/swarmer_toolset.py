@@ -0,0 +1,46 @@
+"""Swarmer toolset for the Elektron Digitone: Swarmer machine page."""
+
+from pydantic_ai.toolsets import FunctionToolset
+
+from synthgenie.synthesizers.digitone.tools.swarmer_tool import (
+    set_swarmer_animation,
+    set_swarmer_detune,
+    set_swarmer_main,
+    set_swarmer_main_octave,
+    set_swarmer_mix,
+    set_swarmer_noise_mod,
+    set_swarmer_swarm,
+    set_swarmer_tune,
+)
+
+# Create Swarmer toolset with all tools
+swarmer_toolset = FunctionToolset(
+    tools=[
+        set_swarmer_tune,
+        set_swarmer_swarm,
+        set_swarmer_detune,
+        set_swarmer_mix,
+        set_swarmer_main_octave,
+        set_swarmer_main,
+        set_swarmer_animation,
+        set_swarmer_noise_mod,
+    ]
+)
+
+SWARMER_KEYWORDS = {
+    'swarm',
+    'detune',
+    'unison',
+    'supersaw',
+    'oscillator',
+    'osc',
+    'wave',
+    'animation',
+    'noise',
+    'pitch',
+    'tune',
+    'octave',
+    'timbre',
+    'thick',
+    'wide',
+}
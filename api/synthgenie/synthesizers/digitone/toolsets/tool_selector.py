@@ -0,0 +1,229 @@
+"""Per-prompt toolset selection for the Digitone machine agents.
+
+Each machine agent used to receive every machine, filter, amp, FX and LFO tool schema on every
+request. Narrow prompts ("add some reverb") only need a section or two, so the prompt's
+keywords pick the sections and only their tools are sent, cutting input tokens and time to
+first token. Prompts asking for a whole sound, or matching no section, get the full default set.
+"""
+
+import logging
+import os
+import re
+from collections.abc import Iterable, Mapping
+from functools import cache
+from typing import Any, Literal
+
+from pydantic_ai.toolsets import AbstractToolset, FunctionToolset
+
+from synthgenie.synthesizers.digitone.agents.shared import MachineName
+from synthgenie.synthesizers.digitone.toolsets import (
+    AMP_KEYWORDS,
+    EUCLIDEAN_KEYWORDS,
+    FILTER_KEYWORDS,
+    FM_DRUM_KEYWORDS,
+    FM_TONE_KEYWORDS,
+    FX_KEYWORDS,
+    LFO_KEYWORDS,
+    MIXER_KEYWORDS,
+    SEND_FX_KEYWORDS,
+    SWARMER_KEYWORDS,
+    TRIG_KEYWORDS,
+    WAVETONE_KEYWORDS,
+    amp_toolset,
+    euclidean_toolset,
+    filter_toolset,
+    fm_drum_toolset,
+    fm_tone_toolset,
+    fx_toolset,
+    lfo_toolset,
+    mixer_toolset,
+    send_fx_toolset,
+    swarmer_toolset,
+    trig_toolset,
+    wavetone_toolset,
+)
+from synthgenie.synthesizers.shared.agents.prompt_cache import stable_toolset
+from synthgenie.synthesizers.shared.parameters import BATCH_PARAMETER_TOOL, create_parameter_toolset
+
+logger = logging.getLogger(__name__)
+
+# Select sections per prompt; when disabled every agent gets the default sections
+DYNAMIC_TOOLSETS = os.getenv('DIGITONE_DYNAMIC_TOOLSETS', 'true').lower() == 'true'
+
+Section = Literal['machine', 'filter', 'amp', 'fx', 'lfo', 'mixer', 'send_fx', 'euclidean', 'trig']
+
+# The sections every machine agent had before per-prompt selection
+DEFAULT_SECTIONS: tuple[Section, ...] = ('machine', 'filter', 'amp', 'fx', 'lfo')
+
+SECTION_LABELS: dict[Section, str] = {
+    'machine': 'machine page',
+    'filter': 'filter',
+    'amp': 'amp envelope',
+    'fx': 'track FX',
+    'lfo': 'LFO',
+    'mixer': 'mixer',
+    'send_fx': 'send FX',
+    'euclidean': 'Euclidean sequencer',
+    'trig': 'trig',
+}
+
+MACHINE_TOOLSETS: dict[MachineName, FunctionToolset[Any]] = {
+    'fm_tone': fm_tone_toolset,
+    'fm_drum': fm_drum_toolset,
+    'wavetone': wavetone_toolset,
+    'swarmer': swarmer_toolset,
+}
+
+MACHINE_KEYWORDS: dict[MachineName, set[str]] = {
+    'fm_tone': FM_TONE_KEYWORDS,
+    'fm_drum': FM_DRUM_KEYWORDS,
+    'wavetone': WAVETONE_KEYWORDS,
+    'swarmer': SWARMER_KEYWORDS,
+}
+
+SECTION_TOOLSETS: dict[Section, FunctionToolset[Any]] = {
+    'filter': filter_toolset,
+    'amp': amp_toolset,
+    'fx': fx_toolset,
+    'lfo': lfo_toolset,
+    'mixer': mixer_toolset,
+    'send_fx': send_fx_toolset,
+    'euclidean': euclidean_toolset,
+    'trig': trig_toolset,
+}
+
+SECTION_KEYWORDS: dict[Section, set[str]] = {
+    'filter': FILTER_KEYWORDS,
+    'amp': AMP_KEYWORDS,
+    'fx': FX_KEYWORDS,
+    'lfo': LFO_KEYWORDS,
+    'mixer': MIXER_KEYWORDS,
+    'send_fx': SEND_FX_KEYWORDS,
+    'euclidean': EUCLIDEAN_KEYWORDS,
+    'trig': TRIG_KEYWORDS,
+}
+
+# Requests for a whole sound rather than a tweak to part of one
+FULL_DESIGN_KEYWORDS = {
+    'design',
+    'create',
+    'patch',
+    'preset',
+    'sound',
+    'bass',
+    'lead',
+    'pad',
+    'pluck',
+    'kick',
+    'snare',
+    'hat',
+    'hihat',
+    'hi-hat',
+    'tom',
+    'clap',
+    'cymbal',
+    'rim',
+    'drum',
+    'perc',
+    'keys',
+    'piano',
+    'organ',
+    'bell',
+    'string',
+    'brass',
+    'choir',
+    'drone',
+    'arp',
+    'chord',
+    'texture',
+    'stab',
+    'sub',
+}
+
+
+def _keyword_pattern(keywords: Iterable[str]) -> re.Pattern[str]:
+    """Match any keyword at the start of a word, so 'modulat' also matches 'modulation'."""
+    alternatives = '|'.join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))
+    return re.compile(rf'\b(?:{alternatives})')
+
+
+_FULL_DESIGN_PATTERN = _keyword_pattern(FULL_DESIGN_KEYWORDS)
+_SECTION_PATTERNS: dict[Section, re.Pattern[str]] = {
+    section: _keyword_pattern(keywords) for section, keywords in SECTION_KEYWORDS.items()
+}
+_MACHINE_PATTERNS: dict[MachineName, re.Pattern[str]] = {
+    machine: _keyword_pattern(keywords) for machine, keywords in MACHINE_KEYWORDS.items()
+}
+
+
+def select_sections(user_prompt: str, machine: MachineName) -> list[Section]:
+    """
+    Pick the toolset sections a prompt needs.
+
+    Args:
+        user_prompt: The (per-track) prompt for the machine agent
+        machine: The machine the prompt was routed to, whose page has its own keywords
+
+    Returns:
+        The matched sections, plus the default sections for whole-sound requests or
+        prompts that match no section
+    """
+    if not DYNAMIC_TOOLSETS:
+        return list(DEFAULT_SECTIONS)
+
+    prompt = user_prompt.lower()
+    matched: list[Section] = []
+    if _MACHINE_PATTERNS[machine].search(prompt):
+        matched.append('machine')
+    matched.extend(section for section, pattern in _SECTION_PATTERNS.items() if pattern.search(prompt))
+
+    if not matched or _FULL_DESIGN_PATTERN.search(prompt):
+        matched = list(DEFAULT_SECTIONS) + [section for section in matched if section not in DEFAULT_SECTIONS]
+    return matched
+
+
+def _section_toolsets(machine: MachineName, sections: Iterable[Section]) -> list[FunctionToolset[Any]]:
+    toolsets: Mapping[Section, FunctionToolset[Any]] = {'machine': MACHINE_TOOLSETS[machine], **SECTION_TOOLSETS}
+    return [toolsets[section] for section in sections]
+
+
+@cache
+def _parameter_toolset(machine: MachineName, sections: tuple[Section, ...]) -> FunctionToolset[Any]:
+    """The `set_parameters` toolset for a machine and sections, built once per combination."""
+    tools = [tool.function for toolset in _section_toolsets(machine, sections) for tool in toolset.tools.values()]
+    return create_parameter_toolset(tools)
+
+
+def create_dynamic_toolset(
+    machine: MachineName, sections: Iterable[Section], batch: bool = BATCH_PARAMETER_TOOL
+) -> AbstractToolset[Any]:
+    """Create a combined toolset from the machine's page and the selected sections.
+
+    Args:
+        machine: The machine whose page the `machine` section refers to
+        sections: Section names to include
+        batch: Offer the sections' parameters through one `set_parameters` tool
+
+    Returns:
+        Combined toolset containing only the selected tools, sorted by name for prompt caching
+    """
+    if batch:
+        return stable_toolset([_parameter_toolset(machine, tuple(sections))])
+    return stable_toolset(_section_toolsets(machine, sections))
+
+
+def describe_sections(sections: Iterable[Section]) -> str | None:
+    """
+    A prompt note naming the available sections, or None when the full default set is used.
+
+    Machine agent system prompts ask for complete sound designs, so a narrowed toolset needs
+    the model told to stick to the sections it has.
+    """
+    sections = list(sections)
+    if set(DEFAULT_SECTIONS) <= set(sections):
+        return None
+    labels = ', '.join(SECTION_LABELS[section] for section in sections)
+    return (
+        f'Only the {labels} parameters are available for this request. '
+        'Set the ones the request asks for and leave the rest of the sound unchanged.'
+    )
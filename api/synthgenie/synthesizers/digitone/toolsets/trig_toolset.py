@@ -0,0 +1,38 @@
+"""Trig toolset for the Elektron Digitone: trig note, velocity, length and portamento."""
+
+from pydantic_ai.toolsets import FunctionToolset
+
+from synthgenie.synthesizers.digitone.tools.trig_tool import (
+    set_filter_trig,
+    set_lfo_trig,
+    set_portamento_on_off,
+    set_portamento_time,
+    set_trig_length,
+    set_trig_note,
+    set_trig_velocity,
+)
+
+# Create Trig toolset with all tools
+trig_toolset = FunctionToolset(
+    tools=[
+        set_trig_note,
+        set_trig_velocity,
+        set_trig_length,
+        set_filter_trig,
+        set_lfo_trig,
+        set_portamento_time,
+        set_portamento_on_off,
+    ]
+)
+
+TRIG_KEYWORDS = {
+    'trig',
+    'note',
+    'velocity',
+    'length',
+    'gate',
+    'portamento',
+    'glide',
+    'legato',
+    'slide',
+}
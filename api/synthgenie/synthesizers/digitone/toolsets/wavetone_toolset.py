@@ -0,0 +1,76 @@
+"""Wavetone toolset for the Elektron Digitone: Wavetone machine page."""
+
+from pydantic_ai.toolsets import FunctionToolset
+
+from synthgenie.synthesizers.digitone.tools.wavetone_tool import (
+    set_wavetone_attack,
+    set_wavetone_decay,
+    set_wavetone_drift,
+    set_wavetone_hold,
+    set_wavetone_mod_type,
+    set_wavetone_noise_base,
+    set_wavetone_noise_character,
+    set_wavetone_noise_level,
+    set_wavetone_noise_type,
+    set_wavetone_noise_width,
+    set_wavetone_osc1_level,
+    set_wavetone_osc1_offset,
+    set_wavetone_osc1_phase_distortion,
+    set_wavetone_osc1_pitch,
+    set_wavetone_osc1_table,
+    set_wavetone_osc1_waveform,
+    set_wavetone_osc2_level,
+    set_wavetone_osc2_offset,
+    set_wavetone_osc2_phase_distortion,
+    set_wavetone_osc2_pitch,
+    set_wavetone_osc2_table,
+    set_wavetone_osc2_waveform,
+    set_wavetone_reset_mode,
+)
+
+# Create Wavetone toolset with all tools
+wavetone_toolset = FunctionToolset(
+    tools=[
+        set_wavetone_osc1_pitch,
+        set_wavetone_osc1_waveform,
+        set_wavetone_osc1_phase_distortion,
+        set_wavetone_osc1_level,
+        set_wavetone_osc1_offset,
+        set_wavetone_osc1_table,
+        set_wavetone_osc2_pitch,
+        set_wavetone_osc2_waveform,
+        set_wavetone_osc2_phase_distortion,
+        set_wavetone_osc2_level,
+        set_wavetone_osc2_offset,
+        set_wavetone_osc2_table,
+        set_wavetone_mod_type,
+        set_wavetone_reset_mode,
+        set_wavetone_drift,
+        set_wavetone_attack,
+        set_wavetone_hold,
+        set_wavetone_decay,
+        set_wavetone_noise_level,
+        set_wavetone_noise_base,
+        set_wavetone_noise_width,
+        set_wavetone_noise_type,
+        set_wavetone_noise_character,
+    ]
+)
+
+WAVETONE_KEYWORDS = {
+    'oscillator',
+    'osc',
+    'wave',
+    'wavetable',
+    'table',
+    'pitch',
+    'tune',
+    'detune',
+    'phase distortion',
+    'pd',
+    'noise',
+    'sync',
+    'timbre',
+    'bright',
+    'dark',
+}
@@ -0,0 +1,166 @@
+"""Deterministic stand-in models for load testing without provider calls.
+
+With `AGENT_LOAD_TEST=true` every agent stage gets a local `FunctionModel` instead of its
+provider model (see `stage_model`). Each model request sleeps for a latency drawn from the
+stage's distribution, then follows a fixed script:
+
+- the first turn of an agent with tools calls `LOAD_TEST_TOOL_CALLS` of them, spread evenly
+  over the tools it was offered, with arguments generated from their schemas;
+- otherwise it returns output generated from the output schema: validation passes, routing
+  and tool selection return a valid plan, and sound design restates its tool results.
+
+Token usage is estimated from the message sizes as for pydantic-ai's other test models, so
+budgets, usage reporting and everything else on the request path (auth, database, caches,
+streaming) behave as in production. `benchmarks/load_test.py` drives the API in this mode.
+"""
+
+import asyncio
+import math
+import os
+import random
+from dataclasses import dataclass
+from typing import Any, cast
+
+from pydantic import BaseModel
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    RetryPromptPart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+)
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.tools import ToolDefinition
+
+LOAD_TEST_MODE = os.getenv('AGENT_LOAD_TEST', 'false').lower() == 'true'
+# 'lognormal' (long tail, like provider latency), 'uniform' or 'fixed'
+LOAD_TEST_LATENCY_DISTRIBUTION = os.getenv('LOAD_TEST_LATENCY_DISTRIBUTION', 'lognormal')
+# Spread: sigma of the lognormal, or the relative half-width of the uniform distribution
+LOAD_TEST_LATENCY_SIGMA = float(os.getenv('LOAD_TEST_LATENCY_SIGMA', '0.5'))
+LOAD_TEST_TOOL_CALLS = int(os.getenv('LOAD_TEST_TOOL_CALLS', '8'))
+LOAD_TEST_SEED = int(os.getenv('LOAD_TEST_SEED', '0'))
+
+# Median latency per model request of each stage, overridden with e.g. `LOAD_TEST_ROUTING_LATENCY_MS`
+DEFAULT_LATENCY_MS = {'validation': 400, 'routing': 600, 'tool_selection': 600, 'sound_design': 3000}
+
+_random = random.Random(LOAD_TEST_SEED)
+
+
+def latency_ms(stage: str) -> float:
+    """Median model latency of a stage in milliseconds."""
+    return float(os.getenv(f'LOAD_TEST_{stage.upper()}_LATENCY_MS', DEFAULT_LATENCY_MS.get(stage, 1000)))
+
+
+def sample_latency(stage: str) -> float:
+    """Draw the latency of one model request of a stage, in seconds."""
+    median = latency_ms(stage) / 1000
+    if median <= 0 or LOAD_TEST_LATENCY_DISTRIBUTION == 'fixed':
+        return max(median, 0.0)
+    if LOAD_TEST_LATENCY_DISTRIBUTION == 'uniform':
+        return max(_random.uniform(median * (1 - LOAD_TEST_LATENCY_SIGMA), median * (1 + LOAD_TEST_LATENCY_SIGMA)), 0.0)
+    return _random.lognormvariate(math.log(median), LOAD_TEST_LATENCY_SIGMA)
+
+
+def sample_value(schema: dict[str, Any], defs: dict[str, Any]) -> Any:
+    """
+    Generate a value valid for a JSON schema, the same one every time.
+
+    Examples and defaults are preferred, so e.g. toolset selections name real toolsets.
+
+    Args:
+        schema: The (sub)schema
+        defs: The `$defs` of the root schema, for `$ref`s
+    """
+    if '$ref' in schema:
+        return sample_value(defs[schema['$ref'].rsplit('/', 1)[-1]], defs)
+    for key in ('const', 'default'):
+        if key in schema:
+            return schema[key]
+    if schema.get('examples'):
+        return schema['examples'][0]
+    if schema.get('enum'):
+        return schema['enum'][0]
+    for key in ('anyOf', 'oneOf', 'allOf'):
+        if schema.get(key):
+            return sample_value(schema[key][0], defs)
+
+    match schema.get('type'):
+        case 'object':
+            properties: dict[str, Any] = schema.get('properties', {})
+            return {name: sample_value(properties[name], defs) for name in schema.get('required', [])}
+        case 'array':
+            return [sample_value(schema.get('items', {}), defs) for _ in range(max(schema.get('minItems', 1), 1))]
+        case 'integer' | 'number':
+            low, high = schema.get('minimum'), schema.get('maximum')
+            value = (low + high) / 2 if low is not None and high is not None else low if low is not None else 1
+            return int(value) if schema['type'] == 'integer' else value
+        case 'boolean':
+            return True
+        case 'string':
+            return 'load test'
+        case _:
+            return None
+
+
+def _arguments(tool: ToolDefinition) -> dict[str, Any]:
+    schema = tool.parameters_json_schema
+    return sample_value(schema, schema.get('$defs', {}))
+
+
+def _tool_returns(messages: list[ModelMessage]) -> list[ToolReturnPart | RetryPromptPart]:
+    return [
+        part
+        for message in messages
+        if isinstance(message, ModelRequest)
+        for part in message.parts
+        if isinstance(part, ToolReturnPart | RetryPromptPart)
+    ]
+
+
+def _restated(returns: list[ToolReturnPart | RetryPromptPart]) -> list[Any]:
+    """The tool results a sound design agent repeats in its final output."""
+    items: list[Any] = []
+    for part in returns:
+        if isinstance(part, ToolReturnPart):
+            content: Any = part.content
+            items.extend(cast(list[Any], content) if isinstance(content, list) else [content])
+    return [item.model_dump(exclude_none=True) for item in items if isinstance(item, BaseModel)]
+
+
+@dataclass
+class LoadTestScript:
+    """The scripted responses of one stage's stand-in model."""
+
+    stage: str
+
+    async def respond(self, messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        await asyncio.sleep(sample_latency(self.stage))
+
+        returns = _tool_returns(messages)
+        if info.function_tools and not returns and LOAD_TEST_TOOL_CALLS > 0:
+            tools = sorted(info.function_tools, key=lambda tool: tool.name)
+            count = min(LOAD_TEST_TOOL_CALLS, len(tools))
+            chosen = [tools[i * len(tools) // count] for i in range(count)]
+            return ModelResponse(parts=[ToolCallPart(tool.name, _arguments(tool)) for tool in chosen])
+
+        if not info.output_tools:
+            return ModelResponse(parts=[TextPart('Load test response')])
+
+        output_tool = info.output_tools[0]
+        arguments = _arguments(output_tool)
+        response_schema = output_tool.parameters_json_schema.get('properties', {}).get('response', {})
+        if returns and response_schema.get('type') == 'array':
+            arguments['response'] = _restated(returns)
+        return ModelResponse(parts=[ToolCallPart(output_tool.name, arguments)])
+
+
+def load_test_model(stage: str) -> FunctionModel:
+    """
+    The deterministic stand-in model of an agent stage.
+
+    Args:
+        stage: The stage, which picks its latency (`LOAD_TEST_<STAGE>_LATENCY_MS`)
+    """
+    return FunctionModel(LoadTestScript(stage).respond, model_name=f'load-test:{stage}')
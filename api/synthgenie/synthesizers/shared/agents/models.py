@@ -0,0 +1,81 @@
+"""Model assignment per agent stage.
+
+The classification stages (prompt validation, Digitone routing, Sub 37 tool selection) return
+a boolean or a small structured choice and run on every prompt, so they default to a small,
+fast model; only the sound design agents, which make the actual parameter changes, default
+to a large one. Each stage can be set with its own variable. `AGENT_MODEL`, which deployments
+set before stages had their own models, only stands in for `AGENT_SOUND_DESIGN_MODEL`, so the
+classification stages stay on the small tier unless set explicitly.
+
+Models are read when an agent is built, so changing them takes `agent_registry.clear()`.
+
+With `AGENT_LOAD_TEST=true` every stage gets its deterministic local stand-in instead, see
+`load_test.py`.
+"""
+
+import os
+from typing import Literal
+
+from pydantic_ai.models import Model
+
+from synthgenie.synthesizers.shared.agents.load_test import LOAD_TEST_MODE, load_test_model
+
+Stage = Literal['validation', 'routing', 'tool_selection', 'sound_design']
+
+STAGES: tuple[Stage, ...] = ('validation', 'routing', 'tool_selection', 'sound_design')
+
+STAGE_MODEL_VARIABLES: dict[Stage, str] = {
+    'validation': 'AGENT_VALIDATION_MODEL',
+    'routing': 'AGENT_ROUTING_MODEL',
+    'tool_selection': 'AGENT_TOOL_SELECTION_MODEL',
+    'sound_design': 'AGENT_SOUND_DESIGN_MODEL',
+}
+
+SMALL_MODEL = 'openai:gpt-4.1-mini'
+LARGE_MODEL = 'openai:gpt-4.1'
+
+DEFAULT_STAGE_MODELS: dict[Stage, str] = {
+    'validation': SMALL_MODEL,
+    'routing': SMALL_MODEL,
+    'tool_selection': SMALL_MODEL,
+    'sound_design': LARGE_MODEL,
+}
+
+
+def stage_model_name(stage: Stage) -> str:
+    """
+    The model for an agent stage: its own variable, else the stage's default tier.
+
+    `AGENT_MODEL` comes before the default tier for the sound design stage only.
+
+    Args:
+        stage: The stage the agent runs in
+    """
+    if LOAD_TEST_MODE:
+        return f'load-test:{stage}'
+    model = os.getenv(STAGE_MODEL_VARIABLES[stage])
+    if not model and stage == 'sound_design':
+        model = os.getenv('AGENT_MODEL')
+    return model or DEFAULT_STAGE_MODELS[stage]
+
+
+def stage_model(stage: Stage) -> Model | str:
+    """
+    The model to build an agent stage with: its model name, or its stand-in in load-test mode.
+
+    Args:
+        stage: The stage the agent runs in
+    """
+    if LOAD_TEST_MODE:
+        return load_test_model(stage)
+    return stage_model_name(stage)
+
+
+def stage_models() -> dict[Stage, str]:
+    """The model of every stage, e.g. for cache keys and metrics."""
+    return {stage: stage_model_name(stage) for stage in STAGES}
+
+
+def models_fingerprint() -> str:
+    """One string naming every stage's model, changing whenever any of them does."""
+    return ','.join(f'{stage}={model}' for stage, model in stage_models().items())
@@ -0,0 +1,139 @@
+"""Provider prompt caching for the registered agents.
+
+Each agent request starts with the same tool definitions and system prompt (the shared sound
+design principles plus the machine guide), and that prefix dominates input tokens and time to
+first token. Providers only reuse a cached prefix that is byte-identical, so the prefix is kept
+stable: system prompts are static strings built once per process by the agent registry, and
+per-request toolsets are sent sorted by tool name whatever order they were selected in.
+
+Anthropic needs explicit cache breakpoints, added here as model settings. OpenAI and Gemini
+cache long prefixes automatically. Every model response is recorded through
+`UsageRecordingModel` so cached versus uncached input tokens are reported per request, and
+latency, cost, tool calls and retries per agent stage.
+"""
+
+import logging
+import os
+import time
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, RetryPromptPart
+from pydantic_ai.models import Model, ModelRequestParameters, StreamedResponse
+from pydantic_ai.models.anthropic import AnthropicModelSettings
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.settings import ModelSettings, merge_model_settings
+from pydantic_ai.tools import RunContext
+from pydantic_ai.toolsets import AbstractToolset, CombinedToolset, ToolsetTool, WrapperToolset
+
+from synthgenie.metrics.token_usage import record_model_usage
+
+logger = logging.getLogger(__name__)
+
+PROMPT_CACHE_ENABLED = os.getenv('PROMPT_CACHE_ENABLED', 'true').lower() == 'true'
+# Anthropic cache lifetime: '5m' (default) or '1h' (higher write cost, survives quiet periods)
+PROMPT_CACHE_TTL: Literal['5m', '1h'] = '1h' if os.getenv('PROMPT_CACHE_TTL', '5m') == '1h' else '5m'
+
+
+def prompt_cache_settings(model: Model) -> ModelSettings:
+    """
+    Provider-specific settings that cache the tool definitions and system prompt.
+
+    Args:
+        model: The agent's model; its `system` names the provider
+    """
+    if not PROMPT_CACHE_ENABLED:
+        return {}
+    if model.system == 'anthropic':
+        return AnthropicModelSettings(
+            anthropic_cache_tool_definitions=PROMPT_CACHE_TTL,
+            anthropic_cache_instructions=PROMPT_CACHE_TTL,
+        )
+    # OpenAI and Gemini cache prompt prefixes implicitly
+    return {}
+
+
+@dataclass(init=False)
+class UsageRecordingModel(WrapperModel):
+    """Model wrapper recording each response's usage and latency, per request and per agent stage."""
+
+    stage: str
+
+    def __init__(self, wrapped: Model, stage: str) -> None:
+        super().__init__(wrapped)
+        self.stage = stage
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        start = time.perf_counter()
+        response = await super().request(messages, model_settings, model_request_parameters)
+        self._record(messages, model_request_parameters, response, time.perf_counter() - start)
+        return response
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+        run_context: RunContext[Any] | None = None,
+    ) -> AsyncIterator[StreamedResponse]:
+        start = time.perf_counter()
+        async with super().request_stream(
+            messages, model_settings, model_request_parameters, run_context
+        ) as response_stream:
+            yield response_stream
+        self._record(messages, model_request_parameters, response_stream.get(), time.perf_counter() - start)
+
+    def _record(
+        self,
+        messages: list[ModelMessage],
+        model_request_parameters: ModelRequestParameters,
+        response: ModelResponse,
+        latency: float,
+    ) -> None:
+        output_tools = {tool.name for tool in model_request_parameters.output_tools}
+        tool_calls = sum(call.tool_name not in output_tools for call in response.tool_calls)
+        # Retry prompts answer the previous response's failed tool calls or output
+        last = messages[-1] if messages else None
+        retries = sum(isinstance(part, RetryPromptPart) for part in last.parts) if isinstance(last, ModelRequest) else 0
+        record_model_usage(response, self.stage, latency, tool_calls=tool_calls, retries=retries)
+
+
+class SortedToolset(WrapperToolset[Any]):
+    """Present the wrapped toolset's tools sorted by name, so tool definitions are byte-stable."""
+
+    async def get_tools(self, ctx: RunContext[Any]) -> dict[str, ToolsetTool[Any]]:
+        tools = await super().get_tools(ctx)
+        return dict(sorted(tools.items()))
+
+
+def stable_toolset(toolsets: Sequence[AbstractToolset[Any]]) -> SortedToolset:
+    """Combine toolsets with their tools in a stable, sorted order."""
+    return SortedToolset(CombinedToolset(toolsets))
+
+
+def configure_prompt_caching(agent: Agent[Any, Any], stage: str) -> Agent[Any, Any]:
+    """
+    Add prompt cache settings and usage recording to a newly built agent.
+
+    Settings passed to a run still take precedence over the cache settings.
+
+    Args:
+        agent: The agent
+        stage: Stage name for usage reporting, the agent's registry name
+    """
+    model = agent.model
+    if not isinstance(model, Model) or isinstance(model, UsageRecordingModel):
+        return agent
+
+    agent.model_settings = merge_model_settings(prompt_cache_settings(model), agent.model_settings)
+    agent.model = UsageRecordingModel(model, stage)
+    return agent
@@ -0,0 +1,121 @@
+"""Process-wide registry of prebuilt pydantic-ai agents."""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from functools import wraps
+from typing import Any, TypeVar
+
+from pydantic_ai import Agent
+
+from synthgenie.synthesizers.shared.agents.prompt_cache import configure_prompt_caching
+from synthgenie.synthesizers.shared.agents.resilience import configure_resilience
+
+logger = logging.getLogger(__name__)
+
+AgentT = TypeVar('AgentT', bound=Agent[Any, Any])
+
+
+class AgentRegistry:
+    """
+    Build each agent once and reuse it for every request.
+
+    Agents hold no per-run state, so a single instance can safely serve concurrent requests.
+    Building one infers the model (and its HTTP client) and generates the JSON schema of every
+    tool, which is the expensive part we want off the request path.
+    """
+
+    def __init__(self) -> None:
+        self._factories: dict[str, Callable[[], Agent[Any, Any]]] = {}
+        self._agents: dict[str, Agent[Any, Any]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str) -> Callable[[Callable[[], AgentT]], Callable[[], AgentT]]:
+        """
+        Register an agent factory and replace it with a cached getter.
+
+        Args:
+            name: Unique registry name, e.g. 'digitone.fm_tone'
+
+        Returns:
+            Decorator turning the factory into a function returning the shared agent
+        """
+
+        def decorator(factory: Callable[[], AgentT]) -> Callable[[], AgentT]:
+            if name in self._factories:
+                raise ValueError(f'Agent {name!r} is already registered')
+            self._factories[name] = factory
+
+            @wraps(factory)
+            def get_agent() -> AgentT:
+                return self.get(name)  # type: ignore[return-value]
+
+            return get_agent
+
+        return decorator
+
+    @property
+    def names(self) -> list[str]:
+        return sorted(self._factories)
+
+    def build(self, name: str) -> Agent[Any, Any]:
+        """
+        Build a fresh, uncached agent (used by benchmarks and tests).
+
+        The agent gets provider prompt caching, usage reporting, and fallback, hedging and
+        circuit breaking, with `name` as its stage.
+        """
+        return configure_resilience(configure_prompt_caching(self._factories[name](), name), name)
+
+    def get(self, name: str) -> Agent[Any, Any]:
+        """
+        Return the shared agent, building it on first use.
+
+        Raises:
+            KeyError: If no factory is registered under `name`
+        """
+        agent = self._agents.get(name)
+        if agent is not None:
+            return agent
+
+        with self._lock:
+            agent = self._agents.get(name)
+            if agent is None:
+                agent = self.build(name)
+                self._agents[name] = agent
+            return agent
+
+    def warm_up(self) -> dict[str, float]:
+        """
+        Build every registered agent ahead of the first request.
+
+        Failures (e.g. a missing provider API key) are logged and left for lazy
+        construction so they surface on the request that needs the agent.
+
+        Returns:
+            Mapping of agent name to build time in seconds for the agents built
+        """
+        timings: dict[str, float] = {}
+        for name in self.names:
+            if name in self._agents:
+                continue
+            start = time.perf_counter()
+            try:
+                self.get(name)
+            except Exception:
+                logger.exception(f'Failed to warm up agent {name}')
+                continue
+            timings[name] = time.perf_counter() - start
+
+        if timings:
+            logger.info(f'Warmed up {len(timings)} agents in {sum(timings.values()):.3f}s')
+        return timings
+
+    def clear(self) -> None:
+        """Drop all built agents, e.g. after changing model configuration."""
+        with self._lock:
+            self._agents.clear()
+
+
+agent_registry = AgentRegistry()
@@ -0,0 +1,347 @@
+"""Hedged requests, fallback models and per-provider circuit breakers for the registered agents.
+
+Each registered agent is a stage of a workflow (validation, routing, a machine agent, ...), and
+one slow or failing provider response used to stall the whole request. `ResilientModel` wraps an
+agent's model and, per model request:
+
+- sends the request to the fallback model (`AGENT_FALLBACK_MODEL`) when the primary provider
+  errors, or straight away while that provider's circuit breaker is open;
+- with `AGENT_HEDGING`, sends a second, hedged request once the first has taken longer than
+  the stage's p95 latency, and uses whichever response arrives first. The hedge goes to the
+  fallback model if there is one, otherwise it repeats the request on the primary.
+
+Stage deadlines are enforced by the workflows themselves with `asyncio.timeout`.
+"""
+
+import asyncio
+import logging
+import os
+import statistics
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import cache
+from typing import Any, Literal
+
+import httpx
+from pydantic_ai import Agent
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import ModelMessage, ModelResponse
+from pydantic_ai.models import Model, ModelRequestParameters, StreamedResponse, infer_model
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.settings import ModelSettings
+from pydantic_ai.tools import RunContext
+
+from synthgenie.metrics.registry import metrics_registry
+from synthgenie.synthesizers.shared.agents.prompt_cache import UsageRecordingModel
+
+logger = logging.getLogger(__name__)
+
+AGENT_FALLBACK_MODEL = os.getenv('AGENT_FALLBACK_MODEL') or None
+AGENT_HEDGING = os.getenv('AGENT_HEDGING', 'false').lower() == 'true'
+# Hedge delay until a stage has enough latency samples for its own p95
+AGENT_HEDGE_AFTER_SECONDS = float(os.getenv('AGENT_HEDGE_AFTER_SECONDS', '8'))
+# Consecutive failures opening a provider's breaker, and how long it stays open
+BREAKER_FAILURE_THRESHOLD = int(os.getenv('AGENT_BREAKER_FAILURES', '5'))
+BREAKER_COOLDOWN_SECONDS = float(os.getenv('AGENT_BREAKER_COOLDOWN_SECONDS', '30'))
+
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 20
+
+# Exception modules of the provider SDKs, whose errors (connection errors, timeouts) trigger a fallback
+PROVIDER_MODULES = {'anthropic', 'openai', 'google', 'groq', 'mistralai', 'cohere'}
+
+BreakerState = Literal['closed', 'open', 'half_open']
+# How a breaker lets a request through: not at all, as usual, or as the half-open trial
+Admission = Literal['rejected', 'allowed', 'trial']
+
+
+def is_provider_failure(error: Exception) -> bool:
+    """Whether an error comes from the provider (HTTP error, timeout, connection) rather than our code."""
+    if isinstance(error, ModelHTTPError | TimeoutError | ConnectionError | httpx.HTTPError):
+        return True
+    return type(error).__module__.split('.')[0] in PROVIDER_MODULES
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    Consecutive failure counter for one provider.
+
+    After `BREAKER_FAILURE_THRESHOLD` failures in a row the breaker opens and requests go to the
+    fallback model. Once `BREAKER_COOLDOWN_SECONDS` have passed, a single trial request is let
+    through (half open): a success closes the breaker, a failure opens it again. Only the request
+    admitted as the trial frees the trial slot, whatever other requests still in flight report.
+    """
+
+    failures: int = 0
+    opened_at: float | None = None
+    trial_in_flight: bool = False
+
+    @property
+    def state(self) -> BreakerState:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= BREAKER_COOLDOWN_SECONDS:
+            return 'half_open'
+        return 'open'
+
+    def admit(self) -> Admission:
+        """Admit a request; one admitted as the `trial` must call `release_trial` when it ends, however it ends."""
+        state = self.state
+        if state == 'closed':
+            return 'allowed'
+        if state == 'half_open' and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return 'trial'
+        return 'rejected'
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= BREAKER_FAILURE_THRESHOLD:
+            self.opened_at = time.monotonic()
+
+    def release_trial(self) -> None:
+        self.trial_in_flight = False
+
+
+@dataclass
+class StageStats:
+    """Latency window and hedge/fallback counters of one agent stage."""
+
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+    requests: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    fallbacks: int = 0
+
+    def p95(self) -> float | None:
+        if len(self.latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        return statistics.quantiles(self.latencies, n=20)[-1]
+
+    def hedge_after(self) -> float:
+        return self.p95() or AGENT_HEDGE_AFTER_SECONDS
+
+    def snapshot(self) -> dict[str, Any]:
+        p95 = self.p95()
+        return {
+            'requests': self.requests,
+            'hedges': self.hedges,
+            'hedge_wins': self.hedge_wins,
+            'fallbacks': self.fallbacks,
+            'p95_ms': round(p95 * 1000) if p95 is not None else None,
+        }
+
+
+class ResilienceStats:
+    def __init__(self) -> None:
+        self.stages: dict[str, StageStats] = {}
+        self.breakers: dict[str, CircuitBreaker] = {}
+
+    def stage(self, name: str) -> StageStats:
+        return self.stages.setdefault(name, StageStats())
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        return self.breakers.setdefault(provider, CircuitBreaker())
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            'fallback_model': AGENT_FALLBACK_MODEL,
+            'hedging': AGENT_HEDGING,
+            'stages': {name: stats.snapshot() for name, stats in sorted(self.stages.items())},
+            'breakers': {
+                provider: {'state': breaker.state, 'failures': breaker.failures}
+                for provider, breaker in sorted(self.breakers.items())
+            },
+        }
+
+
+resilience_stats = ResilienceStats()
+metrics_registry.register('model_resilience', resilience_stats.snapshot)
+
+
+@dataclass(init=False)
+class ResilientModel(WrapperModel):
+    """Model wrapper adding fallback, hedging and circuit breaking to an agent stage."""
+
+    stage: str
+    fallback: Model | None
+
+    def __init__(self, wrapped: Model, stage: str, fallback: Model | None = None) -> None:
+        super().__init__(wrapped)
+        self.stage = stage
+        self.fallback = fallback
+
+    def prepare_request(
+        self, model_settings: ModelSettings | None, model_request_parameters: ModelRequestParameters
+    ) -> tuple[ModelSettings | None, ModelRequestParameters]:
+        # The model that ends up serving the request prepares it for its own provider
+        return model_settings, model_request_parameters
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        stats = resilience_stats.stage(self.stage)
+        breaker = resilience_stats.breaker(self.wrapped.system)
+        stats.requests += 1
+
+        admission = breaker.admit() if self.fallback is not None else 'allowed'
+        if self.fallback is not None and admission == 'rejected':
+            stats.fallbacks += 1
+            logger.info(f'{self.stage}: {self.wrapped.system} circuit open, using {self.fallback.model_name}')
+            return await self.fallback.request(messages, model_settings, model_request_parameters)
+
+        start = time.perf_counter()
+        trial = admission == 'trial'
+        try:
+            if AGENT_HEDGING:
+                response = await self._hedged_request(messages, model_settings, model_request_parameters, trial)
+            else:
+                response = await self._primary_request(messages, model_settings, model_request_parameters, trial)
+        except Exception as e:
+            if self.fallback is None or not is_provider_failure(e):
+                raise
+            stats.fallbacks += 1
+            logger.warning(f'{self.stage}: {self.wrapped.model_name} failed ({e!r}), using {self.fallback.model_name}')
+            return await self.fallback.request(messages, model_settings, model_request_parameters)
+
+        stats.latencies.append(time.perf_counter() - start)
+        return response
+
+    async def _primary_request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+        trial: bool = False,
+    ) -> ModelResponse:
+        """Send the request to the primary model, updating its provider's breaker, as its half-open trial if `trial`."""
+        breaker = resilience_stats.breaker(self.wrapped.system)
+        try:
+            response = await self.wrapped.request(messages, model_settings, model_request_parameters)
+        except Exception as e:
+            if is_provider_failure(e):
+                breaker.record_failure()
+            raise
+        else:
+            breaker.record_success()
+        finally:
+            # Also when cancelled, e.g. because its hedge won, or the breaker would stay half open for good
+            if trial:
+                breaker.release_trial()
+        return response
+
+    async def _hedged_request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+        trial: bool = False,
+    ) -> ModelResponse:
+        """Send the request, and a hedged copy once it has run longer than the stage's p95; first response wins."""
+        stats = resilience_stats.stage(self.stage)
+        primary = asyncio.create_task(self._primary_request(messages, model_settings, model_request_parameters, trial))
+        tasks: set[asyncio.Task[ModelResponse]] = {primary}
+        hedge: asyncio.Task[ModelResponse] | None = None
+        try:
+            hedge_after = stats.hedge_after()
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if not done:
+                hedge_model = self.fallback or self.wrapped
+                logger.info(f'{self.stage}: no response after {hedge_after:.1f}s, hedging on {hedge_model.model_name}')
+                stats.hedges += 1
+                if self.fallback is not None:
+                    hedge = asyncio.create_task(
+                        self.fallback.request(messages, model_settings, model_request_parameters)
+                    )
+                else:
+                    # A repeat on the primary reports to its breaker too
+                    hedge = asyncio.create_task(
+                        self._primary_request(messages, model_settings, model_request_parameters)
+                    )
+                tasks.add(hedge)
+
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        stats.hedge_wins += task is hedge
+                        return task.result()
+            # Both failed: report the primary's error
+            return primary.result()
+        finally:
+            for task in (primary, hedge):
+                if task is not None:
+                    task.cancel()
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+        run_context: RunContext[Any] | None = None,
+    ) -> AsyncIterator[StreamedResponse]:
+        # Streams can't be hedged, but skip a provider whose circuit is open
+        breaker = resilience_stats.breaker(self.wrapped.system)
+        admission = breaker.admit() if self.fallback is not None else 'allowed'
+        if self.fallback is not None and admission == 'rejected':
+            async with self.fallback.request_stream(
+                messages, model_settings, model_request_parameters, run_context
+            ) as response_stream:
+                yield response_stream
+            return
+
+        try:
+            async with self.wrapped.request_stream(
+                messages, model_settings, model_request_parameters, run_context
+            ) as response_stream:
+                yield response_stream
+        except Exception as e:
+            if is_provider_failure(e):
+                breaker.record_failure()
+            raise
+        else:
+            breaker.record_success()
+        finally:
+            if admission == 'trial':
+                breaker.release_trial()
+
+
+@cache
+def _fallback_model() -> Model | None:
+    return infer_model(AGENT_FALLBACK_MODEL) if AGENT_FALLBACK_MODEL else None
+
+
+def fallback_model(stage: str) -> Model | None:
+    """The fallback model from `AGENT_FALLBACK_MODEL`, recording its usage under `stage` like the primary model."""
+    model = _fallback_model()
+    return UsageRecordingModel(model, stage) if model is not None else None
+
+
+def configure_resilience(agent: Agent[Any, Any], stage: str) -> Agent[Any, Any]:
+    """
+    Wrap a newly built agent's model with fallback, hedging and circuit breaking.
+
+    Args:
+        agent: The agent, after `configure_prompt_caching`
+        stage: Stage name for latency tracking and metrics, the agent's registry name
+    """
+    model = agent.model
+    if not isinstance(model, Model) or isinstance(model, ResilientModel):
+        return agent
+    if AGENT_FALLBACK_MODEL is None and not AGENT_HEDGING:
+        return agent
+
+    agent.model = ResilientModel(model, stage, fallback_model(stage))
+    return agent
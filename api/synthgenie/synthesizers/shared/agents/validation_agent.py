@@ -1,10 +1,105 @@
+import asyncio
 import os
 
+from fastapi import HTTPException
 from pydantic_ai.agent import Agent
 
+from synthgenie.synthesizers.shared.agents.models import stage_model
+from synthgenie.synthesizers.shared.agents.registry import agent_registry
+from synthgenie.synthesizers.shared.budget import AgentBudget
+
+# Deadline for the validation stage
+VALIDATION_TIMEOUT_SECONDS = float(os.getenv('AGENT_VALIDATION_TIMEOUT_SECONDS', '15'))
+
+VALIDATION_SYSTEM_PROMPT = """
+    You are a specialized classifier that determines whether user prompts are about sound design, synthesizer parameter control, or parameter-related questions.
+
+    ## Your Task
+    When presented with any user input, analyze it and respond ONLY with:
+    - "True" if the prompt is clearly about sound design, synthesizer parameter control, OR parameter-related questions
+    - "False" if the prompt is not about sound design/parameters or if it's ambiguous in any way
+
+    ## What Counts as Valid Prompts
+    1. **Sound Design** - the creation, manipulation, and shaping of audio elements, including:
+       - Synthesizer programming and sound synthesis
+       - Sound effect creation and processing
+       - Audio manipulation techniques and effects
+       - Designing specific sonic textures, timbres, or atmospheres
+       - Creating sounds for music, film, games, or other media
+
+    2. **Parameter Control** - direct commands to set or adjust synthesizer parameters, including:
+       - Setting specific parameter values (e.g., "set filter cutoff to 80")
+       - Adjusting modulation routings (e.g., "set lfo2_destination to filter_envelope_depth")
+       - Configuring oscillator, filter, envelope, LFO, or effect parameters
+       - Track-specific parameter adjustments (e.g., "on track 4, set...")
+       - Any command that directly modifies synthesizer settings
+
+    3. **Parameter Questions** - questions about synthesizer parameters or settings, including:
+       - Asking about current parameter values (e.g., "what is the filter cutoff?")
+       - Inquiring about parameter locations (e.g., "where is the distortion?")
+       - Questions about what controls specific sound characteristics (e.g., "what makes it brighter?")
+       - Clarifications about synthesizer functions (e.g., "what does resonance do?")
+
+    ## Examples of Valid Prompts (would return "True")
+    ### Sound Design Examples:
+    - "Design a deep, evolving pad sound for ambient music."
+    - "Create a plucky synth sound for melodic techno."
+    - "Make a gritty bass sound for industrial techno."
+    - "Generate a shimmering lead sound for trance."
+    - "How do I create realistic water droplet sounds?"
+    - "What techniques create an 80s style reverb effect?"
+    - "Design a distorted bass sound that cuts through a mix."
+
+    ### Parameter Control Examples:
+    - "Set filter cutoff to 127"
+    - "Change oscillator 1 waveform to sawtooth"
+    - "Set lfo2_destination on track 4 to filter_envelope_depth"
+    - "Adjust the resonance to 65"
+    - "Set envelope attack time to 50ms"
+    - "Route LFO1 to pitch with amount 30"
+    - "Enable filter envelope on track 2"
+    - "Set reverb mix to 40%"
+
+    ### Parameter Question Examples:
+    - "Where is the distortion?"
+    - "What is the current filter cutoff?"
+    - "How do I make it brighter?"
+    - "What controls the bass frequencies?"
+    - "Where is the overdrive parameter?"
+    - "What does the harmonics parameter do?"
+
+    ## Examples of Invalid Prompts (would return "False")
+    - "What are good chord progressions for house music?"
+    - "How do I mix vocals in a track?"
+    - "What is the best DAW for beginners?"
+    - "Tell me about the history of electronic music."
+    - "How do I arrange a techno track?"
+    - "What microphone should I buy for recording?"
+    - "Play a C major chord"
+    - "What BPM is good for techno?"
+    - Any prompt not clearly focused on creating/manipulating specific sounds, controlling synthesizer parameters, or asking about parameters
+
+    ## Handling Ambiguity
+    If a prompt is ambiguous, vague, or could potentially be interpreted in multiple ways (some not related to sound design or parameter control), you must respond with "False".
+
+    Remember: Your ONLY responses should be either "True" or "False" with no additional text or explanation.
+
+"""
+
+
+@agent_registry.register('shared.validation')
+def get_validation_agent() -> Agent[None, bool]:
+    """
+    Create the prompt validation classifier agent.
+
+    Built once per process and shared through the agent registry.
+    """
+    return Agent(stage_model('validation'), output_type=bool, system_prompt=VALIDATION_SYSTEM_PROMPT)
+
 
 async def prompt_validation_agent(
     prompt: str,
+    budget: AgentBudget | None = None,
 ) -> bool:
     """
     Validates the provided prompt and returns an appropriate response after processing.
@@ -13,87 +108,19 @@ async def prompt_validation_agent(
 
     Parameters:
     prompt (str): The input string that needs to be validated and processed.
+    budget (AgentBudget | None): The prompt's budget, shared with the agents that run after validation.
 
     Returns:
     str: The result of the validation or response derived from processing
     the provided prompt.
-    """
-
-    system_prompt = """
-        You are a specialized classifier that determines whether user prompts are about sound design, synthesizer parameter control, or parameter-related questions.
-
-        ## Your Task
-        When presented with any user input, analyze it and respond ONLY with:
-        - "True" if the prompt is clearly about sound design, synthesizer parameter control, OR parameter-related questions
-        - "False" if the prompt is not about sound design/parameters or if it's ambiguous in any way
-
-        ## What Counts as Valid Prompts
-        1. **Sound Design** - the creation, manipulation, and shaping of audio elements, including:
-           - Synthesizer programming and sound synthesis
-           - Sound effect creation and processing
-           - Audio manipulation techniques and effects
-           - Designing specific sonic textures, timbres, or atmospheres
-           - Creating sounds for music, film, games, or other media
-
-        2. **Parameter Control** - direct commands to set or adjust synthesizer parameters, including:
-           - Setting specific parameter values (e.g., "set filter cutoff to 80")
-           - Adjusting modulation routings (e.g., "set lfo2_destination to filter_envelope_depth")
-           - Configuring oscillator, filter, envelope, LFO, or effect parameters
-           - Track-specific parameter adjustments (e.g., "on track 4, set...")
-           - Any command that directly modifies synthesizer settings
-
-        3. **Parameter Questions** - questions about synthesizer parameters or settings, including:
-           - Asking about current parameter values (e.g., "what is the filter cutoff?")
-           - Inquiring about parameter locations (e.g., "where is the distortion?")
-           - Questions about what controls specific sound characteristics (e.g., "what makes it brighter?")
-           - Clarifications about synthesizer functions (e.g., "what does resonance do?")
-
-        ## Examples of Valid Prompts (would return "True")
-        ### Sound Design Examples:
-        - "Design a deep, evolving pad sound for ambient music."
-        - "Create a plucky synth sound for melodic techno."
-        - "Make a gritty bass sound for industrial techno."
-        - "Generate a shimmering lead sound for trance."
-        - "How do I create realistic water droplet sounds?"
-        - "What techniques create an 80s style reverb effect?"
-        - "Design a distorted bass sound that cuts through a mix."
-
-        ### Parameter Control Examples:
-        - "Set filter cutoff to 127"
-        - "Change oscillator 1 waveform to sawtooth"
-        - "Set lfo2_destination on track 4 to filter_envelope_depth"
-        - "Adjust the resonance to 65"
-        - "Set envelope attack time to 50ms"
-        - "Route LFO1 to pitch with amount 30"
-        - "Enable filter envelope on track 2"
-        - "Set reverb mix to 40%"
-
-        ### Parameter Question Examples:
-        - "Where is the distortion?"
-        - "What is the current filter cutoff?"
-        - "How do I make it brighter?"
-        - "What controls the bass frequencies?"
-        - "Where is the overdrive parameter?"
-        - "What does the harmonics parameter do?"
-
-        ## Examples of Invalid Prompts (would return "False")
-        - "What are good chord progressions for house music?"
-        - "How do I mix vocals in a track?"
-        - "What is the best DAW for beginners?"
-        - "Tell me about the history of electronic music."
-        - "How do I arrange a techno track?"
-        - "What microphone should I buy for recording?"
-        - "Play a C major chord"
-        - "What BPM is good for techno?"
-        - Any prompt not clearly focused on creating/manipulating specific sounds, controlling synthesizer parameters, or asking about parameters
-
-        ## Handling Ambiguity
-        If a prompt is ambiguous, vague, or could potentially be interpreted in multiple ways (some not related to sound design or parameter control), you must respond with "False".
-
-        Remember: Your ONLY responses should be either "True" or "False" with no additional text or explanation.
 
+    Raises:
+    HTTPException: 503 if validation takes longer than `AGENT_VALIDATION_TIMEOUT_SECONDS`.
     """
-    validation_agent = Agent(os.getenv('AGENT_MODEL', 'gemini-2.5-pro'), output_type=bool, system_prompt=system_prompt)
 
-    result = await validation_agent.run(prompt)
+    try:
+        async with asyncio.timeout(VALIDATION_TIMEOUT_SECONDS):
+            result = await (budget or AgentBudget()).run(get_validation_agent(), prompt)
+    except TimeoutError:
+        raise HTTPException(status_code=503, detail='Prompt validation timeout - please try again')
     return result.output
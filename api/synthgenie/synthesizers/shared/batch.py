@@ -0,0 +1,114 @@
+"""Run many prompts through an agent workflow in one request.
+
+Sound packs are generated from hundreds of prompts. Sending them as one batch shares the API
+key check and usage limits lookup, runs them concurrently under `BATCH_CONCURRENCY`, and
+records usage for the whole batch in a single write.
+"""
+
+import asyncio
+import logging
+import os
+import re
+from collections.abc import Awaitable, Callable, Iterable
+
+from fastapi import HTTPException
+from pydantic_ai.usage import UsageLimits
+
+from synthgenie.auth.usage import usage_tracker
+from synthgenie.synthesizers.shared.budget import AgentBudgetExceeded, usage_limits_for_key
+from synthgenie.synthesizers.shared.cache import lookup_cached_responses, normalize_prompt, store_cached_responses
+from synthgenie.synthesizers.shared.schemas.agent import (
+    BatchPromptResult,
+    SynthGenieAmbiguousResponse,
+    SynthGenieResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_CONCURRENCY = int(os.getenv('BATCH_CONCURRENCY', '4'))
+
+# (user_prompt, api_key, track_usage, limits)
+BatchWorkflow = Callable[
+    [str, str, bool, UsageLimits | None],
+    Awaitable[list[SynthGenieResponse | SynthGenieAmbiguousResponse]],
+]
+
+
+async def run_prompt_batch(
+    workflow: BatchWorkflow,
+    *,
+    synth: str,
+    version: str,
+    prompts: list[str],
+    api_key: str,
+    cache_control: str | None = None,
+    signature_patterns: Iterable[re.Pattern[str]] = (),
+    concurrency: int = BATCH_CONCURRENCY,
+) -> list[BatchPromptResult]:
+    """
+    Run each prompt through the response caches and the workflow, at most `concurrency` at a time.
+
+    A failing prompt doesn't fail the batch: its result carries the HTTP status and error
+    detail the single-prompt endpoint would have returned, and the partial responses of a
+    prompt that exceeded its budget. Prompts repeated within the batch run once, within the API
+    key's usage limits looked up once for the batch. Every successful prompt, cached or not, counts
+    as one request for the API key, and so does a prompt stopped by its budget, whose agents ran
+    and whose partial responses are returned.
+
+    Args:
+        workflow: `run_digitone_agent_workflow` or `run_sub37_agent_workflow`
+        synth: Synth name, part of the cache key
+        version: Fingerprint of the synth's prompts and tools, part of the cache key
+        prompts: Prompts to run, results are returned in the same order
+        api_key: API key for usage tracking
+        cache_control: Value of the `X-SynthGenie-Cache` request header
+        signature_patterns: Patterns whose matches a semantically similar prompt must share
+        concurrency: Maximum number of prompts running at once
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = await usage_limits_for_key(api_key)
+    # Normalized prompts stopped by their budget
+    budget_exceeded: set[str] = set()
+
+    async def run_one(user_prompt: str) -> BatchPromptResult:
+        async with semaphore:
+            lookup = await lookup_cached_responses(
+                synth=synth,
+                version=version,
+                user_prompt=user_prompt,
+                cache_control=cache_control,
+                signature_patterns=signature_patterns,
+            )
+            if lookup.responses is not None:
+                return BatchPromptResult(prompt=user_prompt, responses=lookup.responses)
+
+            try:
+                responses = await workflow(user_prompt, api_key, False, limits)
+            except AgentBudgetExceeded as e:
+                budget_exceeded.add(normalize_prompt(user_prompt))
+                return BatchPromptResult(
+                    prompt=user_prompt, responses=e.responses, status_code=e.status_code, error=str(e.detail)
+                )
+            except HTTPException as e:
+                return BatchPromptResult(prompt=user_prompt, status_code=e.status_code, error=str(e.detail))
+            except Exception:
+                logger.exception(f'Batch prompt failed: {user_prompt[:100]}')
+                return BatchPromptResult(prompt=user_prompt, status_code=500, error='Sound design agent failed')
+
+            await store_cached_responses(lookup, responses)
+            return BatchPromptResult(prompt=user_prompt, responses=responses)
+
+    # Run each distinct prompt once, keyed like the response cache
+    distinct: dict[str, str] = {}
+    for prompt in prompts:
+        distinct.setdefault(normalize_prompt(prompt), prompt)
+    outcomes = dict(zip(distinct, await asyncio.gather(*(run_one(prompt) for prompt in distinct.values()))))
+    results = [outcomes[normalize_prompt(prompt)].model_copy(update={'prompt': prompt}) for prompt in prompts]
+
+    succeeded = sum(result.error is None for result in results)
+    stopped = sum(normalize_prompt(result.prompt) in budget_exceeded for result in results)
+    usage_tracker.record(api_key, succeeded + stopped)
+    logger.info(
+        f'{synth} batch finished: {succeeded}/{len(results)} prompts succeeded, {stopped} stopped by their budget'
+    )
+    return results
@@ -0,0 +1,124 @@
+"""Per-prompt budgets for model requests, tokens and tool calls.
+
+One prompt runs several agents (validation, routing or tool selection, then one or more sound
+design agents), and each can loop through output retries and `ModelRetry`s. All of them share
+one `AgentBudget`, whose usage limits apply to the prompt as a whole. The defaults come from
+the environment and can be overridden per API key in the `api_keys` table; a NULL column
+keeps the default. A key's limits are read from the API key cache along with its verification.
+
+A run that exceeds its budget raises `AgentBudgetExceeded`, a 429 carrying the parameter
+changes made before the limit was hit.
+"""
+
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse
+from pydantic_ai import Agent
+from pydantic_ai.agent import AgentRunResult
+from pydantic_ai.exceptions import UsageLimitExceeded
+from pydantic_ai.usage import RunUsage, UsageLimits
+
+from synthgenie.auth.services import get_api_key_limits_cached
+from synthgenie.synthesizers.shared.schemas.agent import SynthGenieAmbiguousResponse, SynthGenieResponse
+
+logger = logging.getLogger(__name__)
+
+
+def _limit(name: str, default: str) -> int | None:
+    """Read a limit from the environment, 0 meaning unlimited."""
+    return int(os.getenv(name, default)) or None
+
+
+# Defaults per prompt, for API keys without their own limits
+AGENT_MAX_REQUESTS = _limit('AGENT_MAX_REQUESTS', '32')
+AGENT_MAX_TOOL_CALLS = _limit('AGENT_MAX_TOOL_CALLS', '256')
+AGENT_MAX_INPUT_TOKENS = _limit('AGENT_MAX_INPUT_TOKENS', '400000')
+AGENT_MAX_OUTPUT_TOKENS = _limit('AGENT_MAX_OUTPUT_TOKENS', '64000')
+
+AgentResponse = SynthGenieResponse | SynthGenieAmbiguousResponse
+
+
+def default_usage_limits() -> UsageLimits:
+    return UsageLimits(
+        request_limit=AGENT_MAX_REQUESTS,
+        tool_calls_limit=AGENT_MAX_TOOL_CALLS,
+        input_tokens_limit=AGENT_MAX_INPUT_TOKENS,
+        output_tokens_limit=AGENT_MAX_OUTPUT_TOKENS,
+    )
+
+
+async def usage_limits_for_key(api_key: str) -> UsageLimits:
+    """
+    Usage limits for prompts sent with an API key: its own limits where set, the defaults otherwise.
+
+    Args:
+        api_key: API key value
+    """
+    limits = default_usage_limits()
+    key_limits = await get_api_key_limits_cached(api_key)
+    for column, attribute in (
+        ('max_model_requests', 'request_limit'),
+        ('max_tool_calls', 'tool_calls_limit'),
+        ('max_input_tokens', 'input_tokens_limit'),
+        ('max_output_tokens', 'output_tokens_limit'),
+    ):
+        if key_limits.get(column) is not None:
+            setattr(limits, attribute, key_limits[column])
+    return limits
+
+
+class AgentBudgetExceeded(HTTPException):
+    """
+    A prompt's agents exceeded its budget.
+
+    Rendered as a 429 whose `detail` names the exceeded limit and whose `responses` hold the
+    parameter changes made before it, see `budget_exceeded_handler`.
+    """
+
+    def __init__(self, reason: str, responses: list[AgentResponse] | None = None) -> None:
+        super().__init__(status_code=429, detail=f'Request budget exceeded: {reason}')
+        self.reason = reason
+        self.responses = responses or []
+
+
+@dataclass
+class AgentBudget:
+    """Usage limits shared by every agent run of one prompt, and the usage counted against them."""
+
+    limits: UsageLimits = field(default_factory=default_usage_limits)
+    usage: RunUsage = field(default_factory=RunUsage)
+
+    def run_kwargs(self) -> dict[str, Any]:
+        """Keyword arguments adding a run's usage to this budget, for `Agent.run` or `Agent.iter`."""
+        return {'usage': self.usage, 'usage_limits': self.limits}
+
+    async def run[OutputT](
+        self, agent: Agent[Any, OutputT], user_prompt: str, **run_kwargs: Any
+    ) -> AgentRunResult[OutputT]:
+        """
+        Run an agent within the budget.
+
+        Raises:
+            AgentBudgetExceeded: If the run exceeds a limit
+        """
+        try:
+            return await agent.run(user_prompt, **self.run_kwargs(), **run_kwargs)
+        except UsageLimitExceeded as e:
+            logger.warning(f'Agent run stopped by its budget: {e}')
+            raise AgentBudgetExceeded(str(e)) from e
+
+
+async def budget_exceeded_handler(_request: Request, exc: Exception) -> JSONResponse:
+    """Respond to `AgentBudgetExceeded` with its reason and the partial results."""
+    assert isinstance(exc, AgentBudgetExceeded)
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={
+            'detail': exc.detail,
+            'responses': [response.model_dump(exclude_none=True) for response in exc.responses],
+        },
+    )
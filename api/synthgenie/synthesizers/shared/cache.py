@@ -0,0 +1,367 @@
+"""Exact-match response cache in front of the agent workflows.
+
+Identical prompts are common ("fat kick on track 1 using FM Drum") and each one otherwise runs
+the whole validation → routing → machine agent chain. Entries are keyed by the normalized
+prompt, the synth, the model and a fingerprint of the agent/tool sources, so changing a system
+prompt, a tool or the model never serves a stale answer.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Literal
+
+from fastapi import Response
+from pydantic_ai.usage import UsageLimits
+
+from synthgenie.auth.usage import usage_tracker
+from synthgenie.db.executor import run_db
+from synthgenie.metrics.registry import metrics_registry
+from synthgenie.synthesizers.shared.agents.models import models_fingerprint
+from synthgenie.synthesizers.shared.budget import AgentBudgetExceeded, usage_limits_for_key
+from synthgenie.synthesizers.shared.schemas.agent import SynthGenieAmbiguousResponse, SynthGenieResponse
+from synthgenie.synthesizers.shared.semantic_cache import (
+    SEMANTIC_CACHE_ENABLED,
+    lookup_similar_responses,
+    prompt_signature,
+    store_responses,
+)
+from synthgenie.synthesizers.shared.streaming import AgentResponse, iterate_responses
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '1024'))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv('RESPONSE_CACHE_TTL_SECONDS', '3600'))
+
+# Request header skipping the cache lookup (`X-SynthGenie-Cache: bypass`); the response
+# carries the same header with `hit`, `semantic`, `miss` or `bypass`
+CACHE_HEADER = 'X-SynthGenie-Cache'
+CACHE_BYPASS = 'bypass'
+
+AgentResponses = list[SynthGenieResponse | SynthGenieAmbiguousResponse]
+CacheKey = tuple[str, str, str, str]
+CacheStatus = Literal['hit', 'semantic', 'miss', 'bypass']
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    return re.sub(r'\s+', ' ', prompt).strip().rstrip('.!?').strip().lower()
+
+
+def source_fingerprint(packages: Iterable[ModuleType]) -> str:
+    """
+    Hash the Python sources of the given packages.
+
+    Agents keep their system prompts and tool docstrings in code, so any edit to them
+    changes the fingerprint and invalidates cached responses.
+    """
+    digest = hashlib.sha256()
+    for package in packages:
+        root = Path(package.__file__ or '').parent
+        for path in sorted(root.rglob('*.py')):
+            digest.update(path.relative_to(root).as_posix().encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    bypasses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass(frozen=True)
+class _CacheEntry:
+    responses: tuple[SynthGenieResponse | SynthGenieAmbiguousResponse, ...]
+    expires_at: float
+
+
+class ResponseCache:
+    """In-process LRU cache with a TTL for agent workflow responses."""
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[CacheKey, _CacheEntry] = OrderedDict()
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(synth: str, prompt: str, model: str, version: str) -> CacheKey:
+        return synth, normalize_prompt(prompt), model, version
+
+    def get(self, key: CacheKey) -> AgentResponses | None:
+        """Return a copy of the cached responses, counting the lookup as a hit or a miss."""
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= self._clock():
+            del self._entries[key]
+            self.stats.expirations += 1
+            entry = None
+
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return list(entry.responses)
+
+    def set(self, key: CacheKey, responses: AgentResponses) -> bool:
+        """
+        Store responses unless they shouldn't be reused.
+
+        Empty results and results with an ambiguous response (a clarification request
+        or an error message) are not cached.
+
+        Returns:
+            Whether the responses were stored
+        """
+        if not responses or any(isinstance(response, SynthGenieAmbiguousResponse) for response in responses):
+            return False
+
+        self._entries[key] = _CacheEntry(tuple(responses), self._clock() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+        return True
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            'enabled': RESPONSE_CACHE_ENABLED,
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl_seconds': self.ttl_seconds,
+            'hits': self.stats.hits,
+            'misses': self.stats.misses,
+            'bypasses': self.stats.bypasses,
+            'evictions': self.stats.evictions,
+            'expirations': self.stats.expirations,
+            'hit_ratio': round(self.stats.hit_ratio, 4),
+        }
+
+
+response_cache = ResponseCache()
+metrics_registry.register('response_cache', response_cache.snapshot)
+
+
+@dataclass
+class CacheLookup:
+    """Outcome of a cache lookup, carrying what's needed to store the fresh result on a miss."""
+
+    synth: str
+    key: CacheKey
+    prompt: str
+    model: str
+    version: str
+    signature: str
+    status: CacheStatus | None
+    responses: AgentResponses | None = None
+
+
+async def lookup_cached_responses(
+    *,
+    synth: str,
+    version: str,
+    user_prompt: str,
+    cache_control: str | None = None,
+    signature_patterns: Iterable[re.Pattern[str]] = (),
+) -> CacheLookup:
+    """
+    Look a prompt up in the exact-match cache, then in the semantic cache in pgvector.
+
+    Args:
+        synth: Synth name, part of the cache key
+        version: Fingerprint of the synth's prompts and tools, part of the cache key
+        user_prompt: The user's sound design request
+        cache_control: Value of the `X-SynthGenie-Cache` request header
+        signature_patterns: Patterns whose matches a semantically similar prompt must share
+
+    Returns:
+        The lookup; `responses` is set on a hit and `status` is None when caching is disabled
+    """
+    model = models_fingerprint()
+    prompt = normalize_prompt(user_prompt)
+    lookup = CacheLookup(
+        synth=synth,
+        key=response_cache.key(synth, user_prompt, model, version),
+        prompt=prompt,
+        model=model,
+        version=version,
+        signature=prompt_signature(prompt, signature_patterns),
+        status='miss',
+    )
+    if not RESPONSE_CACHE_ENABLED and not SEMANTIC_CACHE_ENABLED:
+        lookup.status = None
+    elif cache_control is not None and cache_control.strip().lower() == CACHE_BYPASS:
+        response_cache.stats.bypasses += 1
+        lookup.status = 'bypass'
+    elif RESPONSE_CACHE_ENABLED and (cached := response_cache.get(lookup.key)) is not None:
+        logger.info(f'Response cache hit for {synth} prompt: {user_prompt[:100]}')
+        lookup.status, lookup.responses = 'hit', cached
+    elif (
+        SEMANTIC_CACHE_ENABLED
+        and (similar := await run_db(lookup_similar_responses, None, synth, prompt, model, version, lookup.signature))
+        is not None
+    ):
+        lookup.status, lookup.responses = 'semantic', list(similar)
+        if RESPONSE_CACHE_ENABLED:
+            response_cache.set(lookup.key, lookup.responses)
+    return lookup
+
+
+async def store_cached_responses(lookup: CacheLookup, responses: AgentResponses) -> None:
+    """Store a fresh workflow result in the enabled caches."""
+    if RESPONSE_CACHE_ENABLED:
+        response_cache.set(lookup.key, responses)
+    if SEMANTIC_CACHE_ENABLED:
+        await run_db(
+            store_responses,
+            None,
+            lookup.synth,
+            lookup.prompt,
+            lookup.model,
+            lookup.version,
+            lookup.signature,
+            responses,
+        )
+
+
+async def run_cached_workflow(
+    workflow: Callable[[str, str], Awaitable[AgentResponses]],
+    *,
+    synth: str,
+    version: str,
+    user_prompt: str,
+    api_key: str,
+    response: Response,
+    cache_control: str | None = None,
+    signature_patterns: Iterable[re.Pattern[str]] = (),
+) -> AgentResponses:
+    """
+    Serve a workflow result from the response caches, running the workflow on a miss.
+
+    A cache hit still counts as a request for the API key, and so does a prompt stopped by its
+    budget, whose partial responses go out with the 429. With `cache_control` set to `bypass`
+    the lookups are skipped and the fresh result replaces any cached entry.
+
+    Args:
+        workflow: `run_digitone_agent_workflow` or `run_sub37_agent_workflow`
+        synth: Synth name, part of the cache key
+        version: Fingerprint of the synth's prompts and tools, part of the cache key
+        user_prompt: The user's sound design request
+        api_key: API key for usage tracking
+        response: Outgoing response, receives the cache status header
+        cache_control: Value of the `X-SynthGenie-Cache` request header
+        signature_patterns: Patterns whose matches a semantically similar prompt must share
+    """
+    lookup = await lookup_cached_responses(
+        synth=synth,
+        version=version,
+        user_prompt=user_prompt,
+        cache_control=cache_control,
+        signature_patterns=signature_patterns,
+    )
+    if lookup.status is not None:
+        response.headers[CACHE_HEADER] = lookup.status
+    if lookup.responses is not None:
+        usage_tracker.record(api_key)
+        return lookup.responses
+
+    try:
+        responses = await workflow(user_prompt, api_key)
+    except AgentBudgetExceeded:
+        usage_tracker.record(api_key)
+        raise
+    await store_cached_responses(lookup, responses)
+    return responses
+
+
+async def _record_stream(
+    responses: AsyncIterator[AgentResponse], lookup: CacheLookup, api_key: str
+) -> AsyncIterator[AgentResponse]:
+    """
+    Pass a response stream through, then track usage and cache the complete result.
+
+    A stream that fails or is cut off after its first response, or is stopped by its budget, is
+    still tracked as a request but not cached.
+    """
+    collected: AgentResponses = []
+    stopped_by_budget = False
+    try:
+        async for response in responses:
+            collected.append(response)
+            yield response
+    except AgentBudgetExceeded:
+        stopped_by_budget = True
+        raise
+    finally:
+        if collected or stopped_by_budget:
+            usage_tracker.record(api_key)
+
+    await store_cached_responses(lookup, collected)
+
+
+async def stream_cached_workflow(
+    workflow: Callable[[str, str, UsageLimits], AsyncIterator[AgentResponse]],
+    *,
+    synth: str,
+    version: str,
+    user_prompt: str,
+    api_key: str,
+    cache_control: str | None = None,
+    signature_patterns: Iterable[re.Pattern[str]] = (),
+) -> tuple[AsyncIterator[AgentResponse], CacheStatus | None]:
+    """
+    Streaming counterpart of `run_cached_workflow`.
+
+    Cache hits are streamed at once. On a miss the workflow runs within the API key's usage
+    limits, its stream is passed through, and usage tracking and caching happen once it completes.
+
+    Args:
+        workflow: `stream_digitone_agent_workflow` or `stream_sub37_agent_workflow`
+        (other arguments as for `run_cached_workflow`)
+
+    Returns:
+        The response stream and the cache status for the `X-SynthGenie-Cache` header
+    """
+    lookup = await lookup_cached_responses(
+        synth=synth,
+        version=version,
+        user_prompt=user_prompt,
+        cache_control=cache_control,
+        signature_patterns=signature_patterns,
+    )
+    if lookup.responses is not None:
+        usage_tracker.record(api_key)
+        return iterate_responses(lookup.responses), lookup.status
+
+    limits = await usage_limits_for_key(api_key)
+    return _record_stream(workflow(user_prompt, api_key, limits), lookup, api_key), lookup.status
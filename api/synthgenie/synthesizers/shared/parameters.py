@@ -0,0 +1,286 @@
+"""Parameter registry built from the synthesizer tool functions.
+
+Every `set_*` tool documents its value range, named values and (for 14-bit parameters) the
+display range in its docstring. The registry parses that once so parameters can be resolved
+by name and set without going through an LLM.
+
+The same registry backs the batch `set_parameters` tool, which lets an agent set any number of
+parameters in one call instead of reading one schema and making one tool call per parameter.
+"""
+
+import inspect
+import os
+import re
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, cast
+
+from pydantic import BaseModel, Field
+from pydantic_ai import ModelRetry, RunContext, Tool
+from pydantic_ai.toolsets import FunctionToolset
+
+from synthgenie.synthesizers.shared.schemas.agent import SynthGenieResponse
+
+ToolFunction = Callable[..., SynthGenieResponse]
+
+# Give agents the single `set_parameters` tool instead of one tool per parameter
+BATCH_PARAMETER_TOOL = os.getenv('AGENT_BATCH_PARAMETER_TOOL', 'false').lower() == 'true'
+
+VALUE_DOC_PATTERN = re.compile(r'value \(int\):(.*?)(?:\n\s*(?:midi_channel|track) \(int\)|\Z)', re.DOTALL)
+RANGE_PATTERNS = (
+    re.compile(r'ranging from (-?\d+) to (-?\d+)'),
+    re.compile(r'\((-?\d+) or (-?\d+)\)'),
+    re.compile(r'\((-?\d+)\s*-\s*(-?\d+)\)'),
+)
+DISPLAY_MAPPING_PATTERN = re.compile(r'Maps to display values from ([-+]?\d+(?:\.\d+)?) to ([-+]?\d+(?:\.\d+)?)')
+DISPLAY_RANGE_PATTERN = re.compile(r'Display range: ([-+]?\d+(?:\.\d+)?)\s*(?:to|-)\s*([-+]?\d+(?:\.\d+)?)')
+OPTION_PATTERN = re.compile(r'^\s*-\s*(-?\d+)\s*=\s*"?([A-Za-z][\w+ /.-]*?)"?\s*(?:\(.*\))?\s*$', re.MULTILINE)
+
+# Words users commonly use for parameter name tokens
+TOKEN_SYNONYMS = {
+    'cutoff': 'frequency',
+    'freq': 'frequency',
+    'res': 'resonance',
+    'reso': 'resonance',
+    'env': 'envelope',
+    'vol': 'volume',
+    'lvl': 'level',
+    'atk': 'attack',
+    'dec': 'decay',
+    'sus': 'sustain',
+    'rel': 'release',
+    'fb': 'feedback',
+    'harm': 'harmonics',
+    'mult': 'multiplier',
+    'dest': 'destination',
+}
+STOPWORDS = {'the', 'a', 'an', 'of', 'my', 'its', 'parameter', 'param', 'value', 'up', 'down'}
+NUMBERED_SECTION_PATTERN = re.compile(r'\b(lfo|osc|mod|gen)\s+(\d)\b')
+
+
+def normalize_name(text: str) -> str:
+    """Normalize a parameter or option name to lowercase, underscore-separated tokens."""
+    text = NUMBERED_SECTION_PATTERN.sub(r'\1\2', text.lower().strip())
+    tokens = [TOKEN_SYNONYMS.get(token, token) for token in re.split(r'[^a-z0-9+]+', text) if token]
+    return '_'.join(token for token in tokens if token not in STOPWORDS)
+
+
+@dataclass(frozen=True)
+class ParameterSpec:
+    """A settable parameter backed by one tool function."""
+
+    name: str
+    tool: ToolFunction
+    min_value: int
+    max_value: int
+    display_range: tuple[float, float] | None = None
+    display_ambiguous: bool = False
+    options: Mapping[str, int] = field(default_factory=dict[str, int])
+    channel_arg: str = 'midi_channel'
+
+    @property
+    def tool_name(self) -> str:
+        return self.tool.__name__
+
+    @property
+    def tokens(self) -> frozenset[str]:
+        return frozenset(self.name.split('_'))
+
+    def to_midi_value(self, number: float, percent: bool = False) -> int | None:
+        """
+        Convert a user-supplied number to the MIDI value the tool expects.
+
+        High-resolution parameters accept display values (e.g. cutoff 0-127 maps onto 0-16383).
+        Parameters whose display range differs from their MIDI range without a documented
+        mapping are ambiguous and return None.
+
+        Returns:
+            MIDI value, or None if the number can't be mapped unambiguously
+        """
+        span = self.max_value - self.min_value
+        if percent:
+            return round(self.min_value + number / 100 * span) if 0 <= number <= 100 else None
+
+        if self.display_range is not None:
+            low, high = self.display_range
+            if low <= number <= high:
+                return round(self.min_value + (number - low) / (high - low) * span)
+        elif self.display_ambiguous:
+            return None
+
+        if number.is_integer() and self.min_value <= number <= self.max_value:
+            return int(number)
+        return None
+
+    def option_value(self, option: str) -> int | None:
+        return self.options.get(normalize_name(option))
+
+    def build_response(self, value: int, midi_channel: int) -> SynthGenieResponse:
+        """Call the underlying tool exactly as an agent would."""
+        if not self.min_value <= value <= self.max_value:
+            raise ValueError(f'{self.name} must be between {self.min_value}-{self.max_value}, got {value}')
+        # Tools take the run context first but never use it
+        ctx = cast(RunContext[Any], None)
+        return self.tool(ctx, value=value, **{self.channel_arg: midi_channel})
+
+
+def parse_parameter_spec(tool: ToolFunction, extra_options: Mapping[str, int] | None = None) -> ParameterSpec:
+    """
+    Build a ParameterSpec from a tool's signature and docstring.
+
+    Args:
+        tool: A `set_*` tool function
+        extra_options: Named values from elsewhere (e.g. `synthgenie.data`) to merge in
+    """
+    doc = inspect.getdoc(tool) or ''
+    match = VALUE_DOC_PATTERN.search(doc)
+    value_doc = match.group(1) if match else doc
+
+    min_value, max_value = 0, 127
+    for pattern in RANGE_PATTERNS:
+        if range_match := pattern.search(value_doc):
+            min_value, max_value = int(range_match.group(1)), int(range_match.group(2))
+            break
+
+    display_range = None
+    display_ambiguous = False
+    if mapping := DISPLAY_MAPPING_PATTERN.search(value_doc):
+        display_range = (float(mapping.group(1)), float(mapping.group(2)))
+    elif display := DISPLAY_RANGE_PATTERN.search(value_doc):
+        display_ambiguous = (float(display.group(1)), float(display.group(2))) != (min_value, max_value)
+
+    # Named values documented on the tool take precedence over extra ones
+    options = {normalize_name(name): value for name, value in (extra_options or {}).items()}
+    options.update({normalize_name(name): int(value) for value, name in OPTION_PATTERN.findall(value_doc)})
+
+    parameters = inspect.signature(tool).parameters
+    return ParameterSpec(
+        name=tool.__name__.removeprefix('set_'),
+        tool=tool,
+        min_value=min_value,
+        max_value=max_value,
+        display_range=display_range,
+        display_ambiguous=display_ambiguous,
+        options={name: value for name, value in options.items() if min_value <= value <= max_value},
+        channel_arg='track' if 'track' in parameters and 'midi_channel' not in parameters else 'midi_channel',
+    )
+
+
+class ParameterRegistry:
+    """Resolve parameter names to the tools that set them."""
+
+    def __init__(self, tools: Iterable[ToolFunction], options: Mapping[str, Mapping[str, int]] | None = None):
+        """
+        Args:
+            tools: Tool functions to index
+            options: Extra named values keyed by tool name
+        """
+        options = options or {}
+        self.specs: dict[str, ParameterSpec] = {}
+        for tool in tools:
+            spec = parse_parameter_spec(tool, options.get(tool.__name__))
+            self.specs[spec.name] = spec
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    def __contains__(self, name: str) -> bool:
+        return name.removeprefix('set_') in self.specs
+
+    def get(self, name: str) -> ParameterSpec | None:
+        """Look up a parameter by exact name, with or without the `set_` prefix."""
+        return self.specs.get(name.removeprefix('set_'))
+
+    def resolve(self, phrase: str, exclude: Callable[[ParameterSpec], bool] | None = None) -> list[ParameterSpec]:
+        """
+        Find the parameters a free-form phrase refers to.
+
+        An exact name wins; otherwise every parameter whose name contains all of the phrase's
+        tokens is a candidate, and a candidate with exactly those tokens is preferred.
+
+        Args:
+            phrase: e.g. 'filter cutoff', 'lfo 2 destination' or 'lfo2_destination'
+            exclude: Optional predicate removing candidates (e.g. other machines' tools)
+
+        Returns:
+            Matching parameters; exactly one element means the phrase is unambiguous
+        """
+        name = normalize_name(phrase)
+        if not name:
+            return []
+        if name in self.specs:
+            return [self.specs[name]]
+
+        tokens = frozenset(name.split('_'))
+        candidates = [spec for spec in self.specs.values() if tokens <= spec.tokens and not (exclude and exclude(spec))]
+        exact = [spec for spec in candidates if spec.tokens == tokens]
+        return exact or candidates
+
+
+class ParameterChange(BaseModel):
+    """One entry of a `set_parameters` call."""
+
+    parameter: str = Field(description='Parameter name from the tool description, e.g. filter_frequency')
+    value: int = Field(description='MIDI value within the range listed for the parameter')
+    midi_channel: int = Field(ge=1, le=16, description='MIDI channel (track), 1-16')
+
+
+def describe_parameters(registry: ParameterRegistry) -> str:
+    """One line per parameter with its MIDI range, display range and named values."""
+    lines: list[str] = []
+    for spec in registry.specs.values():
+        line = f'{spec.name} {spec.min_value}-{spec.max_value}'
+        if spec.display_range is not None:
+            low, high = spec.display_range
+            line += f' (display {low:g} to {high:g})'
+        if spec.options:
+            line += ': ' + ', '.join(f'{name}={value}' for name, value in spec.options.items())
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def create_parameter_toolset(
+    tools: Iterable[ToolFunction], options: Mapping[str, Mapping[str, int]] | None = None
+) -> FunctionToolset[Any]:
+    """
+    Build a toolset with a single `set_parameters` tool covering the given tools.
+
+    The tool description lists every parameter compactly, and each change is resolved and
+    range-checked against the registry before the original tool builds its response, so the
+    responses are identical to those of the per-parameter tools.
+
+    Args:
+        tools: The per-parameter tool functions to cover
+        options: Extra named values keyed by tool name
+    """
+    registry = ParameterRegistry(tools, options)
+
+    def set_parameters(changes: list[ParameterChange]) -> list[SynthGenieResponse]:
+        responses: list[SynthGenieResponse] = []
+        errors: list[str] = []
+        for change in changes:
+            exact = registry.get(re.sub(r'[\s-]+', '_', change.parameter.strip().lower()))
+            specs = [exact] if exact else registry.resolve(change.parameter)
+            if len(specs) != 1:
+                candidates = ', '.join(spec.name for spec in specs[:5])
+                errors.append(
+                    f'{change.parameter!r} is ambiguous: {candidates}'
+                    if specs
+                    else f'{change.parameter!r} is not a known parameter'
+                )
+                continue
+            try:
+                responses.append(specs[0].build_response(change.value, change.midi_channel))
+            except ValueError as e:
+                errors.append(str(e))
+
+        if errors:
+            # Nothing is applied until the whole batch is valid, so the model resends all of it
+            raise ModelRetry('Fix these changes and call set_parameters again with the full list: ' + '; '.join(errors))
+        return responses
+
+    description = (
+        'Set several synthesizer parameters in one call. Include every change the sound needs.\n'
+        'Parameters (name MIDI-range, named values):\n' + describe_parameters(registry)
+    )
+    return FunctionToolset([Tool(set_parameters, takes_ctx=False, description=description)])
@@ -56,3 +56,12 @@ class SynthGenieResponse(BaseModel):
 
 class SynthGenieAmbiguousResponse(BaseModel):
     message: str
+
+
+class BatchPromptResult(BaseModel):
+    """Outcome of one prompt in a batch: its responses, or the error it failed with."""
+
+    prompt: str
+    responses: list[SynthGenieResponse | SynthGenieAmbiguousResponse] | None = None
+    status_code: int = 200
+    error: str | None = None
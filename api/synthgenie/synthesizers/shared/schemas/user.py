@@ -1,5 +1,13 @@
-from pydantic import BaseModel
+import os
+
+from pydantic import BaseModel, Field
+
+BATCH_MAX_PROMPTS = int(os.getenv('BATCH_MAX_PROMPTS', '200'))
 
 
 class UserPrompt(BaseModel):
     prompt: str
+
+
+class UserPrompts(BaseModel):
+    prompts: list[str] = Field(min_length=1, max_length=BATCH_MAX_PROMPTS)
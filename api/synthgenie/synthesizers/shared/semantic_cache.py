@@ -0,0 +1,240 @@
+"""Near-duplicate prompt cache stored in pgvector.
+
+The exact-match cache in `cache.py` misses paraphrases ("fat kick on track 1 using FM Drum" vs
+"a fat FM Drum kick on track 1"). Prompts are embedded locally with hashed character n-grams,
+so no embedding service or model is needed, and the closest cached prompt is served when its
+cosine similarity clears `SEMANTIC_CACHE_THRESHOLD`.
+
+Numbers, machine names, negations and direction words change the meaning of otherwise similar
+prompts ("track 1" vs "track 2", "no reverb pad" vs "reverb pad", "not too bright" vs "too
+bright"), which the n-gram embedding barely sees, so they form an exact-match signature that a
+cached prompt must share. The cache is off by default until it's backed by real embeddings.
+"""
+
+import hashlib
+import logging
+import math
+import os
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+import psycopg2
+from psycopg2.extras import DictCursor, DictRow, Json
+from pydantic import TypeAdapter
+
+from synthgenie.metrics.registry import metrics_registry
+from synthgenie.synthesizers.shared.schemas.agent import SynthGenieAmbiguousResponse, SynthGenieResponse
+
+logger = logging.getLogger(__name__)
+
+SEMANTIC_CACHE_ENABLED = os.getenv('SEMANTIC_CACHE_ENABLED', 'false').lower() == 'true'
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', '0.97'))
+SEMANTIC_CACHE_TTL_SECONDS = int(os.getenv('SEMANTIC_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+
+# Must match the `vector(...)` column in `initialize_db`
+EMBEDDING_DIMENSIONS = 512
+NGRAM_SIZES = (3, 4, 5)
+NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)?')
+# Words that don't change what sound is asked for
+FILLER_WORDS = frozenset(
+    'a an the and on in for to of with using use that is it me my some please '
+    'make create give design generate i want need sound like'.split()
+)
+# Words that negate or set the direction of a request, part of the signature
+MODIFIER_WORDS = frozenset(
+    'no not without never none dont don t isn aren less more fewer too very much little bit slightly '
+    'increase decrease raise reduce boost cut add remove up down higher lower '
+    'brighter darker warmer colder softer harder louder quieter faster slower longer shorter '
+    'wider narrower thicker thinner fatter cleaner dirtier sharper duller'.split()
+)
+
+_responses_adapter = TypeAdapter(list[SynthGenieResponse])
+
+
+def embed_prompt(prompt: str) -> list[float]:
+    """
+    Embed a prompt as an L2-normalized vector of hashed character n-grams and words.
+
+    Filler words are dropped and n-grams don't cross word boundaries, so rephrasings and
+    reorderings of the same request embed (nearly) identically.
+
+    Hashing uses blake2b rather than `hash()`, which is salted per process, so embeddings
+    written by one worker are comparable with those computed by another.
+    """
+    words = [word for word in re.findall(r'[a-z0-9]+', prompt.lower()) if word not in FILLER_WORDS]
+    features = [
+        f' {word} '[i : i + size] for word in words for size in NGRAM_SIZES for i in range(len(word) - size + 3)
+    ]
+    features += words
+
+    vector = [0.0] * EMBEDDING_DIMENSIONS
+    for feature in features:
+        digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+        index = int.from_bytes(digest[:4], 'little') % EMBEDDING_DIMENSIONS
+        vector[index] += 1.0 if digest[4] & 1 else -1.0
+
+    norm = math.sqrt(sum(component * component for component in vector))
+    return [component / norm for component in vector] if norm else vector
+
+
+def prompt_signature(prompt: str, patterns: Iterable[re.Pattern[str]] = ()) -> str:
+    """
+    Meaning-critical parts of a prompt that cached prompts must match exactly: its numbers,
+    negation and direction words (in order, "not too bright" differs from "too bright") and
+    pattern matches.
+
+    Args:
+        prompt: The user's prompt
+        patterns: Patterns (e.g. Digitone machine names) whose matches are included
+    """
+    numbers = NUMBER_PATTERN.findall(prompt)
+    modifiers = [word for word in re.findall(r'[a-z]+', prompt.lower()) if word in MODIFIER_WORDS]
+    terms = sorted(match.group(0) for pattern in patterns if (match := pattern.search(prompt)))
+    return ' '.join(numbers) + '|' + ' '.join(modifiers) + '|' + ' '.join(terms)
+
+
+def _vector_literal(vector: list[float]) -> str:
+    return '[' + ','.join(f'{component:.6f}' for component in vector) + ']'
+
+
+@dataclass
+class SemanticCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    errors: int = 0
+    hit_similarity_total: float = 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'enabled': SEMANTIC_CACHE_ENABLED,
+            'threshold': SEMANTIC_CACHE_THRESHOLD,
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'errors': self.errors,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            'mean_hit_similarity': round(self.hit_similarity_total / self.hits, 4) if self.hits else 0.0,
+        }
+
+
+semantic_cache_stats = SemanticCacheStats()
+metrics_registry.register('semantic_cache', semantic_cache_stats.snapshot)
+
+
+def lookup_similar_responses(
+    conn: psycopg2.extensions.connection,
+    synth: str,
+    prompt: str,
+    model: str,
+    version: str,
+    signature: str,
+    threshold: float = SEMANTIC_CACHE_THRESHOLD,
+) -> list[SynthGenieResponse] | None:
+    """
+    Find the cached responses of the most similar prompt.
+
+    Database errors are logged and treated as a miss so the cache never fails a request.
+
+    Args:
+        conn: Database connection
+        synth: Synth name
+        prompt: Normalized user prompt
+        model: Agent model name
+        version: Fingerprint of the synth's prompts and tools
+        signature: `prompt_signature` of the prompt
+        threshold: Minimum cosine similarity for a hit
+
+    Returns:
+        Cached responses, or None on a miss
+    """
+    embedding = _vector_literal(embed_prompt(prompt))
+    cursor: DictCursor = conn.cursor(cursor_factory=DictCursor)
+    try:
+        cursor.execute(  # type: ignore
+            """
+            SELECT id, prompt, responses, 1 - (embedding <=> %s::vector) AS similarity
+            FROM semantic_prompt_cache
+            WHERE synth = %s AND model = %s AND version = %s AND signature = %s
+              AND created_at > CURRENT_TIMESTAMP - make_interval(secs => %s)
+            ORDER BY embedding <=> %s::vector
+            LIMIT 1
+            """,
+            (embedding, synth, model, version, signature, SEMANTIC_CACHE_TTL_SECONDS, embedding),
+        )
+        row: DictRow | None = cursor.fetchone()
+        entry: dict[str, Any] | None = dict(row) if row else None
+        if entry is None or entry['similarity'] < threshold:
+            semantic_cache_stats.misses += 1
+            conn.rollback()
+            return None
+
+        cursor.execute(  # type: ignore
+            'UPDATE semantic_prompt_cache SET hit_count = hit_count + 1, last_hit_at = CURRENT_TIMESTAMP WHERE id = %s',
+            (entry['id'],),
+        )
+        conn.commit()
+    except psycopg2.Error as e:
+        logger.error(f'Error reading semantic prompt cache: {e}')
+        semantic_cache_stats.errors += 1
+        conn.rollback()
+        return None
+
+    semantic_cache_stats.hits += 1
+    semantic_cache_stats.hit_similarity_total += entry['similarity']
+    logger.info(f'Semantic cache hit ({entry["similarity"]:.3f}) for {synth} prompt {prompt!r} via {entry["prompt"]!r}')
+    return _responses_adapter.validate_python(entry['responses'])
+
+
+def store_responses(
+    conn: psycopg2.extensions.connection,
+    synth: str,
+    prompt: str,
+    model: str,
+    version: str,
+    signature: str,
+    responses: list[SynthGenieResponse | SynthGenieAmbiguousResponse],
+) -> bool:
+    """
+    Store a prompt's embedding and responses, replacing an earlier entry for the same prompt.
+
+    Results containing an ambiguous response are not stored.
+
+    Returns:
+        Whether the responses were stored
+    """
+    if not responses or any(isinstance(response, SynthGenieAmbiguousResponse) for response in responses):
+        return False
+
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            """
+            INSERT INTO semantic_prompt_cache (synth, model, version, signature, prompt, embedding, responses)
+            VALUES (%s, %s, %s, %s, %s, %s::vector, %s)
+            ON CONFLICT (synth, model, version, prompt) DO UPDATE
+            SET signature = EXCLUDED.signature, embedding = EXCLUDED.embedding, responses = EXCLUDED.responses,
+                created_at = CURRENT_TIMESTAMP
+            """,
+            (
+                synth,
+                model,
+                version,
+                signature,
+                prompt,
+                _vector_literal(embed_prompt(prompt)),
+                Json([response.model_dump(exclude_none=True) for response in responses]),
+            ),
+        )
+        conn.commit()
+    except psycopg2.Error as e:
+        logger.error(f'Error writing semantic prompt cache: {e}')
+        semantic_cache_stats.errors += 1
+        conn.rollback()
+        return False
+
+    semantic_cache_stats.stores += 1
+    return True
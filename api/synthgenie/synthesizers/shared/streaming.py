@@ -0,0 +1,189 @@
+"""Stream parameter changes to the client as soon as each tool call completes.
+
+A machine agent typically makes 20+ tool calls and then restates them as its final output.
+Instead of waiting for that final output, each `SynthGenieResponse` is yielded the moment its
+tool returns and written to the client as one NDJSON line, so the first MIDI message can be
+sent while the agent is still working.
+
+The tool results are already the complete responses, so by default (`AGENT_DIRECT_TOOL_RESULTS`)
+the run also ends after its tool calls, skipping the final model turn that would only copy
+them into the output.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from collections.abc import AsyncIterator, Iterable
+from typing import Any, cast
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic_ai import Agent
+from pydantic_ai.exceptions import UsageLimitExceeded
+from pydantic_ai.messages import FunctionToolResultEvent, RetryPromptPart, ToolReturnPart
+
+from synthgenie.synthesizers.shared.budget import AgentBudgetExceeded
+from synthgenie.synthesizers.shared.schemas.agent import SynthGenieAmbiguousResponse, SynthGenieResponse
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+# Return the tools' SynthGenieResponses instead of having the model restate them as its output
+DIRECT_TOOL_RESULTS = os.getenv('AGENT_DIRECT_TOOL_RESULTS', 'true').lower() == 'true'
+
+AgentResponse = SynthGenieResponse | SynthGenieAmbiguousResponse
+
+
+def _identity(response: SynthGenieResponse) -> tuple[str, int, int]:
+    return response.used_tool, response.midi_channel, response.value
+
+
+def _tool_responses(content: Any) -> list[SynthGenieResponse]:
+    """SynthGenieResponses in a tool's return value: one per parameter tool, a list from `set_parameters`."""
+    if isinstance(content, SynthGenieResponse):
+        return [content]
+    if isinstance(content, list):
+        return [item for item in cast(list[object], content) if isinstance(item, SynthGenieResponse)]
+    return []
+
+
+async def stream_tool_responses(
+    agent: Agent[Any, list[AgentResponse]],
+    user_prompt: str,
+    *,
+    direct: bool = DIRECT_TOOL_RESULTS,
+    **run_kwargs: Any,
+) -> AsyncIterator[AgentResponse]:
+    """
+    Run an agent and yield each tool's SynthGenieResponse as soon as the tool returns.
+
+    With `direct`, the run ends after the first round of tool calls that all succeeded; a
+    round with a failed call (retried) goes back to the model so it can fix that call.
+    Otherwise, or when the model answers without calling a tool, anything in the final
+    output that wasn't already yielded (an ambiguous response, or a change the model made
+    without a tool call) follows.
+
+    Args:
+        agent: A sound design agent whose tools return SynthGenieResponse objects
+        user_prompt: Prompt for the agent
+        direct: End the run once the tools have returned instead of waiting for the final output
+        **run_kwargs: Passed to `Agent.iter` (deps, model_settings, toolsets, usage limits, ...)
+
+    Raises:
+        AgentBudgetExceeded: If the run exceeds its usage limits, with the responses yielded so far
+    """
+    emitted: set[tuple[str, int, int]] = set()
+    yielded: list[AgentResponse] = []
+    output: list[AgentResponse] = []
+    try:
+        async with agent.iter(user_prompt, **run_kwargs) as run:
+            async for node in run:
+                if not Agent.is_call_tools_node(node):
+                    continue
+                retried = False
+                async with node.stream(run.ctx) as events:
+                    async for event in events:
+                        if not isinstance(event, FunctionToolResultEvent):
+                            continue
+                        if isinstance(event.result, RetryPromptPart):
+                            retried = True
+                        elif isinstance(event.result, ToolReturnPart):
+                            for response in _tool_responses(event.result.content):
+                                emitted.add(_identity(response))
+                                yielded.append(response)
+                                yield response
+
+                if direct and emitted and not retried:
+                    logger.info(f'Ending agent run after {len(emitted)} tool results, skipping the final model turn')
+                    break
+
+            if run.result is not None:
+                output = run.result.output
+    except UsageLimitExceeded as e:
+        logger.warning(f'Agent run stopped by its budget after {len(yielded)} responses: {e}')
+        raise AgentBudgetExceeded(str(e), yielded) from e
+
+    for response in output:
+        if isinstance(response, SynthGenieAmbiguousResponse) or _identity(response) not in emitted:
+            yield response
+
+
+async def collect_tool_responses(
+    agent: Agent[Any, list[AgentResponse]], user_prompt: str, **run_kwargs: Any
+) -> list[AgentResponse]:
+    """Non-streaming counterpart of `stream_tool_responses`, returning all responses at once."""
+    return [response async for response in stream_tool_responses(agent, user_prompt, **run_kwargs)]
+
+
+async def iterate_responses(responses: Iterable[AgentResponse]) -> AsyncIterator[AgentResponse]:
+    """Stream already available responses, e.g. from a cache or a direct command."""
+    for response in responses:
+        yield response
+
+
+async def _in_own_task(responses: AsyncIterator[AgentResponse]) -> AsyncIterator[AgentResponse]:
+    """
+    Drive a response stream from a single background task.
+
+    `Agent.iter` holds anyio cancel scopes, which must be exited by the task that entered
+    them, while the first response is awaited in the endpoint and the rest by the response
+    body. A queue decouples the two.
+    """
+    queue: asyncio.Queue[AgentResponse | Exception | None] = asyncio.Queue()
+
+    async def pump() -> None:
+        try:
+            async for response in responses:
+                await queue.put(response)
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(None)
+
+    task = asyncio.create_task(pump())
+    try:
+        while (item := await queue.get()) is not None:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Stops the agent run if the client disconnects mid-stream
+        task.cancel()
+
+
+async def _ndjson_lines(first: AgentResponse, rest: AsyncIterator[AgentResponse]) -> AsyncIterator[str]:
+    yield first.model_dump_json(exclude_none=True) + '\n'
+    try:
+        async for response in rest:
+            yield response.model_dump_json(exclude_none=True) + '\n'
+    except HTTPException as e:
+        # The status line is already sent, so report the failure in-band
+        logger.error(f'Streaming failed after the first response: {e.detail}')
+        yield json.dumps({'message': str(e.detail)}) + '\n'
+    except Exception:
+        logger.exception('Streaming failed after the first response')
+        yield json.dumps({'message': 'Sound design agent failed'}) + '\n'
+
+
+async def ndjson_response(
+    responses: AsyncIterator[AgentResponse], headers: dict[str, str] | None = None
+) -> StreamingResponse:
+    """
+    Turn a response stream into an NDJSON StreamingResponse.
+
+    The first response is awaited before the HTTP response starts, so validation and routing
+    errors still produce their normal status codes. Failures after that are sent as a final
+    `{"message": ...}` line, matching SynthGenieAmbiguousResponse.
+
+    Raises:
+        HTTPException: If the stream fails or ends before its first response
+    """
+    responses = _in_own_task(responses)
+    try:
+        first = await anext(responses)
+    except StopAsyncIteration:
+        raise HTTPException(status_code=500, detail='Sound design agent returned no responses')
+
+    return StreamingResponse(_ndjson_lines(first, responses), media_type=NDJSON_MEDIA_TYPE, headers=headers)
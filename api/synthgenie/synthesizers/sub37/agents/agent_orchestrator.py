@@ -4,22 +4,35 @@ Coordinates the Tool Selector Agent (Agent 1) and Sound Design Agent (Agent 2)
 to provide intelligent tool selection and efficient sound design execution.
 """
 
+import asyncio
 import os
+from collections.abc import AsyncIterator
+from typing import Any
 
-from psycopg2.extensions import connection as Connection
+from fastapi import HTTPException
 from pydantic_ai import Agent
+from pydantic_ai.toolsets import AbstractToolset
 
-from synthgenie.auth.models import track_api_key_usage
+from synthgenie.auth.usage import usage_tracker
+from synthgenie.synthesizers.shared.agents.models import stage_model
+from synthgenie.synthesizers.shared.agents.registry import agent_registry
+from synthgenie.synthesizers.shared.budget import AgentBudget, AgentBudgetExceeded, usage_limits_for_key
 from synthgenie.synthesizers.shared.schemas.agent import SynthGenieAmbiguousResponse, SynthGenieResponse
+from synthgenie.synthesizers.shared.streaming import collect_tool_responses, stream_tool_responses
 from synthgenie.synthesizers.sub37.agents.tool_selector_agent import analyze_sound_design_request
 from synthgenie.synthesizers.sub37.schemas.toolset_selection import validate_toolset_selection
 from synthgenie.synthesizers.sub37.toolsets.tool_selector import create_dynamic_toolset
 
+# Deadlines for the tool selection stage (Agent 1) and the sound design stage (Agent 2)
+TOOL_SELECTION_TIMEOUT_SECONDS = float(os.getenv('SUB37_TOOL_SELECTION_TIMEOUT_SECONDS', '20'))
+SOUND_DESIGN_TIMEOUT_SECONDS = float(os.getenv('SUB37_SOUND_DESIGN_TIMEOUT_SECONDS', '90'))
 
+
+@agent_registry.register('sub37.sound_design')
 def get_sub37_sound_design_agent():
-    """Create the Sub 37 sound design agent (Agent 2)."""
+    """Create the Sub 37 sound design agent (Agent 2), shared through the agent registry."""
     return Agent(
-        model=os.getenv('AGENT_MODEL'),
+        model=stage_model('sound_design'),
         # Start with no tools - they'll be added dynamically at runtime
         tools=[],
         output_type=list[SynthGenieResponse | SynthGenieAmbiguousResponse],
@@ -110,58 +123,103 @@ def get_sub37_sound_design_agent():
     )
 
 
+async def select_toolset(user_prompt: str, budget: AgentBudget) -> tuple[AbstractToolset[Any], str]:
+    """Run the Tool Selector Agent (Agent 1) and build the toolset and prompt for Agent 2."""
+    async with asyncio.timeout(TOOL_SELECTION_TIMEOUT_SECONDS):
+        toolset_selection = await analyze_sound_design_request(user_prompt, budget)
+
+    # Validate the toolset selection
+    if not validate_toolset_selection(toolset_selection):
+        # Fallback to default toolsets if validation fails
+        toolset_selection.selected_toolsets = ['oscillator', 'filter', 'amplifier']
+        toolset_selection.reasoning = 'Validation failed, using default toolsets'
+        toolset_selection.confidence = 0.5
+
+    dynamic_toolset = create_dynamic_toolset(toolset_selection.selected_toolsets)
+    final_prompt = toolset_selection.enhanced_prompt or user_prompt
+    return dynamic_toolset, final_prompt
+
+
+def _error_response(error: Exception) -> SynthGenieAmbiguousResponse:
+    return SynthGenieAmbiguousResponse(
+        message=f'An error occurred while processing your request: {str(error)}. Please try rephrasing your request or being more specific about the sound you want.'
+    )
+
+
 async def run_two_agent_sound_design(
-    user_prompt: str, conn: Connection, api_key: str
+    user_prompt: str, api_key: str, track_usage: bool = True, budget: AgentBudget | None = None
 ) -> list[SynthGenieResponse | SynthGenieAmbiguousResponse]:
     """Run the two-agent sound design system.
 
     This function orchestrates the complete workflow:
     1. Agent 1 analyzes the prompt and selects toolsets
     2. Agent 2 executes sound design with selected tools
-    3. Returns the final parameter changes
+    3. Returns the parameter changes its tools produced
 
     Args:
         user_prompt: The user's sound design request
-        conn: Database connection for API tracking
         api_key: API key for usage tracking
+        track_usage: Record the request against the API key (batches record usage once)
+        budget: The prompt's budget, shared by both agents; the API key's limits if None
 
     Returns:
         List of SynthGenieResponse or SynthGenieAmbiguousResponse objects
+
+    Raises:
+        AgentBudgetExceeded: If the agents exceed the prompt's budget, with the responses so far
     """
+    budget = budget or AgentBudget(await usage_limits_for_key(api_key))
     try:
-        # Step 1: Run Tool Selector Agent (Agent 1)
-        toolset_selection = await analyze_sound_design_request(user_prompt)
-
-        # Validate the toolset selection
-        if not validate_toolset_selection(toolset_selection):
-            # Fallback to default toolsets if validation fails
-            toolset_selection.selected_toolsets = ['oscillator', 'filter', 'amplifier']
-            toolset_selection.reasoning = 'Validation failed, using default toolsets'
-            toolset_selection.confidence = 0.5
-
-        # Step 2: Create dynamic toolset from selection
-        dynamic_toolset = create_dynamic_toolset(toolset_selection.selected_toolsets)
-
-        # Step 3: Prepare prompt for Agent 2
-        final_prompt = toolset_selection.enhanced_prompt or user_prompt
+        # Steps 1-3: Run Tool Selector Agent (Agent 1) and prepare the toolset and prompt for Agent 2
+        dynamic_toolset, final_prompt = await select_toolset(user_prompt, budget)
 
         # Step 4: Run Sound Design Agent (Agent 2) with selected tools
         agent = get_sub37_sound_design_agent()
-        result = await agent.run(final_prompt, toolsets=[dynamic_toolset])
+        async with asyncio.timeout(SOUND_DESIGN_TIMEOUT_SECONDS):
+            responses = await collect_tool_responses(
+                agent, final_prompt, toolsets=[dynamic_toolset], **budget.run_kwargs()
+            )
 
         # Step 5: Track API usage (for both agents)
-        track_api_key_usage(conn, api_key)
+        if track_usage:
+            usage_tracker.record(api_key)
 
         # Step 6: Return results
-        if isinstance(result.output, list):
-            return result.output
-        else:
-            return [result.output]
+        return responses
 
+    except AgentBudgetExceeded:
+        raise
+    except TimeoutError:
+        raise HTTPException(status_code=503, detail='Agent timeout - please try again')
     except Exception as e:
         # If anything fails, return an error response
-        return [
-            SynthGenieAmbiguousResponse(
-                message=f'An error occurred while processing your request: {str(e)}. Please try rephrasing your request or being more specific about the sound you want.'
-            )
-        ]
+        return [_error_response(e)]
+
+
+async def stream_two_agent_sound_design(
+    user_prompt: str, budget: AgentBudget
+) -> AsyncIterator[SynthGenieResponse | SynthGenieAmbiguousResponse]:
+    """Streaming variant of `run_two_agent_sound_design`.
+
+    Yields each parameter change as soon as Agent 2's tool call returns. Failures end the
+    stream with an ambiguous response, as in the non-streaming workflow, except for an exceeded
+    budget; usage tracking is left to the caller.
+
+    Args:
+        user_prompt: The user's sound design request
+        budget: The prompt's budget, shared by both agents
+    """
+    try:
+        dynamic_toolset, final_prompt = await select_toolset(user_prompt, budget)
+        agent = get_sub37_sound_design_agent()
+        async with asyncio.timeout(SOUND_DESIGN_TIMEOUT_SECONDS):
+            async for response in stream_tool_responses(
+                agent, final_prompt, toolsets=[dynamic_toolset], **budget.run_kwargs()
+            ):
+                yield response
+    except AgentBudgetExceeded:
+        raise
+    except TimeoutError:
+        raise HTTPException(status_code=503, detail='Agent timeout - please try again')
+    except Exception as e:
+        yield _error_response(e)
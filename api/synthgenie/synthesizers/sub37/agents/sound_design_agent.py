@@ -1,13 +1,12 @@
 """Main entry point for Sub 37 sound design - uses intelligent two-agent system."""
 
-from psycopg2.extensions import connection as Connection
-
+from synthgenie.synthesizers.shared.budget import AgentBudget
 from synthgenie.synthesizers.shared.schemas.agent import SynthGenieAmbiguousResponse, SynthGenieResponse
 from synthgenie.synthesizers.sub37.agents.agent_orchestrator import run_two_agent_sound_design
 
 
 async def run_sub37_sound_design_agent(
-    user_prompt: str, conn: Connection, api_key: str
+    user_prompt: str, api_key: str, track_usage: bool = True, budget: AgentBudget | None = None
 ) -> list[SynthGenieResponse | SynthGenieAmbiguousResponse]:
     """Run the Sub 37 sound design agent using the intelligent two-agent system.
 
@@ -22,10 +21,11 @@ async def run_sub37_sound_design_agent(
 
     Args:
         user_prompt: The user's sound design request
-        conn: Database connection for API tracking
         api_key: API key for usage tracking
+        track_usage: Record the request against the API key (batches record usage once)
+        budget: The prompt's budget, shared by both agents; the API key's limits if None
 
     Returns:
         List of SynthGenieResponse or SynthGenieAmbiguousResponse objects
     """
-    return await run_two_agent_sound_design(user_prompt, conn, api_key)
+    return await run_two_agent_sound_design(user_prompt, api_key, track_usage, budget)
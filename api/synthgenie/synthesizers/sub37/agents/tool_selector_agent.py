@@ -4,24 +4,27 @@ This agent analyzes user sound design requests and intelligently selects
 which toolsets should be loaded for the sound design execution agent.
 """
 
-import os
-
 from pydantic_ai import Agent
 
+from synthgenie.synthesizers.shared.agents.models import stage_model
+from synthgenie.synthesizers.shared.agents.registry import agent_registry
+from synthgenie.synthesizers.shared.budget import AgentBudget
 from synthgenie.synthesizers.sub37.schemas.toolset_selection import ToolsetSelection
 
 
+@agent_registry.register('sub37.tool_selector')
 def get_tool_selector_agent():
     """Create the tool selector agent for analyzing sound design requests.
 
     This agent uses LLM reasoning to understand sound design intent and
     select appropriate toolsets, rather than relying on keyword matching.
+    It is built once per process and shared through the agent registry.
 
     Returns:
         Agent configured to analyze prompts and select toolsets
     """
     return Agent(
-        model=os.getenv('AGENT_MODEL'),
+        model=stage_model('tool_selection'),
         output_type=ToolsetSelection,
         system_prompt=r"""
         # Moog Sub 37 Tool Selector Agent
@@ -170,15 +173,16 @@ def get_tool_selector_agent():
     )
 
 
-async def analyze_sound_design_request(user_prompt: str) -> ToolsetSelection:
+async def analyze_sound_design_request(user_prompt: str, budget: AgentBudget) -> ToolsetSelection:
     """Analyze a sound design request and select appropriate toolsets.
 
     Args:
         user_prompt: The user's sound design request
+        budget: The prompt's budget, shared with the sound design agent
 
     Returns:
         ToolsetSelection containing selected toolsets and reasoning
     """
     agent = get_tool_selector_agent()
-    result = await agent.run(user_prompt)
+    result = await budget.run(agent, user_prompt)
     return result.output
@@ -1,18 +1,34 @@
 import logging
 
-import psycopg2
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response
+from fastapi.responses import StreamingResponse
 
+import synthgenie.synthesizers.shared
+import synthgenie.synthesizers.sub37
 from synthgenie.auth.services import get_api_key
-from synthgenie.db.connection import get_db
-from synthgenie.synthesizers.shared.schemas.agent import SynthGenieAmbiguousResponse, SynthGenieResponse
-from synthgenie.synthesizers.shared.schemas.user import UserPrompt
-from synthgenie.synthesizers.sub37.services import run_sub37_agent_workflow
+from synthgenie.synthesizers.shared.batch import run_prompt_batch
+from synthgenie.synthesizers.shared.cache import (
+    CACHE_HEADER,
+    run_cached_workflow,
+    source_fingerprint,
+    stream_cached_workflow,
+)
+from synthgenie.synthesizers.shared.schemas.agent import (
+    BatchPromptResult,
+    SynthGenieAmbiguousResponse,
+    SynthGenieResponse,
+)
+from synthgenie.synthesizers.shared.schemas.user import UserPrompt, UserPrompts
+from synthgenie.synthesizers.shared.streaming import NDJSON_MEDIA_TYPE, ndjson_response
+from synthgenie.synthesizers.sub37.services import run_sub37_agent_workflow, stream_sub37_agent_workflow
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix='/agent/sub37', tags=['synthgenie'])
 
+# Agents, toolsets and shared prompts all shape the responses
+CACHE_VERSION = source_fingerprint([synthgenie.synthesizers.sub37, synthgenie.synthesizers.shared])
+
 
 @router.post(
     '/prompt',
@@ -21,7 +37,69 @@ router = APIRouter(prefix='/agent/sub37', tags=['synthgenie'])
 )
 async def process_sub37_prompt(
     user_prompt: UserPrompt,
+    response: Response,
     api_key: str = Depends(get_api_key),
-    conn: psycopg2.extensions.connection = Depends(get_db),
+    cache_control: str | None = Header(default=None, alias=CACHE_HEADER),
 ) -> list[SynthGenieResponse | SynthGenieAmbiguousResponse]:
-    return await run_sub37_agent_workflow(user_prompt.prompt, api_key, conn)
+    return await run_cached_workflow(
+        run_sub37_agent_workflow,
+        synth='sub37',
+        version=CACHE_VERSION,
+        user_prompt=user_prompt.prompt,
+        api_key=api_key,
+        response=response,
+        cache_control=cache_control,
+    )
+
+
+@router.post('/prompts', response_model=list[BatchPromptResult], response_model_exclude_none=True)
+async def process_sub37_prompts(
+    user_prompts: UserPrompts,
+    api_key: str = Depends(get_api_key),
+    cache_control: str | None = Header(default=None, alias=CACHE_HEADER),
+) -> list[BatchPromptResult]:
+    """
+    Process a batch of prompts with the Sub 37 agents, a few at a time.
+
+    Results are returned in request order; a failed prompt carries its status code and
+    error instead of failing the batch.
+
+    Requires a valid API key.
+    """
+    return await run_prompt_batch(
+        run_sub37_agent_workflow,
+        synth='sub37',
+        version=CACHE_VERSION,
+        prompts=user_prompts.prompts,
+        api_key=api_key,
+        cache_control=cache_control,
+    )
+
+
+@router.post(
+    '/prompt/stream',
+    response_class=StreamingResponse,
+    responses={200: {'content': {NDJSON_MEDIA_TYPE: {}}, 'description': 'One JSON response per line'}},
+)
+async def stream_sub37_prompt(
+    user_prompt: UserPrompt,
+    api_key: str = Depends(get_api_key),
+    cache_control: str | None = Header(default=None, alias=CACHE_HEADER),
+) -> StreamingResponse:
+    """
+    Process a user prompt with the Sub 37 agents, streaming each parameter change as NDJSON.
+
+    Each line is a SynthGenieResponse (or SynthGenieAmbiguousResponse) sent as soon as the
+    corresponding tool call completes, so MIDI can be sent before the agent finishes.
+
+    Requires a valid API key.
+    """
+    responses, cache_status = await stream_cached_workflow(
+        stream_sub37_agent_workflow,
+        synth='sub37',
+        version=CACHE_VERSION,
+        user_prompt=user_prompt.prompt,
+        api_key=api_key,
+        cache_control=cache_control,
+    )
+    return await ndjson_response(responses, headers={CACHE_HEADER: cache_status} if cache_status else None)
@@ -1,25 +1,55 @@
-import psycopg2
+from collections.abc import AsyncIterator
+
 from fastapi import HTTPException
+from pydantic_ai.usage import UsageLimits
 
 from synthgenie.synthesizers.shared.agents.validation_agent import prompt_validation_agent
+from synthgenie.synthesizers.shared.budget import AgentBudget, default_usage_limits, usage_limits_for_key
+from synthgenie.synthesizers.shared.schemas.agent import SynthGenieAmbiguousResponse, SynthGenieResponse
+from synthgenie.synthesizers.sub37.agents.agent_orchestrator import stream_two_agent_sound_design
 from synthgenie.synthesizers.sub37.agents.sound_design_agent import run_sub37_sound_design_agent
 
 
-async def run_sub37_agent_workflow(user_prompt: str, api_key: str, conn: psycopg2.extensions.connection):
+async def run_sub37_agent_workflow(
+    user_prompt: str, api_key: str, track_usage: bool = True, limits: UsageLimits | None = None
+) -> list[SynthGenieResponse | SynthGenieAmbiguousResponse]:
     """
     Process a user prompt with the Sub37 AI agent.
 
     This implementation forces the agent to stop after the first cycle
-    of tool execution and collects results via events to prevent loops.
+    of tool execution and collects results via events to prevent loops. Validation and both
+    agents share the API key's per-prompt budget of model requests, tokens and tool calls,
+    `limits`, looked up if None (batches look them up once).
 
     Requires a valid API key.
     """
+    if limits is None:
+        limits = await usage_limits_for_key(api_key)
+    budget = AgentBudget(limits)
 
     # Validate the user prompt
     # if not valid, return http 422 Unprocessable Entity error
-    is_user_prompt_valid = await prompt_validation_agent(user_prompt)
+    is_user_prompt_valid = await prompt_validation_agent(user_prompt, budget)
     if not is_user_prompt_valid:
         raise HTTPException(status_code=422, detail='This prompt is not about sound design.')
 
     # Run the sound design agent
-    return await run_sub37_sound_design_agent(user_prompt, conn, api_key)
+    return await run_sub37_sound_design_agent(user_prompt, api_key, track_usage, budget)
+
+
+async def stream_sub37_agent_workflow(
+    user_prompt: str, api_key: str, limits: UsageLimits | None = None
+) -> AsyncIterator[SynthGenieResponse | SynthGenieAmbiguousResponse]:
+    """
+    Streaming variant of `run_sub37_agent_workflow`.
+
+    Yields each parameter change as soon as its tool call returns. Usage tracking is
+    left to the caller. `limits` are the API key's per-prompt usage limits, the defaults if None.
+    """
+    budget = AgentBudget(limits or default_usage_limits())
+    is_user_prompt_valid = await prompt_validation_agent(user_prompt, budget)
+    if not is_user_prompt_valid:
+        raise HTTPException(status_code=422, detail='This prompt is not about sound design.')
+
+    async for response in stream_two_agent_sound_design(user_prompt, budget):
+        yield response
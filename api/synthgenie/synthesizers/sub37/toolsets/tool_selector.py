@@ -4,8 +4,13 @@ NOTE: Keyword-based analysis has been replaced by the intelligent two-agent syst
 This file now only contains utility functions for toolset creation.
 """
 
-from pydantic_ai.toolsets import CombinedToolset
+from functools import cache
+from typing import Any
 
+from pydantic_ai.toolsets import AbstractToolset, FunctionToolset
+
+from synthgenie.synthesizers.shared.agents.prompt_cache import stable_toolset
+from synthgenie.synthesizers.shared.parameters import BATCH_PARAMETER_TOOL, create_parameter_toolset
 from synthgenie.synthesizers.sub37.toolsets import (
     amplifier_toolset,
     arpeggiator_toolset,
@@ -17,14 +22,21 @@ from synthgenie.synthesizers.sub37.toolsets import (
 )
 
 
-def create_dynamic_toolset(selected_toolsets: list[str]) -> CombinedToolset:
+@cache
+def _parameter_toolset(toolsets: tuple[FunctionToolset[Any], ...]) -> FunctionToolset[Any]:
+    """The `set_parameters` toolset for a selection of toolsets, built once per combination."""
+    return create_parameter_toolset(tool.function for toolset in toolsets for tool in toolset.tools.values())
+
+
+def create_dynamic_toolset(selected_toolsets: list[str], batch: bool = BATCH_PARAMETER_TOOL) -> AbstractToolset[Any]:
     """Create a combined toolset from selected toolset names.
 
     Args:
         selected_toolsets: List of toolset names to include
+        batch: Offer the selected parameters through one `set_parameters` tool
 
     Returns:
-        Combined toolset containing only the selected tools
+        Combined toolset containing only the selected tools, sorted by name for prompt caching
     """
     toolset_map = {
         'oscillator': oscillator_toolset,
@@ -36,8 +48,11 @@ def create_dynamic_toolset(selected_toolsets: list[str]) -> CombinedToolset:
         'glide': glide_toolset,
     }
 
-    # Get the toolsets that were selected
-    toolsets_to_combine = [toolset_map[name] for name in selected_toolsets if name in toolset_map]
+    # Get the toolsets that were selected, in a stable order whatever order the selector listed them in
+    toolsets_to_combine = [toolset_map[name] for name in sorted(set(selected_toolsets)) if name in toolset_map]
+
+    if batch:
+        return stable_toolset([_parameter_toolset(tuple(toolsets_to_combine))])
 
     # Create combined toolset
-    return CombinedToolset(toolsets_to_combine)
+    return stable_toolset(toolsets_to_combine)
@@ -0,0 +1,47 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from synthgenie.auth import services
+from synthgenie.auth.key_cache import ApiKeyCache
+from synthgenie.synthesizers.shared.budget import AGENT_MAX_TOOL_CALLS, usage_limits_for_key
+
+ROWS: dict[str, dict[str, Any]] = {
+    'key-1': {'key': 'key-1', 'user_id': 'user', 'max_model_requests': 8, 'max_tool_calls': None},
+}
+
+
+@pytest.fixture
+def queries(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    queries: list[str] = []
+
+    async def run_db(query: Any, _: Any, key: str) -> Any:
+        queries.append(query.__name__)
+        row = ROWS.get(key)
+        if query is services.get_api_key_limits:
+            return {column: row.get(column) for column in ('max_model_requests', 'max_tool_calls')} if row else None
+        return row
+
+    monkeypatch.setattr(services, 'run_db', run_db)
+    monkeypatch.setattr(services, 'api_key_cache', ApiKeyCache())
+    monkeypatch.setattr(services, 'API_KEY_CACHE_ENABLED', True)
+    return queries
+
+
+def test_verified_key_limits_are_served_from_the_cache(queries: list[str]):
+    assert asyncio.run(services.verify_api_key('key-1'))
+    limits = asyncio.run(usage_limits_for_key('key-1'))
+
+    assert queries == ['get_api_key_from_db']
+    assert limits.request_limit == 8
+    assert limits.tool_calls_limit == AGENT_MAX_TOOL_CALLS
+
+
+def test_invalidated_key_limits_are_queried_again(queries: list[str]):
+    asyncio.run(services.verify_api_key('key-1'))
+    services.api_key_cache.invalidate('key-1')
+    asyncio.run(usage_limits_for_key('key-1'))
+    asyncio.run(usage_limits_for_key('key-1'))
+
+    assert queries == ['get_api_key_from_db', 'get_api_key_limits']
@@ -0,0 +1,136 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+
+import pytest
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, TextPart
+from pydantic_ai.models import ModelRequestParameters
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from synthgenie.synthesizers.shared.agents import resilience
+from synthgenie.synthesizers.shared.agents.resilience import CircuitBreaker, ResilienceStats, ResilientModel
+
+MESSAGES: list[ModelMessage] = [ModelRequest.user_text_prompt('Make a bright pad')]
+
+
+@pytest.fixture
+def stats(monkeypatch: pytest.MonkeyPatch) -> ResilienceStats:
+    stats = ResilienceStats()
+    monkeypatch.setattr(resilience, 'resilience_stats', stats)
+    return stats
+
+
+def half_open(breaker: CircuitBreaker) -> CircuitBreaker:
+    breaker.failures = resilience.BREAKER_FAILURE_THRESHOLD
+    breaker.opened_at = time.monotonic() - resilience.BREAKER_COOLDOWN_SECONDS - 1
+    return breaker
+
+
+def respond(_: list[ModelMessage], __: AgentInfo) -> ModelResponse:
+    return ModelResponse(parts=[TextPart('fallback')])
+
+
+async def respond_slowly(_: list[ModelMessage], __: AgentInfo) -> ModelResponse:
+    await asyncio.sleep(5)
+    return ModelResponse(parts=[TextPart('primary')])
+
+
+async def stream(_: list[ModelMessage], __: AgentInfo) -> AsyncIterator[str]:
+    yield 'primary'
+
+
+async def stream_failure(_: list[ModelMessage], __: AgentInfo) -> AsyncIterator[str]:
+    raise ModelHTTPError(503, 'primary')
+    yield ''
+
+
+async def request_stream(model: ResilientModel) -> str:
+    async with model.request_stream(MESSAGES, None, ModelRequestParameters()) as response_stream:
+        async for _ in response_stream:
+            pass
+    return response_stream.get().parts[0].content  # type: ignore
+
+
+def test_cancelled_trial_releases_half_open_breaker(stats: ResilienceStats, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(resilience, 'AGENT_HEDGING', True)
+    monkeypatch.setattr(resilience, 'AGENT_HEDGE_AFTER_SECONDS', 0.01)
+    model = ResilientModel(FunctionModel(respond_slowly), 'test', FunctionModel(respond))
+    breaker = half_open(stats.breaker(model.wrapped.system))
+
+    response = asyncio.run(model.request(MESSAGES, None, ModelRequestParameters()))
+
+    # The hedge won and the trial was cancelled without an outcome: the next request is the new trial
+    assert response.parts == [TextPart('fallback')]
+    assert stats.stage('test').hedge_wins == 1
+    assert breaker.state == 'half_open'
+    assert not breaker.trial_in_flight
+    assert breaker.admit() == 'trial'
+
+
+def test_only_the_trial_releases_the_trial_slot(stats: ResilienceStats):
+    model = ResilientModel(FunctionModel(respond_slowly), 'test', FunctionModel(respond))
+    breaker = stats.breaker(model.wrapped.system)
+
+    async def requests() -> None:
+        # Admitted while the breaker is closed, still running once it goes half open
+        earlier = asyncio.create_task(model.request(MESSAGES, None, ModelRequestParameters()))
+        await asyncio.sleep(0)
+        half_open(breaker)
+        trial = asyncio.create_task(model.request(MESSAGES, None, ModelRequestParameters()))
+        await asyncio.sleep(0)
+        assert breaker.trial_in_flight
+
+        earlier.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await earlier
+        assert breaker.trial_in_flight
+        assert breaker.admit() == 'rejected'
+
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+        assert not breaker.trial_in_flight
+
+    asyncio.run(requests())
+
+
+def test_hedge_on_primary_updates_breaker(stats: ResilienceStats, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(resilience, 'AGENT_HEDGING', True)
+    monkeypatch.setattr(resilience, 'AGENT_HEDGE_AFTER_SECONDS', 0.01)
+    calls: list[int] = []
+
+    async def slow_then_fast(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        calls.append(len(calls))
+        if len(calls) == 1:
+            return await respond_slowly(messages, info)
+        return ModelResponse(parts=[TextPart('hedge')])
+
+    model = ResilientModel(FunctionModel(slow_then_fast), 'test')
+    breaker = stats.breaker(model.wrapped.system)
+    breaker.failures = 2
+
+    response = asyncio.run(model.request(MESSAGES, None, ModelRequestParameters()))
+
+    assert response.parts == [TextPart('hedge')]
+    assert breaker.failures == 0
+
+
+def test_stream_trial_closes_breaker(stats: ResilienceStats):
+    model = ResilientModel(FunctionModel(stream_function=stream), 'test', FunctionModel(respond))
+    breaker = half_open(stats.breaker(model.wrapped.system))
+
+    assert asyncio.run(request_stream(model)) == 'primary'
+    assert breaker.state == 'closed'
+    assert breaker.failures == 0
+    assert not breaker.trial_in_flight
+
+
+def test_failed_stream_trial_reopens_breaker(stats: ResilienceStats):
+    model = ResilientModel(FunctionModel(stream_function=stream_failure), 'test', FunctionModel(respond))
+    breaker = half_open(stats.breaker(model.wrapped.system))
+
+    with pytest.raises(ModelHTTPError):
+        asyncio.run(request_stream(model))
+    assert breaker.state == 'open'
+    assert not breaker.trial_in_flight